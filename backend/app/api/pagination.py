@@ -0,0 +1,143 @@
+"""
+Keyset pagination and sparse fieldsets for list endpoints.
+
+Pages are ordered descending on a tuple of columns ending in the primary key, and the cursor is the
+opaque encoding of the last row's values, so fetching page N costs the same as page 1. Responses
+carry the next page's cursor in the `X-Next-Cursor` header. `fields=a,b` limits both the columns
+loaded and the keys serialised; rows are returned as plain dicts for orjson. `json_page` builds the
+same page, cursor included, inside Postgres for endpoints that return a single JSON document.
+"""
+
+import base64
+import binascii
+from collections.abc import Collection, Iterable, Sequence
+from datetime import datetime
+from typing import Any
+
+import orjson
+from fastapi import HTTPException, status
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+from sqlalchemy import Select, Subquery, Text, case, cast, func, literal_column, select, tuple_
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute, load_only
+from sqlalchemy.sql.elements import ColumnElement
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class Keyset:
+    def __init__(self, *columns: InstrumentedAttribute) -> None:
+        self.columns = columns
+
+    def order_by(self) -> list[ColumnElement]:
+        return [column.desc() for column in self.columns]
+
+    def encode(self, row: Any) -> str:
+        values = [getattr(row, column.key) for column in self.columns]
+        return base64.urlsafe_b64encode(orjson.dumps(values)).decode("ascii").rstrip("=")
+
+    def encode_sql(self, columns: Sequence[ColumnElement]) -> ColumnElement[str]:
+        """SQL counterpart of `encode` over `columns`: unpadded URL-safe base64 of their JSON array."""
+        payload = func.convert_to(cast(func.json_build_array(*columns), Text), literal_column("'UTF8'"))
+        encoded = func.encode(payload, literal_column("'base64'"))
+        # Postgres wraps base64 output at 76 characters; drop the newlines along with the alphabet swap.
+        urlsafe = func.translate(encoded, literal_column("E'+/\\n'"), literal_column("'-_'"))
+        return func.rtrim(urlsafe, literal_column("'='"))
+
+    def after(self, cursor: str) -> ColumnElement[bool]:
+        try:
+            values = orjson.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+            if not isinstance(values, list) or len(values) != len(self.columns):
+                raise ValueError("cursor length mismatch")
+            parsed = [_parse(column, value) for column, value in zip(self.columns, values)]
+        except (ValueError, TypeError, binascii.Error) as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+        return tuple_(*self.columns) < tuple_(*parsed)
+
+
+def _parse(column: InstrumentedAttribute, value: Any) -> Any:
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    return python_type(value)
+
+
+def parse_fields(
+    fields: str | None,
+    schema: type[BaseModel],
+    heavy: Collection[str] = (),
+) -> list[str]:
+    """
+    Requested fields in schema order, always including `id`. Without `fields`, every schema field
+    except the `heavy` ones; heavy fields are only loaded when named explicitly.
+    """
+    allowed = list(schema.model_fields)
+    if not fields:
+        return [name for name in allowed if name not in heavy]
+
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested.difference(allowed)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+        )
+    return [name for name in allowed if name in requested or name == "id"]
+
+
+async def fetch_page(
+    db: AsyncSession,
+    stmt: Select,
+    model: type,
+    keyset: Keyset,
+    fields: Sequence[str],
+    cursor: str | None,
+    limit: int,
+) -> tuple[list[dict[str, Any]], str | None]:
+    """One page of `stmt` as dicts of `fields`, plus the cursor of the next page if there is one."""
+    loaded = {*fields, *(column.key for column in keyset.columns)}
+    stmt = stmt.options(load_only(*(getattr(model, name) for name in loaded)))
+    if cursor:
+        stmt = stmt.where(keyset.after(cursor))
+
+    result = await db.scalars(stmt.order_by(*keyset.order_by()).limit(limit + 1))
+    rows = list(result.all())
+    next_cursor = keyset.encode(rows[limit - 1]) if len(rows) > limit else None
+    return [{name: getattr(row, name) for name in fields} for row in rows[:limit]], next_cursor
+
+
+def json_object(pairs: Iterable[tuple[str, ColumnElement]]) -> ColumnElement:
+    """`json_build_object` with inlined keys, so Postgres never has to infer parameter types for them."""
+    return func.json_build_object(*(part for name, column in pairs for part in (literal_column(f"'{name}'"), column)))
+
+
+def json_page(stmt: Select, model: type, keyset: Keyset, fields: Sequence[str], limit: int) -> Subquery:
+    """
+    The first page of `stmt` aggregated in SQL: one row with `items`, a JSON array of `fields`
+    objects in keyset order, and `next_cursor` (NULL on the last page). Lets a detail endpoint
+    embed several pages in one JSON document built by a single query.
+    """
+    keys = [column.label(f"key_{idx}") for idx, column in enumerate(keyset.columns)]
+    ranked = (
+        stmt.with_only_columns(
+            *(getattr(model, name).label(name) for name in fields),
+            *keys,
+            func.row_number().over(order_by=keyset.order_by()).label("row_number"),
+        )
+        .order_by(*keyset.order_by())
+        .limit(limit + 1)
+        .subquery()
+    )
+    row_number = ranked.c.row_number
+    items = func.json_agg(aggregate_order_by(json_object((name, ranked.c[name]) for name in fields), row_number))
+    last_cursor = func.max(keyset.encode_sql([ranked.c[key.name] for key in keys])).filter(row_number == limit)
+    return select(
+        func.coalesce(items.filter(row_number <= limit), literal_column("'[]'::json")).label("items"),
+        case((func.count() > limit, last_cursor)).label("next_cursor"),
+    ).subquery()
+
+
+def page_response(items: list[dict[str, Any]], next_cursor: str | None) -> ORJSONResponse:
+    return ORJSONResponse(items, headers={NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None)
@@ -1,11 +1,17 @@
-from fastapi import APIRouter, Depends
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user
 from app.db.session import get_db
+from app.jobs.queue import enqueue_job
 from app.models.admin_filter import AdminFilter
+from app.models.pipeline_job import PipelineJob
 from app.schemas.admin import AdminFilterIn, AdminFilterOut
+from app.schemas.job import PipelineJobIn, PipelineJobOut
 from app.services.pipeline import PipelineOrchestrator
+from app.services.process_stats import collect_stats
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -51,17 +57,52 @@ async def trigger_scrape(
     db: AsyncSession = Depends(get_db),
     _: dict = Depends(get_current_user),
 ) -> dict:
-    orchestrator = PipelineOrchestrator(db)
-    result = await orchestrator.run_full_pipeline()
-    return {"status": "ok", "result": result}
+    job_id = await enqueue_job(db, "collect", {"chain": True})
+    await db.commit()
+    return {"status": "queued", "job_id": str(job_id)}
+
+
+@router.post("/jobs", response_model=PipelineJobOut, status_code=202)
+async def create_job(
+    payload: PipelineJobIn,
+    db: AsyncSession = Depends(get_db),
+    _: dict = Depends(get_current_user),
+) -> PipelineJobOut:
+    job_id = await enqueue_job(db, payload.job_type, {"chain": payload.chain})
+    await db.commit()
+    return await db.get(PipelineJob, job_id)
+
+
+@router.get("/jobs/{job_id}", response_model=PipelineJobOut)
+async def get_job(
+    job_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    _: dict = Depends(get_current_user),
+) -> PipelineJobOut:
+    job = await db.get(PipelineJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
 
 
 @router.post("/recalculate-trends")
 async def trigger_trends(
+    rebuild: bool = False,
     db: AsyncSession = Depends(get_db),
     _: dict = Depends(get_current_user),
 ) -> dict:
     orchestrator = PipelineOrchestrator(db)
+    if rebuild:
+        await orchestrator.cluster_engine.rebuild_daily_counts(db)
     await orchestrator.recalculate_cluster_trends()
-    await db.commit()
+    await orchestrator.commit()
     return {"status": "ok"}
+
+
+@router.get("/llm-cache")
+async def llm_cache_stats(
+    db: AsyncSession = Depends(get_db),
+    _: dict = Depends(get_current_user),
+) -> dict:
+    """Cache counters summed over the API and worker processes, with each process's limiter state."""
+    return await collect_stats(db, "api")
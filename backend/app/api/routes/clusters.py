@@ -1,27 +1,60 @@
+from datetime import datetime, timedelta, timezone
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse, Response
+from sqlalchemy import Select, Text, cast, exists, func, select, true
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user
+from app.api.pagination import Keyset, fetch_page, json_object, json_page, page_response, parse_fields
+from app.api.routes.ideas import IDEA_KEYSET
+from app.core.config import settings
 from app.db.session import get_db
 from app.models.cluster import ProblemCluster
+from app.models.cluster_daily_count import ClusterDailyCount
+from app.models.cluster_neighbor import ClusterNeighbor
 from app.models.idea import Idea
 from app.models.pain import ExtractedPain
 from app.models.post import Post
-from app.schemas.cluster import ClusterDetailOut, ProblemClusterOut
+from app.schemas.cluster import (
+    ClusterDetailOut,
+    ClusterTrendOut,
+    ClusterTrendPoint,
+    ProblemClusterOut,
+    RelatedClusterOut,
+)
+from app.schemas.idea import IDEA_HEAVY_FIELDS, IdeaOut
+from app.schemas.pain import ExtractedPainOut
+from app.schemas.post import POST_HEAVY_FIELDS, PostOut
 
 router = APIRouter(prefix="/clusters", tags=["clusters"])
 
 
+CLUSTER_KEYSET = Keyset(ProblemCluster.post_count, ProblemCluster.id)
+PAIN_KEYSET = Keyset(ExtractedPain.urgency_score, ExtractedPain.created_at, ExtractedPain.id)
+POST_KEYSET = Keyset(Post.created_at, Post.id)
+
+
 @router.get("", response_model=list[ProblemClusterOut])
 async def list_clusters(
+    cursor: str | None = None,
+    limit: int = Query(default=50, ge=1, le=200),
+    fields: str | None = None,
     db: AsyncSession = Depends(get_db),
     _: dict = Depends(get_current_user),
-) -> list[ProblemClusterOut]:
-    result = await db.execute(select(ProblemCluster).order_by(ProblemCluster.post_count.desc()))
-    return list(result.scalars().all())
+) -> ORJSONResponse:
+    """Clusters by size, largest first. Pass the `X-Next-Cursor` response header as `cursor` for the next page."""
+    items, next_cursor = await fetch_page(
+        db,
+        select(ProblemCluster),
+        ProblemCluster,
+        CLUSTER_KEYSET,
+        parse_fields(fields, ProblemClusterOut),
+        cursor,
+        limit,
+    )
+    return page_response(items, next_cursor)
 
 
 @router.get("/{cluster_id}", response_model=ClusterDetailOut)
@@ -29,27 +62,190 @@ async def cluster_detail(
     cluster_id: UUID,
     db: AsyncSession = Depends(get_db),
     _: dict = Depends(get_current_user),
-) -> ClusterDetailOut:
-    cluster = await db.get(ProblemCluster, cluster_id)
-    if not cluster:
+) -> Response:
+    """
+    The cluster with the first page of its pains, ideas and posts, built as one JSON document by a
+    single query and returned as-is. Heavy text columns are left out; page further, or request them
+    with `fields`, through the sub-collection endpoints.
+    """
+    document = await db.scalar(_cluster_detail_query(cluster_id, settings.cluster_detail_page_size))
+    if document is None:
         raise HTTPException(status_code=404, detail="Cluster not found")
+    return Response(content=document, media_type="application/json")
+
+
+@router.get("/{cluster_id}/pains", response_model=list[ExtractedPainOut])
+async def cluster_pains(
+    cluster_id: UUID,
+    cursor: str | None = None,
+    limit: int = Query(default=50, ge=1, le=200),
+    fields: str | None = None,
+    db: AsyncSession = Depends(get_db),
+    _: dict = Depends(get_current_user),
+) -> ORJSONResponse:
+    """Pains in the cluster, most urgent first."""
+    await _require_cluster(db, cluster_id)
+    items, next_cursor = await fetch_page(
+        db,
+        _cluster_pains(cluster_id),
+        ExtractedPain,
+        PAIN_KEYSET,
+        parse_fields(fields, ExtractedPainOut),
+        cursor,
+        limit,
+    )
+    return page_response(items, next_cursor)
+
+
+@router.get("/{cluster_id}/ideas", response_model=list[IdeaOut])
+async def cluster_ideas(
+    cluster_id: UUID,
+    cursor: str | None = None,
+    limit: int = Query(default=50, ge=1, le=200),
+    fields: str | None = None,
+    db: AsyncSession = Depends(get_db),
+    _: dict = Depends(get_current_user),
+) -> ORJSONResponse:
+    """Ideas for the cluster, best scored first. Roadmap, tech stack, GTM and launch plan only with `fields`."""
+    await _require_cluster(db, cluster_id)
+    items, next_cursor = await fetch_page(
+        db,
+        _cluster_ideas(cluster_id),
+        Idea,
+        IDEA_KEYSET,
+        parse_fields(fields, IdeaOut, IDEA_HEAVY_FIELDS),
+        cursor,
+        limit,
+    )
+    return page_response(items, next_cursor)
+
+
+@router.get("/{cluster_id}/posts", response_model=list[PostOut])
+async def cluster_posts(
+    cluster_id: UUID,
+    cursor: str | None = None,
+    limit: int = Query(default=50, ge=1, le=200),
+    fields: str | None = None,
+    db: AsyncSession = Depends(get_db),
+    _: dict = Depends(get_current_user),
+) -> ORJSONResponse:
+    """Source posts of the cluster's pains, newest first. `content` only with `fields`."""
+    await _require_cluster(db, cluster_id)
+    items, next_cursor = await fetch_page(
+        db,
+        _cluster_posts(cluster_id),
+        Post,
+        POST_KEYSET,
+        parse_fields(fields, PostOut, POST_HEAVY_FIELDS),
+        cursor,
+        limit,
+    )
+    return page_response(items, next_cursor)
 
-    pains_result = await db.execute(
-        select(ExtractedPain)
-        .where(ExtractedPain.cluster_id == cluster_id)
-        .order_by(ExtractedPain.urgency_score.desc(), ExtractedPain.created_at.desc())
+
+def _cluster_detail_query(cluster_id: UUID, page_size: int) -> Select:
+    pains = json_page(_cluster_pains(cluster_id), ExtractedPain, PAIN_KEYSET, parse_fields(None, ExtractedPainOut), page_size)
+    ideas = json_page(
+        _cluster_ideas(cluster_id), Idea, IDEA_KEYSET, parse_fields(None, IdeaOut, IDEA_HEAVY_FIELDS), page_size
+    )
+    posts = json_page(_cluster_posts(cluster_id), Post, POST_KEYSET, parse_fields(None, PostOut, POST_HEAVY_FIELDS), page_size)
+    cluster = json_object((name, getattr(ProblemCluster, name)) for name in parse_fields(None, ProblemClusterOut))
+    document = json_object(
+        [
+            ("cluster", cluster),
+            ("pains", pains.c["items"]),
+            ("ideas", ideas.c["items"]),
+            ("posts", posts.c["items"]),
+            ("pains_next_cursor", pains.c.next_cursor),
+            ("ideas_next_cursor", ideas.c.next_cursor),
+            ("posts_next_cursor", posts.c.next_cursor),
+        ]
+    )
+    # Cast to text so the driver hands back the JSON string without decoding it.
+    return (
+        select(cast(document, Text))
+        .select_from(ProblemCluster)
+        .join(pains, true())
+        .join(ideas, true())
+        .join(posts, true())
+        .where(ProblemCluster.id == cluster_id)
     )
-    pains = list(pains_result.scalars().all())
 
-    posts_result = await db.execute(
-        select(Post)
-        .join(ExtractedPain, ExtractedPain.post_id == Post.id)
-        .where(ExtractedPain.cluster_id == cluster_id)
-        .order_by(Post.created_at.desc())
+
+async def _require_cluster(db: AsyncSession, cluster_id: UUID) -> None:
+    if not await db.scalar(select(exists().where(ProblemCluster.id == cluster_id))):
+        raise HTTPException(status_code=404, detail="Cluster not found")
+
+
+def _cluster_pains(cluster_id: UUID) -> Select:
+    return select(ExtractedPain).where(ExtractedPain.cluster_id == cluster_id)
+
+
+def _cluster_ideas(cluster_id: UUID) -> Select:
+    return select(Idea).where(Idea.cluster_id == cluster_id)
+
+
+def _cluster_posts(cluster_id: UUID) -> Select:
+    return select(Post).join(ExtractedPain, ExtractedPain.post_id == Post.id).where(ExtractedPain.cluster_id == cluster_id)
+
+
+@router.get("/{cluster_id}/related", response_model=list[RelatedClusterOut])
+async def related_clusters(
+    cluster_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    _: dict = Depends(get_current_user),
+) -> list[RelatedClusterOut]:
+    """
+    Nearest clusters from the precomputed `cluster_neighbors` graph, ranked by centroid similarity
+    lifted by each neighbour's 7-day trend. Reads at most `related_clusters_k` rows.
+    """
+    if not await db.get(ProblemCluster, cluster_id):
+        raise HTTPException(status_code=404, detail="Cluster not found")
+
+    trend_boost = 1 + settings.related_clusters_trend_weight * func.ln(1 + func.greatest(ProblemCluster.trend_7d, 0))
+    result = await db.execute(
+        select(ProblemCluster, ClusterNeighbor.similarity)
+        .join(ClusterNeighbor, ClusterNeighbor.neighbor_id == ProblemCluster.id)
+        .where(ClusterNeighbor.cluster_id == cluster_id)
+        .order_by((ClusterNeighbor.similarity * trend_boost).desc(), ClusterNeighbor.rank)
+    )
+    return [
+        RelatedClusterOut(**ProblemClusterOut.model_validate(cluster).model_dump(), similarity=similarity)
+        for cluster, similarity in result.all()
+    ]
+
+
+@router.get("/{cluster_id}/trend", response_model=ClusterTrendOut)
+async def cluster_trend(
+    cluster_id: UUID,
+    days: int = Query(default=30, ge=1, le=365),
+    db: AsyncSession = Depends(get_db),
+    _: dict = Depends(get_current_user),
+) -> ClusterTrendOut:
+    """Daily sparkline series served from the `cluster_daily_counts` buckets, zero-filled for quiet days."""
+    if not await db.get(ProblemCluster, cluster_id):
+        raise HTTPException(status_code=404, detail="Cluster not found")
+
+    today = datetime.now(timezone.utc).date()
+    start = today - timedelta(days=days - 1)
+    result = await db.execute(
+        select(ClusterDailyCount.day, ClusterDailyCount.pains, ClusterDailyCount.sum_urgency).where(
+            ClusterDailyCount.cluster_id == cluster_id,
+            ClusterDailyCount.day >= start,
+        )
     )
-    posts = list(posts_result.scalars().all())
+    buckets = {day: (pains, sum_urgency) for day, pains, sum_urgency in result.all()}
 
-    ideas_result = await db.execute(select(Idea).where(Idea.cluster_id == cluster_id).order_by(Idea.final_score.desc()))
-    ideas = list(ideas_result.scalars().all())
+    series: list[ClusterTrendPoint] = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        pains, sum_urgency = buckets.get(day, (0, 0))
+        series.append(
+            ClusterTrendPoint(
+                day=day,
+                pains=pains,
+                avg_urgency=round(sum_urgency / pains, 2) if pains else 0.0,
+            )
+        )
 
-    return ClusterDetailOut(cluster=cluster, pains=pains, ideas=ideas, posts=posts)
+    return ClusterTrendOut(cluster_id=cluster_id, days=days, series=series)
@@ -1,25 +1,44 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user
+from app.api.pagination import Keyset, fetch_page, page_response, parse_fields
 from app.db.session import get_db
 from app.models.idea import Idea
-from app.schemas.idea import IdeaOut
+from app.schemas.idea import IDEA_HEAVY_FIELDS, IdeaOut
 
 router = APIRouter(prefix="/ideas", tags=["ideas"])
 
 
+IDEA_KEYSET = Keyset(Idea.final_score, Idea.id)
+
+
 @router.get("", response_model=list[IdeaOut])
 async def list_ideas(
-    limit: int = 25,
+    cursor: str | None = None,
+    limit: int = Query(default=25, ge=1, le=100),
+    fields: str | None = None,
     db: AsyncSession = Depends(get_db),
     _: dict = Depends(get_current_user),
-) -> list[IdeaOut]:
-    result = await db.execute(select(Idea).order_by(Idea.final_score.desc()).limit(min(limit, 100)))
-    return list(result.scalars().all())
+) -> ORJSONResponse:
+    """
+    Ideas by final score, best first, paged through the `X-Next-Cursor` header. Roadmap, tech stack,
+    GTM and launch plan are only returned when named in `fields`.
+    """
+    items, next_cursor = await fetch_page(
+        db,
+        select(Idea),
+        Idea,
+        IDEA_KEYSET,
+        parse_fields(fields, IdeaOut, IDEA_HEAVY_FIELDS),
+        cursor,
+        limit,
+    )
+    return page_response(items, next_cursor)
 
 
 @router.get("/{idea_id}", response_model=IdeaOut)
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user
+from app.db.session import get_db
+from app.schemas.search import SearchKind, SearchOut
+from app.services.search import search
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+ALL_KINDS: list[SearchKind] = ["post", "pain", "cluster", "idea"]
+
+
+@router.get("", response_model=SearchOut)
+async def search_all(
+    q: str = Query(min_length=1, max_length=200),
+    kind: list[SearchKind] = Query(default=ALL_KINDS),
+    limit: int = Query(default=20, ge=1, le=100),
+    offset: int = Query(default=0, ge=0, le=1000),
+    db: AsyncSession = Depends(get_db),
+    _: dict = Depends(get_current_user),
+) -> SearchOut:
+    """Ranked, highlighted hits across posts, pains, clusters and ideas; repeat `kind` to narrow the search."""
+    hits, has_more, approximate = await search(db, q.strip(), set(kind), limit, offset)
+    return SearchOut(
+        query=q,
+        hits=hits,
+        next_offset=offset + limit if has_more else None,
+        approximate=approximate,
+    )
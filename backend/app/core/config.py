@@ -27,6 +27,20 @@ class Settings(BaseSettings):
 
     openai_api_key: str | None = None
     openai_model: str = "gpt-4o-mini"
+    openai_initial_concurrency: int = 4
+    openai_min_concurrency: int = 1
+    openai_max_concurrency: int = 32
+    openai_target_latency_seconds: float = 30.0
+    openai_tokens_per_minute: int = 200000
+    openai_max_retries: int = 6
+    openai_backoff_base_seconds: float = 1.0
+    openai_backoff_max_seconds: float = 60.0
+    extraction_batch_size: int = 8
+    extraction_batch_token_budget: int = 6000
+    llm_cache_backend: Literal["none", "disk", "postgres"] = "disk"
+    llm_cache_dir: str = ".cache/llm"
+    llm_cache_ttl_seconds: int = 7 * 24 * 3600
+    llm_cache_max_entries: int = 50000
 
     reddit_client_id: str | None = None
     reddit_client_secret: str | None = None
@@ -38,15 +52,34 @@ class Settings(BaseSettings):
         "smallbusiness",
         "ArtificialInteligence",
     ]
+    reddit_keyword_concurrency: int = 4
+    reddit_requests_per_minute: int = 90
 
     producthunt_access_token: str | None = None
+    producthunt_topics: list[str] = ["saas", "artificial-intelligence", "b2b"]
+    producthunt_window_days: int = 7
+    producthunt_page_size: int = 20
+    producthunt_max_pages: int = 5
     twitter_bearer_token: str | None = None
+    twitter_keyword_concurrency: int = 4
+    twitter_requests_per_minute: int = 30
+    collector_cursors_enabled: bool = True
+    collector_http2: bool = True
+    collector_timeout_seconds: float = 20.0
+    collector_max_connections: int = 20
+    collector_max_connections_per_host: int = 6
+    collector_max_retries: int = 4
+    collector_backoff_base_seconds: float = 1.0
+    collector_backoff_max_seconds: float = 60.0
 
     supabase_url: str | None = None
     supabase_anon_key: str | None = None
     supabase_jwt_secret: str | None = None
     allow_anon_read: bool = True
 
+    dashboard_cache_backend: Literal["memory", "postgres"] = "memory"
+    dashboard_cache_ttl_seconds: float = 60.0
+
     default_keywords: list[str] = [
         "churn",
         "bottleneck",
@@ -59,6 +92,47 @@ class Settings(BaseSettings):
     db_init_retries: int = 10
     db_init_retry_delay_seconds: float = 3.0
     fail_on_db_init_error: bool = False
+    db_fanout_limit: int = 4
+    persist_batch_size: int = 1000
+    pipeline_mode: Literal["batch", "streaming"] = "batch"
+    pipeline_chunk_size: int = 50
+    pipeline_queue_size: int = 4
+    near_duplicate_detection: bool = True
+    near_duplicate_min_similarity: float = 0.6
+    relevance_gate_enabled: bool = True
+    relevance_min_score: float = 0.0
+
+    worker_poll_interval_seconds: float = 5.0
+    worker_heartbeat_seconds: float = 30.0
+    worker_lease_seconds: float = 300.0
+    worker_embedded: bool = False
+    process_stats_max_age_seconds: float = 600.0
+    job_max_attempts: int = 3
+    job_retry_delay_seconds: float = 60.0
+
+    clustering_backend: Literal["agglomerative", "knn_graph", "embedding"] = "agglomerative"
+    clustering_distance_threshold: float = 0.65
+    clustering_knn_neighbors: int = 10
+    clustering_working_memory_mb: int = 256
+    clustering_incremental: bool = True
+    clustering_assign_similarity: float = 0.35
+    clustering_centroid_terms: int = 64
+    clustering_process_workers: int = 1
+    clustering_watermark: int = 200
+
+    embedding_provider: Literal["hashing", "openai"] = "hashing"
+    embedding_dim: int = 384
+    openai_embedding_model: str = "text-embedding-3-small"
+    embedding_batch_size: int = 256
+    embedding_min_similarity: float = 0.45
+    ann_nprobe: int = 8
+    ann_min_train_size: int = 2048
+    related_clusters_k: int = 10
+    related_clusters_min_similarity: float = 0.15
+    related_clusters_trend_weight: float = 0.25
+    search_max_candidates: int = 5000
+    search_ddl_lock_timeout_ms: int = 5000
+    cluster_detail_page_size: int = 50
 
     @field_validator("database_url", mode="before")
     @classmethod
@@ -79,7 +153,14 @@ class Settings(BaseSettings):
             return "postgresql+asyncpg://" + url[len("postgresql+psycopg2://") :]
         return url
 
-    @field_validator("cors_origins", "reddit_subreddits", "default_keywords", "default_industries", mode="before")
+    @field_validator(
+        "cors_origins",
+        "reddit_subreddits",
+        "producthunt_topics",
+        "default_keywords",
+        "default_industries",
+        mode="before",
+    )
     @classmethod
     def parse_csv_list(cls, value: str | list[str]) -> list[str]:
         if isinstance(value, list):
@@ -1,12 +1,58 @@
 import asyncio
 import logging
 
+from sqlalchemy import text
+
 from app.core.config import settings
 from app.db.session import Base, engine
-from app.models import admin_filter, cluster, idea, pain, post  # noqa: F401
+from app.models import (  # noqa: F401
+    admin_filter,
+    cluster,
+    cluster_centroid,
+    cluster_daily_count,
+    cluster_neighbor,
+    collector_cursor,
+    dashboard_snapshot,
+    idea,
+    llm_cache,
+    pain,
+    pain_embedding,
+    pipeline_job,
+    post,
+    post_minhash_band,
+    process_stats,
+)
 
 logger = logging.getLogger(__name__)
 
+# create_all only creates missing tables, so columns and indexes added to existing tables are applied here.
+# Every statement must be idempotent.
+ADDITIVE_DDL = [
+    "ALTER TABLE posts ADD COLUMN IF NOT EXISTS minhash BYTEA",
+    "ALTER TABLE posts ADD COLUMN IF NOT EXISTS canonical_post_id UUID REFERENCES posts(id) ON DELETE SET NULL",
+    "CREATE INDEX IF NOT EXISTS ix_posts_canonical_post_id ON posts (canonical_post_id)",
+    "ALTER TABLE posts ADD COLUMN IF NOT EXISTS relevance_score DOUBLE PRECISION",
+    "ALTER TABLE pain_embeddings ALTER COLUMN created_at SET DEFAULT clock_timestamp()",
+    "ALTER TABLE dashboard_snapshots ADD COLUMN IF NOT EXISTS generation BIGINT NOT NULL DEFAULT 0",
+    "ALTER TABLE dashboard_snapshots ALTER COLUMN payload DROP NOT NULL",
+]
+
+# Full-text search: stored tsvector columns (titles weighted A, bodies B) behind GIN indexes, and
+# trigram indexes for typo-tolerant cluster and idea name lookup. The columns are not mapped on the
+# models; app.services.search reads them. Adding a stored column rewrites its table once, so these
+# run after the schema in their own transaction and only for objects the catalog does not have yet.
+SEARCH_VECTORS = {
+    "posts": "setweight(to_tsvector('english', title), 'A') || setweight(to_tsvector('english', content), 'B')",
+    "extracted_pains": "to_tsvector('english', pain_point)",
+    "problem_clusters": "setweight(to_tsvector('english', name), 'A') || setweight(to_tsvector('english', summary), 'B')",
+    "ideas": "setweight(to_tsvector('english', idea_name), 'A') || setweight(to_tsvector('english', description), 'B')",
+}
+SEARCH_INDEXES = {
+    **{f"ix_{table}_search_vector": f"ON {table} USING GIN (search_vector)" for table in SEARCH_VECTORS},
+    "ix_problem_clusters_name_trgm": "ON problem_clusters USING GIN (name gin_trgm_ops)",
+    "ix_ideas_idea_name_trgm": "ON ideas USING GIN (idea_name gin_trgm_ops)",
+}
+
 
 async def init_db() -> None:
     retries = max(1, settings.db_init_retries)
@@ -17,7 +63,10 @@ async def init_db() -> None:
         try:
             async with engine.begin() as conn:
                 await conn.run_sync(Base.metadata.create_all)
+                for statement in ADDITIVE_DDL:
+                    await conn.execute(text(statement))
             logger.warning("Database initialization succeeded on attempt %s/%s.", attempt, retries)
+            await init_search()
             return
         except Exception as exc:  # noqa: BLE001
             last_error = exc
@@ -30,3 +79,36 @@ async def init_db() -> None:
         raise RuntimeError(message) from last_error
 
     logger.error("%s Continuing startup because FAIL_ON_DB_INIT_ERROR is false.", message)
+
+
+async def init_search() -> None:
+    """
+    Create the full-text search columns and indexes that are missing. Failures are logged, not raised:
+    the rest of the API works without them and only /search is unavailable.
+    """
+    try:
+        async with engine.begin() as conn:
+            # Give up rather than queue every other query on these tables behind the ALTER's lock.
+            await conn.execute(text(f"SET LOCAL lock_timeout = '{settings.search_ddl_lock_timeout_ms}ms'"))
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            with_vector = set(
+                await conn.scalars(
+                    text(
+                        "SELECT table_name FROM information_schema.columns "
+                        "WHERE table_schema = current_schema() AND column_name = 'search_vector'"
+                    )
+                )
+            )
+            indexes = set(
+                await conn.scalars(text("SELECT indexname FROM pg_indexes WHERE schemaname = current_schema()"))
+            )
+            for table, expression in SEARCH_VECTORS.items():
+                if table not in with_vector:
+                    await conn.execute(
+                        text(f"ALTER TABLE {table} ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({expression}) STORED")
+                    )
+            for name, definition in SEARCH_INDEXES.items():
+                if name not in indexes:
+                    await conn.execute(text(f"CREATE INDEX {name} {definition}"))
+    except Exception:  # noqa: BLE001
+        logger.exception("Search index initialization failed; /search is unavailable until it succeeds.")
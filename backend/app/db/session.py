@@ -1,4 +1,6 @@
-from collections.abc import AsyncGenerator
+import asyncio
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from typing import TypeVar
 
 from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
@@ -6,6 +8,8 @@ from sqlalchemy.orm import DeclarativeBase
 
 from app.core.config import settings
 
+T = TypeVar("T")
+
 
 class Base(DeclarativeBase):
     pass
@@ -70,3 +74,22 @@ AsyncSessionLocal = async_sessionmaker(
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
         yield session
+
+
+async def gather_with_sessions(
+    *operations: Callable[[AsyncSession], Awaitable[T]],
+    limit: int | None = None,
+) -> list[T]:
+    """
+    Run operations concurrently, each on its own session (and therefore its own connection).
+    A single AsyncSession cannot run statements concurrently, so fan-out must not share one.
+    At most `limit` sessions are checked out at once to leave pool headroom for request handlers.
+    """
+    semaphore = asyncio.Semaphore(max(1, limit or settings.db_fanout_limit))
+
+    async def _run(operation: Callable[[AsyncSession], Awaitable[T]]) -> T:
+        async with semaphore:
+            async with AsyncSessionLocal() as session:
+                return await operation(session)
+
+    return list(await asyncio.gather(*(_run(operation) for operation in operations)))
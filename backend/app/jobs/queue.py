@@ -0,0 +1,150 @@
+"""
+Postgres-backed queue for pipeline stage jobs.
+
+Workers claim rows with `SELECT ... FOR UPDATE SKIP LOCKED`, so any number of worker replicas can
+poll the same table and each job runs on exactly one of them. A running job whose heartbeat is older
+than the lease is treated as abandoned (crashed worker) and becomes claimable again, until it has
+used `job_max_attempts`; a job that keeps killing its worker is then marked failed instead.
+"""
+
+import uuid
+from datetime import timedelta
+from typing import Any
+
+from sqlalchemy import and_, func, or_, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.pipeline_job import ACTIVE_JOB_PREDICATE, ACTIVE_JOB_STATUSES, PipelineJob
+
+JOB_TYPES = ("collect", "extract", "cluster", "ideate", "trends")
+
+# Chained jobs enqueue the following stage when they complete.
+NEXT_STAGE: dict[str, str] = {
+    "collect": "extract",
+    "extract": "cluster",
+    "cluster": "ideate",
+    "ideate": "trends",
+}
+
+
+async def enqueue_job(db: AsyncSession, job_type: str, payload: dict[str, Any] | None = None) -> uuid.UUID:
+    """
+    Queue a job and return its id. If a job of the same type is already queued or running,
+    that job's id is returned instead of creating a duplicate. The caller commits.
+    """
+    if job_type not in JOB_TYPES:
+        raise ValueError(f"Unknown pipeline job type: {job_type}")
+
+    stmt = (
+        pg_insert(PipelineJob)
+        .values(id=uuid.uuid4(), job_type=job_type, status="queued", payload=payload or {})
+        .on_conflict_do_nothing(
+            index_elements=[PipelineJob.job_type],
+            index_where=text(ACTIVE_JOB_PREDICATE),
+        )
+        .returning(PipelineJob.id)
+    )
+    job_id = await db.scalar(stmt)
+    if job_id is not None:
+        return job_id
+
+    return await db.scalar(
+        select(PipelineJob.id).where(
+            PipelineJob.job_type == job_type,
+            PipelineJob.status.in_(ACTIVE_JOB_STATUSES),
+        )
+    )
+
+
+async def claim_job(db: AsyncSession, worker_id: str) -> PipelineJob | None:
+    """Lock the oldest runnable job, mark it running for `worker_id`, and commit the claim."""
+    lease_expired = func.now() - timedelta(seconds=settings.worker_lease_seconds)
+    # Abandoned jobs that are out of attempts never finished any of them; stop reclaiming them.
+    await db.execute(
+        update(PipelineJob)
+        .where(
+            PipelineJob.status == "running",
+            PipelineJob.heartbeat_at < lease_expired,
+            PipelineJob.attempts >= settings.job_max_attempts,
+        )
+        .values(status="failed", finished_at=func.now(), error="Worker stopped responding on every attempt.")
+    )
+    stmt = (
+        select(PipelineJob)
+        .where(
+            or_(
+                and_(PipelineJob.status == "queued", PipelineJob.run_after <= func.now()),
+                and_(PipelineJob.status == "running", PipelineJob.heartbeat_at < lease_expired),
+            )
+        )
+        .order_by(PipelineJob.run_after, PipelineJob.created_at)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+    job = await db.scalar(stmt)
+    if job is None:
+        await db.commit()
+        return None
+
+    job.status = "running"
+    job.locked_by = worker_id
+    job.attempts += 1
+    job.started_at = func.now()
+    job.heartbeat_at = func.now()
+    job.error = None
+    await db.commit()
+    await db.refresh(job)
+    return job
+
+
+async def heartbeat_job(db: AsyncSession, job_id: uuid.UUID, worker_id: str) -> bool:
+    """Extend the lease on a running job. Returns False once another worker has reclaimed it."""
+    result = await db.execute(
+        update(PipelineJob)
+        .where(
+            PipelineJob.id == job_id,
+            PipelineJob.locked_by == worker_id,
+            PipelineJob.status == "running",
+        )
+        .values(heartbeat_at=func.now())
+    )
+    await db.commit()
+    return bool(result.rowcount)
+
+
+async def complete_job(db: AsyncSession, job_id: uuid.UUID, worker_id: str, result: dict[str, Any]) -> None:
+    job = await db.get(PipelineJob, job_id, with_for_update=True)
+    if job is None or job.locked_by != worker_id or job.status != "running":
+        await db.rollback()
+        return
+
+    job.status = "succeeded"
+    job.result = result
+    job.finished_at = func.now()
+
+    next_stage = NEXT_STAGE.get(job.job_type)
+    if job.payload.get("chain") and next_stage:
+        await enqueue_job(db, next_stage, {"chain": True, "parent_id": str(job.id)})
+    await db.commit()
+
+
+async def fail_job(db: AsyncSession, job_id: uuid.UUID, worker_id: str, error: str) -> None:
+    """Requeue with exponential backoff until `job_max_attempts`, then mark the job failed."""
+    job = await db.get(PipelineJob, job_id, with_for_update=True)
+    if job is None or job.locked_by != worker_id or job.status != "running":
+        await db.rollback()
+        return
+
+    job.error = error[:4000]
+    if job.attempts < settings.job_max_attempts:
+        delay = settings.job_retry_delay_seconds * 2 ** (job.attempts - 1)
+        job.status = "queued"
+        job.run_after = func.now() + timedelta(seconds=delay)
+        job.locked_by = None
+    else:
+        job.status = "failed"
+        job.finished_at = func.now()
+    await db.commit()
+
@@ -1,15 +1,16 @@
 from app.db.session import AsyncSessionLocal
-from app.services.pipeline import PipelineOrchestrator
+from app.jobs.queue import enqueue_job
 
 
 async def run_scheduled_scrape() -> None:
+    # Only enqueue: a pipeline worker claims the job, and the active-type index collapses
+    # duplicate schedules from several processes into one queued run.
     async with AsyncSessionLocal() as db:
-        orchestrator = PipelineOrchestrator(db)
-        await orchestrator.run_full_pipeline()
+        await enqueue_job(db, "collect", {"chain": True})
+        await db.commit()
 
 
 async def run_scheduled_trend_refresh() -> None:
     async with AsyncSessionLocal() as db:
-        orchestrator = PipelineOrchestrator(db)
-        await orchestrator.recalculate_cluster_trends()
+        await enqueue_job(db, "trends")
         await db.commit()
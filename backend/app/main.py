@@ -1,3 +1,4 @@
+import asyncio
 from contextlib import asynccontextmanager
 import logging
 
@@ -5,10 +6,15 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import ORJSONResponse
 
+from app.api.pagination import NEXT_CURSOR_HEADER
 from app.api.router import api_router
 from app.core.config import settings
 from app.db.init_db import init_db
 from app.jobs.scheduler import scheduler_manager
+from app.services.clustering.workers import shutdown_cluster_executor
+from app.services.collectors.http import collector_http
+from app.services.collectors.reddit_collector import shutdown_reddit_executor
+from app.worker import PipelineWorker
 
 logger = logging.getLogger(__name__)
 
@@ -20,18 +26,30 @@ async def lifespan(_: FastAPI):
     except Exception:  # noqa: BLE001
         logger.exception("Database bootstrap failed during startup; continuing service startup.")
 
-    try:
-        scheduler_manager.start()
-    except Exception:  # noqa: BLE001
-        logger.exception("Scheduler failed to start; continuing service startup.")
+    # Pipeline jobs and their schedule normally run in the separate `python -m app.worker` process.
+    worker: PipelineWorker | None = None
+    worker_task: asyncio.Task | None = None
+    if settings.worker_embedded:
+        try:
+            scheduler_manager.start()
+        except Exception:  # noqa: BLE001
+            logger.exception("Scheduler failed to start; continuing service startup.")
+        worker = PipelineWorker()
+        worker_task = asyncio.create_task(worker.run())
 
     try:
         yield
     finally:
+        if worker is not None and worker_task is not None:
+            worker.stop()
+            await worker_task
         try:
             scheduler_manager.shutdown()
         except Exception:  # noqa: BLE001
             logger.exception("Scheduler shutdown encountered an error.")
+        shutdown_cluster_executor()
+        shutdown_reddit_executor()
+        await collector_http.aclose()
 
 
 app = FastAPI(
@@ -46,6 +64,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 
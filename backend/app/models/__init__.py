@@ -1,14 +1,34 @@
 from app.models.admin_filter import AdminFilter
 from app.models.cluster import ProblemCluster
+from app.models.cluster_centroid import ClusterCentroid
+from app.models.cluster_daily_count import ClusterDailyCount
+from app.models.cluster_neighbor import ClusterNeighbor
+from app.models.collector_cursor import CollectorCursor
+from app.models.dashboard_snapshot import DashboardSnapshot
 from app.models.idea import Idea
+from app.models.llm_cache import LLMCacheEntry
 from app.models.pain import ExtractedPain
+from app.models.pain_embedding import PainEmbedding
+from app.models.pipeline_job import PipelineJob
 from app.models.post import PlatformEnum, Post
+from app.models.post_minhash_band import PostMinhashBand
+from app.models.process_stats import ProcessStats
 
 __all__ = [
     "AdminFilter",
+    "ClusterCentroid",
+    "ClusterDailyCount",
+    "ClusterNeighbor",
+    "CollectorCursor",
+    "DashboardSnapshot",
     "ExtractedPain",
     "Idea",
+    "LLMCacheEntry",
+    "PainEmbedding",
+    "PipelineJob",
     "PlatformEnum",
     "Post",
+    "PostMinhashBand",
+    "ProcessStats",
     "ProblemCluster",
 ]
@@ -0,0 +1,27 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Integer, func
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.session import Base
+
+
+class ClusterCentroid(Base):
+    __tablename__ = "cluster_centroids"
+
+    cluster_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("problem_clusters.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    # Sparse mean vector in the hashed term space: {feature_index: weight}.
+    terms: Mapped[dict[str, float]] = mapped_column(JSONB, default=dict, nullable=False)
+    pain_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
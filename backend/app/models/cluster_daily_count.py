@@ -0,0 +1,21 @@
+import uuid
+from datetime import date
+
+from sqlalchemy import Date, ForeignKey, Integer
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.session import Base
+
+
+class ClusterDailyCount(Base):
+    __tablename__ = "cluster_daily_counts"
+
+    cluster_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("problem_clusters.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    pains: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    sum_urgency: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
@@ -0,0 +1,26 @@
+import uuid
+
+from sqlalchemy import Float, ForeignKey, SmallInteger
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.session import Base
+
+
+class ClusterNeighbor(Base):
+    """Precomputed top-k most similar clusters per cluster, by cosine similarity of their term centroids."""
+
+    __tablename__ = "cluster_neighbors"
+
+    cluster_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("problem_clusters.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    neighbor_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("problem_clusters.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    similarity: Mapped[float] = mapped_column(Float, nullable=False)
+    rank: Mapped[int] = mapped_column(SmallInteger, nullable=False)
@@ -0,0 +1,22 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.session import Base
+
+
+class CollectorCursor(Base):
+    __tablename__ = "collector_cursors"
+
+    platform: Mapped[str] = mapped_column(String(32), primary_key=True)
+    # Empty string for sources that are not queried per keyword.
+    keyword: Mapped[str] = mapped_column(String(255), primary_key=True)
+    # High-water mark in the source's own format (tweet id, epoch seconds, ISO timestamp).
+    cursor: Mapped[str] = mapped_column(String(255), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
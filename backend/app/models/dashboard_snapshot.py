@@ -0,0 +1,17 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Integer, LargeBinary, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.session import Base
+
+
+class DashboardSnapshot(Base):
+    __tablename__ = "dashboard_snapshots"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, default=1)
+    # NULL after an invalidation until the next build is stored.
+    payload: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    # Bumped by every invalidation; a build is only stored if the generation it started from is current.
+    generation: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0", nullable=False)
+    built_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
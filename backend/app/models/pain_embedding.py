@@ -0,0 +1,34 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, LargeBinary, SmallInteger, String, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.session import Base
+
+
+class PainEmbedding(Base):
+    """Embedding of a pain's `pain_point`, stored as an L2-normalised float16 vector."""
+
+    __tablename__ = "pain_embeddings"
+
+    pain_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("extracted_pains.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    # Provider/model name; vectors from different models are never compared.
+    model: Mapped[str] = mapped_column(String(64), nullable=False)
+    dim: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    # SHA-256 of the embedded text, so identical pain points reuse a stored vector instead of a new call.
+    text_hash: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
+    vector: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    # Wall-clock time of the write rather than now()'s transaction start, so it trails the commit by as
+    # little as possible; the ANN index reads new rows by this watermark.
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.clock_timestamp(),
+        nullable=False,
+        index=True,
+    )
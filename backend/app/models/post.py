@@ -2,7 +2,7 @@ import enum
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, Integer, String, Text, UniqueConstraint, func
+from sqlalchemy import DateTime, Float, ForeignKey, Integer, LargeBinary, String, Text, UniqueConstraint, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -32,6 +32,16 @@ class Post(Base):
         server_default=func.now(),
         nullable=False,
     )
+    # MinHash signature of title + content (uint32 values) and, for near-duplicates, the post they copy.
+    minhash: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    canonical_post_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("posts.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
+    )
+    # Local pre-LLM score (0-1) of how likely the post is a pain signal; NULL for posts stored before scoring.
+    relevance_score: Mapped[float | None] = mapped_column(Float, nullable=True)
 
     extracted_pain = relationship(
         "ExtractedPain",
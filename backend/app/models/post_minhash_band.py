@@ -0,0 +1,21 @@
+import uuid
+
+from sqlalchemy import BigInteger, ForeignKey, SmallInteger
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.session import Base
+
+
+class PostMinhashBand(Base):
+    """LSH index over canonical post MinHash signatures: one row per (band, band hash) of each post."""
+
+    __tablename__ = "post_minhash_bands"
+
+    band: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    value: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    post_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("posts.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
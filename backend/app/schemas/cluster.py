@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 from uuid import UUID
 
 from pydantic import BaseModel
@@ -22,8 +22,27 @@ class ProblemClusterOut(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class RelatedClusterOut(ProblemClusterOut):
+    similarity: float
+
+
 class ClusterDetailOut(BaseModel):
     cluster: ProblemClusterOut
     pains: list[ExtractedPainOut]
     ideas: list[IdeaOut]
     posts: list[PostOut]
+    pains_next_cursor: str | None = None
+    ideas_next_cursor: str | None = None
+    posts_next_cursor: str | None = None
+
+
+class ClusterTrendPoint(BaseModel):
+    day: date
+    pains: int
+    avg_urgency: float
+
+
+class ClusterTrendOut(BaseModel):
+    cluster_id: UUID
+    days: int
+    series: list[ClusterTrendPoint]
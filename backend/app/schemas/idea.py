@@ -3,6 +3,9 @@ from uuid import UUID
 
 from pydantic import BaseModel
 
+# Long-form text only loaded and serialised by list endpoints when requested through `fields`.
+IDEA_HEAVY_FIELDS = frozenset({"execution_roadmap", "tech_stack", "gtm_strategy", "launch_plan_30d"})
+
 
 class IdeaOut(BaseModel):
     id: UUID
@@ -21,10 +24,10 @@ class IdeaOut(BaseModel):
     speed_to_mvp: int
     scalability: int
     final_score: float
-    execution_roadmap: str
-    tech_stack: str
-    gtm_strategy: str
-    launch_plan_30d: str
+    execution_roadmap: str | None = None
+    tech_stack: str | None = None
+    gtm_strategy: str | None = None
+    launch_plan_30d: str | None = None
     created_at: datetime
 
     model_config = {"from_attributes": True}
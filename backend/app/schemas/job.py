@@ -0,0 +1,28 @@
+from datetime import datetime
+from typing import Literal
+from uuid import UUID
+
+from pydantic import BaseModel
+
+JobType = Literal["collect", "extract", "cluster", "ideate", "trends"]
+
+
+class PipelineJobIn(BaseModel):
+    job_type: JobType
+    chain: bool = False
+
+
+class PipelineJobOut(BaseModel):
+    id: UUID
+    job_type: str
+    status: str
+    payload: dict
+    result: dict | None
+    error: str | None
+    attempts: int
+    locked_by: str | None
+    created_at: datetime
+    started_at: datetime | None
+    finished_at: datetime | None
+
+    model_config = {"from_attributes": True}
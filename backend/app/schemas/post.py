@@ -3,12 +3,15 @@ from uuid import UUID
 
 from pydantic import BaseModel
 
+# Only loaded and serialised by list endpoints when requested through `fields`.
+POST_HEAVY_FIELDS = frozenset({"content"})
+
 
 class PostOut(BaseModel):
     id: UUID
     platform: str
     title: str
-    content: str
+    content: str | None = None
     upvotes: int
     comments: int
     url: str
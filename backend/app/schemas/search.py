@@ -0,0 +1,25 @@
+from typing import Literal
+from uuid import UUID
+
+from pydantic import BaseModel
+
+SearchKind = Literal["post", "pain", "cluster", "idea"]
+
+
+class SearchHitOut(BaseModel):
+    kind: SearchKind
+    id: UUID
+    title: str
+    # HTML-escaped fragment of the body with matching terms wrapped in <mark>...</mark>.
+    snippet: str
+    rank: float
+    cluster_id: UUID | None = None
+    url: str | None = None
+
+
+class SearchOut(BaseModel):
+    query: str
+    hits: list[SearchHitOut]
+    next_offset: int | None = None
+    # True when a kind had more matches than SEARCH_MAX_CANDIDATES and only a subset was ranked.
+    approximate: bool = False
@@ -0,0 +1,75 @@
+"""
+Pluggable text embedding providers for pain clustering.
+
+Every provider returns L2-normalised float32 rows, so cosine similarity is a plain inner product.
+`name` identifies the vector space: stored vectors are only compared with vectors of the same name.
+"""
+
+import asyncio
+from typing import Protocol
+
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+
+from app.core.config import settings
+from app.services.ai.openai_client import run_embeddings
+
+
+class EmbeddingProvider(Protocol):
+    name: str
+
+    async def embed(self, texts: list[str]) -> np.ndarray | None: ...
+
+
+class HashingEmbeddingProvider:
+    """
+    Local, dependency-free embeddings: character 3-5 grams hashed into `dim` signed buckets.
+    Picks up shared word stems and misspellings but not synonyms; use the OpenAI provider for those.
+    """
+
+    def __init__(self, dim: int) -> None:
+        self.name = f"hashing-char-{dim}"
+        self._vectorizer = HashingVectorizer(
+            analyzer="char_wb",
+            ngram_range=(3, 5),
+            n_features=dim,
+            alternate_sign=True,
+            norm="l2",
+        )
+
+    async def embed(self, texts: list[str]) -> np.ndarray | None:
+        return await asyncio.to_thread(self._embed, texts)
+
+    def _embed(self, texts: list[str]) -> np.ndarray:
+        return self._vectorizer.transform(texts).toarray().astype(np.float32)
+
+
+class OpenAIEmbeddingProvider:
+    def __init__(self, model: str, batch_size: int) -> None:
+        self.name = model
+        self.batch_size = max(1, batch_size)
+
+    async def embed(self, texts: list[str]) -> np.ndarray | None:
+        batches = [texts[start : start + self.batch_size] for start in range(0, len(texts), self.batch_size)]
+        results = await asyncio.gather(*(run_embeddings(batch) for batch in batches))
+        if any(result is None for result in results):
+            return None
+        return normalize(np.asarray([vector for result in results for vector in result], dtype=np.float32))
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+
+def encode_vector(vector: np.ndarray) -> bytes:
+    return vector.astype(np.float16).tobytes()
+
+
+def decode_vector(blob: bytes) -> np.ndarray:
+    return np.frombuffer(blob, dtype=np.float16).astype(np.float32)
+
+
+def get_embedding_provider() -> EmbeddingProvider:
+    if settings.embedding_provider == "openai" and settings.openai_api_key:
+        return OpenAIEmbeddingProvider(settings.openai_embedding_model, settings.embedding_batch_size)
+    return HashingEmbeddingProvider(settings.embedding_dim)
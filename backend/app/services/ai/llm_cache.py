@@ -0,0 +1,206 @@
+"""
+Content-addressed cache for JSON chat completions.
+
+Entries are keyed by a SHA-256 of (model, system prompt, user prompt, temperature), so identical
+prompts from reruns or cross-posted content are answered without another OpenAI round-trip.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Protocol
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.llm_cache import LLMCacheEntry
+
+logger = logging.getLogger(__name__)
+
+# Size-based eviction runs once per this many writes rather than on every write.
+_EVICT_EVERY_WRITES = 100
+
+
+@dataclass(slots=True)
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+
+
+class LLMCacheBackend(Protocol):
+    async def get(self, key: str) -> dict[str, Any] | None: ...
+
+    async def set(self, key: str, model: str, value: dict[str, Any]) -> int: ...
+
+
+def make_cache_key(model: str, system_prompt: str, user_prompt: str, temperature: float) -> str:
+    material = json.dumps([model, system_prompt, user_prompt, temperature], ensure_ascii=False)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class DiskLLMCache:
+    """One JSON file per entry, sharded by the first two hex characters of the key."""
+
+    def __init__(self, directory: str, ttl_seconds: int, max_entries: int) -> None:
+        self.directory = Path(directory)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._writes = 0
+
+    async def get(self, key: str) -> dict[str, Any] | None:
+        return await asyncio.to_thread(self._read, key)
+
+    async def set(self, key: str, model: str, value: dict[str, Any]) -> int:
+        await asyncio.to_thread(self._write, key, model, value)
+        self._writes += 1
+        if self._writes % _EVICT_EVERY_WRITES == 0:
+            return await asyncio.to_thread(self._evict)
+        return 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _read(self, key: str) -> dict[str, Any] | None:
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+        if entry.get("expires_at", 0) < time.time():
+            path.unlink(missing_ok=True)
+            return None
+        return entry.get("value")
+
+    def _write(self, key: str, model: str, value: dict[str, Any]) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {"model": model, "expires_at": time.time() + self.ttl_seconds, "value": value}
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+        tmp_path.replace(path)
+
+    def _evict(self) -> int:
+        now = time.time()
+        live: list[tuple[float, Path]] = []
+        removed = 0
+        for path in self.directory.glob("*/*.json"):
+            try:
+                mtime = path.stat().st_mtime
+            except OSError:
+                continue
+            if mtime + self.ttl_seconds < now:
+                path.unlink(missing_ok=True)
+                removed += 1
+            else:
+                live.append((mtime, path))
+
+        overflow = len(live) - self.max_entries
+        if overflow > 0:
+            live.sort()
+            for _, path in live[:overflow]:
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+
+class PostgresLLMCache:
+    """Shares cached completions across replicas through the `llm_cache_entries` table."""
+
+    def __init__(self, ttl_seconds: int, max_entries: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._writes = 0
+
+    async def get(self, key: str) -> dict[str, Any] | None:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(LLMCacheEntry.response).where(
+                    LLMCacheEntry.key == key,
+                    LLMCacheEntry.expires_at > datetime.now(timezone.utc),
+                )
+            )
+            return result.scalar_one_or_none()
+
+    async def set(self, key: str, model: str, value: dict[str, Any]) -> int:
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=self.ttl_seconds)
+        stmt = pg_insert(LLMCacheEntry).values(key=key, model=model, response=value, expires_at=expires_at)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[LLMCacheEntry.key],
+            set_={"response": stmt.excluded.response, "expires_at": stmt.excluded.expires_at},
+        )
+
+        self._writes += 1
+        evicted = 0
+        async with AsyncSessionLocal() as db:
+            await db.execute(stmt)
+            if self._writes % _EVICT_EVERY_WRITES == 0:
+                evicted = await self._evict(db)
+            await db.commit()
+        return evicted
+
+    async def _evict(self, db: AsyncSession) -> int:
+        expired = await db.execute(delete(LLMCacheEntry).where(LLMCacheEntry.expires_at <= datetime.now(timezone.utc)))
+        overflow_keys = (
+            select(LLMCacheEntry.key)
+            .order_by(LLMCacheEntry.created_at.desc())
+            .offset(self.max_entries)
+            .scalar_subquery()
+        )
+        overflow = await db.execute(delete(LLMCacheEntry).where(LLMCacheEntry.key.in_(overflow_keys)))
+        return int(expired.rowcount or 0) + int(overflow.rowcount or 0)
+
+
+class LLMResponseCache:
+    def __init__(self, backend: LLMCacheBackend | None) -> None:
+        self.backend = backend
+        self.stats = CacheStats()
+
+    async def get(self, key: str) -> dict[str, Any] | None:
+        if self.backend is None:
+            return None
+        try:
+            value = await self.backend.get(key)
+        except Exception:  # noqa: BLE001
+            logger.exception("LLM cache lookup failed; treating as a miss.")
+            value = None
+
+        if value is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return value
+
+    async def set(self, key: str, model: str, value: dict[str, Any]) -> None:
+        if self.backend is None:
+            return
+        try:
+            self.stats.evictions += await self.backend.set(key, model, value)
+            self.stats.writes += 1
+        except Exception:  # noqa: BLE001
+            logger.exception("LLM cache write failed; continuing without caching.")
+
+    def snapshot(self) -> dict[str, Any]:
+        return {"backend": settings.llm_cache_backend, **asdict(self.stats)}
+
+
+def _build_backend() -> LLMCacheBackend | None:
+    if settings.llm_cache_backend == "disk":
+        return DiskLLMCache(settings.llm_cache_dir, settings.llm_cache_ttl_seconds, settings.llm_cache_max_entries)
+    if settings.llm_cache_backend == "postgres":
+        return PostgresLLMCache(settings.llm_cache_ttl_seconds, settings.llm_cache_max_entries)
+    return None
+
+
+llm_cache = LLMResponseCache(_build_backend())
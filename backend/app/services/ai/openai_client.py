@@ -1,10 +1,19 @@
+import asyncio
 import json
+import logging
+import time
 from typing import Any
 
-from openai import AsyncOpenAI
+from openai import APIConnectionError, APIStatusError, AsyncOpenAI
 
 from app.core.config import settings
+from app.services.ai.llm_cache import llm_cache, make_cache_key
+from app.services.ai.rate_limiter import openai_limiter, retry_delay
 
+logger = logging.getLogger(__name__)
+
+# Allowance for the completion itself when budgeting tokens before a request.
+_EXPECTED_COMPLETION_TOKENS = 800
 
 _client: AsyncOpenAI | None = None
 
@@ -14,26 +23,105 @@ def get_openai_client() -> AsyncOpenAI | None:
     if not settings.openai_api_key:
         return None
     if _client is None:
-        _client = AsyncOpenAI(api_key=settings.openai_api_key)
+        # Retries are handled by run_json_completion so they go through the shared limiter.
+        _client = AsyncOpenAI(api_key=settings.openai_api_key, max_retries=0)
     return _client
 
 
-async def run_json_completion(system_prompt: str, user_prompt: str) -> dict[str, Any] | None:
+async def run_json_completion(
+    system_prompt: str,
+    user_prompt: str,
+    temperature: float = 0.2,
+) -> dict[str, Any] | None:
     client = get_openai_client()
     if client is None:
         return None
 
-    try:
-        completion = await client.chat.completions.create(
-            model=settings.openai_model,
-            temperature=0.2,
-            response_format={"type": "json_object"},
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-        )
-        content = completion.choices[0].message.content or "{}"
-        return json.loads(content)
-    except Exception:
+    cache_key = make_cache_key(settings.openai_model, system_prompt, user_prompt, temperature)
+    cached = await llm_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    estimated_tokens = (len(system_prompt) + len(user_prompt)) // 4 + _EXPECTED_COMPLETION_TOKENS
+    parsed: Any = None
+    for attempt in range(settings.openai_max_retries + 1):
+        async with openai_limiter.slot(estimated_tokens) as ticket:
+            started = time.monotonic()
+            try:
+                completion = await client.chat.completions.create(
+                    model=settings.openai_model,
+                    temperature=temperature,
+                    response_format={"type": "json_object"},
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt},
+                    ],
+                )
+            except APIStatusError as exc:
+                if exc.status_code != 429 and exc.status_code < 500:
+                    logger.warning("OpenAI request rejected with status %s; not retrying.", exc.status_code)
+                    return None
+                openai_limiter.record_throttle(ticket)
+                delay = retry_delay(attempt, exc.response)
+            except APIConnectionError:
+                openai_limiter.record_throttle(ticket)
+                delay = retry_delay(attempt, None)
+            except Exception:  # noqa: BLE001
+                logger.exception("OpenAI request failed unexpectedly; using fallback.")
+                return None
+            else:
+                openai_limiter.record_success(time.monotonic() - started)
+                if completion.usage is not None:
+                    openai_limiter.tokens.adjust(completion.usage.total_tokens - estimated_tokens)
+                try:
+                    parsed = json.loads(completion.choices[0].message.content or "{}")
+                except ValueError:
+                    logger.warning("OpenAI returned non-JSON content; using fallback.")
+                    return None
+                break
+
+        if attempt == settings.openai_max_retries:
+            logger.warning("OpenAI request failed after %s attempts; using fallback.", attempt + 1)
+            return None
+        await asyncio.sleep(delay)
+
+    if isinstance(parsed, dict):
+        await llm_cache.set(cache_key, settings.openai_model, parsed)
+    return parsed
+
+
+async def run_embeddings(texts: list[str]) -> list[list[float]] | None:
+    """Embed `texts` with `openai_embedding_model`, one vector per text in order; None when unavailable."""
+    client = get_openai_client()
+    if client is None or not texts:
         return None
+
+    estimated_tokens = sum(len(text) for text in texts) // 4 + len(texts)
+    for attempt in range(settings.openai_max_retries + 1):
+        async with openai_limiter.slot(estimated_tokens) as ticket:
+            started = time.monotonic()
+            try:
+                response = await client.embeddings.create(model=settings.openai_embedding_model, input=texts)
+            except APIStatusError as exc:
+                if exc.status_code != 429 and exc.status_code < 500:
+                    logger.warning("OpenAI embeddings request rejected with status %s; not retrying.", exc.status_code)
+                    return None
+                openai_limiter.record_throttle(ticket)
+                delay = retry_delay(attempt, exc.response)
+            except APIConnectionError:
+                openai_limiter.record_throttle(ticket)
+                delay = retry_delay(attempt, None)
+            except Exception:  # noqa: BLE001
+                logger.exception("OpenAI embeddings request failed unexpectedly.")
+                return None
+            else:
+                openai_limiter.record_success(time.monotonic() - started)
+                if response.usage is not None:
+                    openai_limiter.tokens.adjust(response.usage.total_tokens - estimated_tokens)
+                return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+        if attempt == settings.openai_max_retries:
+            logger.warning("OpenAI embeddings request failed after %s attempts.", attempt + 1)
+            return None
+        await asyncio.sleep(delay)
+    return None
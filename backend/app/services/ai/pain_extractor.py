@@ -3,6 +3,31 @@ from typing import Any
 
 from app.models.post import Post
 from app.services.ai.openai_client import run_json_completion
+from app.services.collectors.base import RawPost
+from app.services.keyword_matcher import KeywordMatcher
+
+# Phrases typical of someone describing a problem they want solved.
+PAIN_LEXICON = KeywordMatcher(
+    [
+        "struggle", "struggling", "frustrated", "frustrating", "annoying", "hate", "painful", "pain point",
+        "tedious", "time consuming", "takes hours", "by hand", "manually", "manual process", "spreadsheet",
+        "spreadsheets", "workaround", "is there a tool", "is there an app", "how do you", "how do i",
+        "looking for", "alternative to", "any recommendations", "wish there was", "keeps breaking",
+        "too expensive", "costly", "waste of time", "bottleneck", "churn", "can't find", "stuck",
+    ]
+)
+# Phrases typical of job ads, memes and promotional noise. Launch wording is left out on purpose:
+# every Product Hunt post is a launch and competitor launches are still useful signal.
+NOISE_LEXICON = KeywordMatcher(
+    [
+        "we're hiring", "we are hiring", "job opening", "apply now", "giveaway", "discount code",
+        "promo code", "meme", "shitpost", "please upvote", "check out my", "sign up today", "use my referral",
+    ]
+)
+
+# Starting values of the urgency and willingness-to-pay heuristics before any signal is found.
+_BASE_URGENCY = 3
+_BASE_WTP = 4
 
 
 @dataclass(slots=True)
@@ -21,12 +46,7 @@ class PainExtractor:
             "Return strict JSON with keys: pain_point, target_user, urgency_score, "
             "willingness_to_pay, existing_solutions. urgency_score and willingness_to_pay are integers 1-10."
         )
-        user_prompt = (
-            f"Platform: {post.platform}\n"
-            f"Title: {post.title}\n"
-            f"Content: {post.content}\n"
-            f"Upvotes: {post.upvotes}\nComments: {post.comments}"
-        )
+        user_prompt = self._describe(post)
 
         parsed = await run_json_completion(system_prompt, user_prompt)
         if parsed is None:
@@ -34,6 +54,82 @@ class PainExtractor:
 
         return self._normalize(parsed, post)
 
+    async def extract_batch(self, posts: list[Post]) -> list[PainExtractionPayload]:
+        """Extract several posts in one completion; items missing or malformed in the reply fall back individually."""
+        if len(posts) == 1:
+            return [await self.extract(posts[0])]
+
+        system_prompt = (
+            "You are an analyst that extracts startup pain signals from social discussions. "
+            "You receive several posts, each introduced by `Key: <key>`. Return strict JSON with key `items`: "
+            "an array with one object per post containing: key, pain_point, target_user, urgency_score, "
+            "willingness_to_pay, existing_solutions. urgency_score and willingness_to_pay are integers 1-10."
+        )
+        user_prompt = "\n\n---\n\n".join(f"Key: {idx}\n{self._describe(post)}" for idx, post in enumerate(posts))
+
+        parsed = await run_json_completion(system_prompt, user_prompt)
+        items_by_key: dict[str, dict[str, Any]] = {}
+        if parsed is not None and isinstance(parsed.get("items"), list):
+            for item in parsed["items"]:
+                if isinstance(item, dict) and str(item.get("pain_point") or "").strip():
+                    items_by_key.setdefault(str(item.get("key")).strip(), item)
+
+        payloads: list[PainExtractionPayload] = []
+        for idx, post in enumerate(posts):
+            item = items_by_key.get(str(idx))
+            payloads.append(self._normalize(item, post) if item is not None else self._fallback(post))
+        return payloads
+
+    def pack_batches(self, posts: list[Post], max_posts: int, token_budget: int) -> list[list[Post]]:
+        """Greedily group posts so each batch stays under `max_posts` and the estimated prompt token budget."""
+        batches: list[list[Post]] = []
+        current: list[Post] = []
+        current_tokens = 0
+        for post in posts:
+            tokens = self._estimate_tokens(post)
+            if current and (len(current) >= max_posts or current_tokens + tokens > token_budget):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(post)
+            current_tokens += tokens
+
+        if current:
+            batches.append(current)
+        return batches
+
+    def relevance(self, post: Post | RawPost) -> float:
+        """
+        Cheap -0.5 to 1 score of how likely a post is a pain signal, used to gate LLM extraction.
+        Combines pain and noise lexicon hits with the urgency and willingness-to-pay heuristics,
+        counting only what those add above their base values. A post with no signal either way (a
+        launch without pain wording, say) scores 0; only noise wording pushes a post below 0.
+        """
+        text = f"{post.title}\n{post.content}"
+        pain_hits = min(PAIN_LEXICON.count(text), 3)
+        noise_hits = min(NOISE_LEXICON.count(text), 2)
+
+        score = 0.3 * max(self._estimate_urgency(post) - _BASE_URGENCY, 0) / (10 - _BASE_URGENCY)
+        score += 0.2 * max(self._estimate_wtp(post) - _BASE_WTP, 0) / (10 - _BASE_WTP)
+        score += 0.4 * pain_hits / 3
+        if "?" in text:
+            score += 0.1
+        score -= 0.25 * noise_hits
+        return round(max(-0.5, min(score, 1.0)), 3)
+
+    @staticmethod
+    def _describe(post: Post) -> str:
+        return (
+            f"Platform: {post.platform}\n"
+            f"Title: {post.title}\n"
+            f"Content: {post.content}\n"
+            f"Upvotes: {post.upvotes}\nComments: {post.comments}"
+        )
+
+    @classmethod
+    def _estimate_tokens(cls, post: Post) -> int:
+        # Roughly four characters per token for English text.
+        return len(cls._describe(post)) // 4 + 16
+
     def _normalize(self, parsed: dict[str, Any], post: Post) -> PainExtractionPayload:
         pain_point = str(parsed.get("pain_point") or post.title[:220]).strip()
         target_user = str(parsed.get("target_user") or "SMB operators").strip()
@@ -72,8 +168,8 @@ class PainExtractor:
             return fallback
 
     @staticmethod
-    def _estimate_urgency(post: Post) -> int:
-        score = 3
+    def _estimate_urgency(post: Post | RawPost) -> int:
+        score = _BASE_URGENCY
         if post.upvotes > 20:
             score += 2
         if post.comments > 10:
@@ -83,8 +179,8 @@ class PainExtractor:
         return max(1, min(score, 10))
 
     @staticmethod
-    def _estimate_wtp(post: Post) -> int:
-        score = 4
+    def _estimate_wtp(post: Post | RawPost) -> int:
+        score = _BASE_WTP
         lower_content = post.content.lower()
         if any(token in lower_content for token in ["pay", "budget", "expensive", "cost"]):
             score += 2
@@ -0,0 +1,144 @@
+"""
+Adaptive concurrency and token-budget limiting shared by every OpenAI call.
+
+Concurrency follows AIMD: each fast success widens the window a little, while a 429 or 5xx
+halves it, at most once per window: throttles of requests sent before the last cut are ignored.
+A token bucket keeps the estimated tokens-per-minute under the account budget.
+"""
+
+import asyncio
+import random
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+from app.core.config import settings
+
+
+class TokenBucket:
+    def __init__(self, tokens_per_minute: int) -> None:
+        self.capacity = float(max(1, tokens_per_minute))
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def consume(self, amount: int) -> None:
+        amount = min(float(amount), self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+    def adjust(self, delta: int) -> None:
+        """Correct an earlier estimate once the real usage is known (positive delta spends more)."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - delta)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+
+class AdaptiveLimiter:
+    def __init__(
+        self,
+        initial: int,
+        minimum: int,
+        maximum: int,
+        target_latency_seconds: float,
+        tokens_per_minute: int,
+    ) -> None:
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.target_latency_seconds = target_latency_seconds
+        self.in_flight = 0
+        self.tokens = TokenBucket(tokens_per_minute)
+        self._decreases = 0
+        self._condition = asyncio.Condition()
+
+    @asynccontextmanager
+    async def slot(self, estimated_tokens: int) -> AsyncIterator[int]:
+        """Hold a concurrency slot; yields the ticket to pass to `record_throttle` for this request."""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+        try:
+            await self.tokens.consume(estimated_tokens)
+            yield self._decreases
+        finally:
+            async with self._condition:
+                self.in_flight -= 1
+                self._condition.notify_all()
+
+    def record_success(self, latency_seconds: float) -> None:
+        if latency_seconds <= self.target_latency_seconds:
+            # Additive increase: roughly +1 slot per full window of fast responses.
+            self.limit = min(float(self.maximum), self.limit + 1.0 / self.limit)
+        else:
+            self.limit = max(float(self.minimum), self.limit - 1.0 / self.limit)
+
+    def record_throttle(self, ticket: int | None = None) -> None:
+        """
+        Halve the window, unless the throttled request (identified by its `slot` ticket) was sent before
+        the last cut: a burst of concurrent 429s is one congestion signal, not one per request.
+        """
+        if ticket is not None and ticket < self._decreases:
+            return
+        self.limit = max(float(self.minimum), self.limit / 2.0)
+        self._decreases += 1
+
+    def snapshot(self) -> dict[str, float | int]:
+        return {
+            "concurrency_limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "tokens_available": int(self.tokens.tokens),
+        }
+
+
+def retry_delay(attempt: int, response: httpx.Response | None) -> float:
+    """Seconds to wait before retry `attempt` (0-based): Retry-After when given, else jittered exponential backoff."""
+    retry_after = parse_retry_after(response.headers) if response is not None else None
+    if retry_after is not None:
+        return min(retry_after, settings.openai_backoff_max_seconds) + random.uniform(0, 0.5)
+
+    ceiling = min(settings.openai_backoff_max_seconds, settings.openai_backoff_base_seconds * 2**attempt)
+    return random.uniform(ceiling / 2, ceiling)
+
+
+def parse_retry_after(headers: httpx.Headers) -> float | None:
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return max(0.0, float(retry_after_ms) / 1000.0)
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+openai_limiter = AdaptiveLimiter(
+    initial=settings.openai_initial_concurrency,
+    minimum=settings.openai_min_concurrency,
+    maximum=settings.openai_max_concurrency,
+    target_latency_seconds=settings.openai_target_latency_seconds,
+    tokens_per_minute=settings.openai_tokens_per_minute,
+)
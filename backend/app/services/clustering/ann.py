@@ -0,0 +1,151 @@
+"""
+In-process approximate nearest-neighbour search over L2-normalised vectors.
+
+`IVFIndex` is an inverted-file index: vectors are bucketed under the nearest of ~sqrt(n) k-means
+centroids, and a query only scores the buckets of its `nprobe` closest centroids. Small indexes
+skip the quantiser and are searched exactly. Vectors can be added at any time; the quantiser is
+retrained once the index has grown well past the size it was trained on.
+"""
+
+from collections.abc import Collection
+
+import numpy as np
+
+# Retrain the quantiser when the index has grown this many times past its last training size.
+_RETRAIN_GROWTH = 4
+_KMEANS_ITERATIONS = 10
+_TRAIN_SAMPLES_PER_LIST = 64
+
+
+class IVFIndex:
+    def __init__(self, dim: int, nprobe: int = 8, min_train_size: int = 1024) -> None:
+        self.dim = dim
+        self.nprobe = max(1, nprobe)
+        self.min_train_size = max(1, min_train_size)
+        self.ids: list = []
+        self._row_by_id: dict = {}
+        self._vectors = np.empty((0, dim), dtype=np.float32)
+        self._size = 0
+        self._centroids: np.ndarray | None = None
+        self._lists: list[list[int]] = []
+        self._list_arrays: list[np.ndarray | None] = []
+        self._trained_size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def vectors(self) -> np.ndarray:
+        return self._vectors[: self._size]
+
+    def add(self, ids: list, vectors: np.ndarray) -> None:
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        if len(ids) != vectors.shape[0]:
+            raise ValueError("ids and vectors must have the same length")
+        if not ids:
+            return
+
+        start = self._size
+        needed = start + len(ids)
+        if needed > self._vectors.shape[0]:
+            grown = np.empty((max(needed, 2 * self._vectors.shape[0], 64), self.dim), dtype=np.float32)
+            grown[:start] = self._vectors[:start]
+            self._vectors = grown
+        self._vectors[start:needed] = vectors
+        self._size = needed
+        self.ids.extend(ids)
+        self._row_by_id.update(zip(ids, range(start, needed)))
+
+        if self._size >= self.min_train_size and (
+            self._centroids is None or self._size >= _RETRAIN_GROWTH * self._trained_size
+        ):
+            self._train()
+        elif self._centroids is not None:
+            self._assign(np.arange(start, needed))
+
+    def search(self, queries: np.ndarray, k: int, exclude: Collection = ()) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Top-`k` inner-product matches per query row, best first, never returning the ids in `exclude`.
+        Returns (scores, rows) of shape (m, k); rows index `ids` and are -1 where fewer than k were found.
+        """
+        queries = np.asarray(queries, dtype=np.float32).reshape(-1, self.dim)
+        scores = np.full((queries.shape[0], k), -np.inf, dtype=np.float32)
+        rows = np.full((queries.shape[0], k), -1, dtype=np.int64)
+        if self._size == 0 or k <= 0:
+            return scores, rows
+
+        allowed: np.ndarray | None = None
+        excluded_rows = [self._row_by_id[item] for item in exclude if item in self._row_by_id]
+        if excluded_rows:
+            allowed = np.ones(self._size, dtype=bool)
+            allowed[excluded_rows] = False
+
+        if self._centroids is None:
+            # Exact search: one matrix product over every stored vector.
+            candidates = np.arange(self._size) if allowed is None else np.flatnonzero(allowed)
+            all_scores = queries @ self._vectors[candidates].T
+            for qi in range(queries.shape[0]):
+                if candidates.size:
+                    self._top_k(all_scores[qi], candidates, k, scores[qi], rows[qi])
+            return scores, rows
+
+        nprobe = min(self.nprobe, self._centroids.shape[0])
+        probes = np.argpartition(-(queries @ self._centroids.T), nprobe - 1, axis=1)[:, :nprobe]
+        for qi in range(queries.shape[0]):
+            candidates = np.concatenate([self._list_array(int(c)) for c in probes[qi]])
+            if allowed is not None:
+                candidates = candidates[allowed[candidates]]
+            if candidates.size:
+                self._top_k(self._vectors[candidates] @ queries[qi], candidates, k, scores[qi], rows[qi])
+        return scores, rows
+
+    def _train(self) -> None:
+        vectors = self.vectors
+        nlist = max(1, int(np.sqrt(self._size)))
+        rng = np.random.default_rng(0)
+        sample_size = min(self._size, nlist * _TRAIN_SAMPLES_PER_LIST)
+        sample = vectors[rng.choice(self._size, size=sample_size, replace=False)]
+
+        # Spherical k-means: centroids are re-normalised so assignment is by cosine similarity.
+        centroids = sample[rng.choice(sample_size, size=nlist, replace=False)].copy()
+        for _ in range(_KMEANS_ITERATIONS):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            for c in range(nlist):
+                members = sample[labels == c]
+                if members.shape[0]:
+                    centroids[c] = members.sum(axis=0)
+            centroids /= np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+
+        self._centroids = centroids.astype(np.float32)
+        self._lists = [[] for _ in range(nlist)]
+        self._list_arrays = [None] * nlist
+        self._trained_size = self._size
+        self._assign(np.arange(self._size))
+
+    def _assign(self, rows: np.ndarray) -> None:
+        assert self._centroids is not None
+        labels = np.argmax(self._vectors[rows] @ self._centroids.T, axis=1)
+        for row, label in zip(rows.tolist(), labels.tolist()):
+            self._lists[label].append(row)
+            self._list_arrays[label] = None
+
+    def _list_array(self, idx: int) -> np.ndarray:
+        cached = self._list_arrays[idx]
+        if cached is None:
+            cached = np.asarray(self._lists[idx], dtype=np.int64)
+            self._list_arrays[idx] = cached
+        return cached
+
+    @staticmethod
+    def _top_k(
+        candidate_scores: np.ndarray,
+        candidate_rows: np.ndarray,
+        k: int,
+        out_scores: np.ndarray,
+        out_rows: np.ndarray,
+    ) -> None:
+        n = min(k, candidate_scores.shape[0])
+        top = np.argpartition(-candidate_scores, n - 1)[:n] if n < candidate_scores.shape[0] else np.arange(n)
+        top = top[np.argsort(-candidate_scores[top], kind="stable")]
+        out_scores[:n] = candidate_scores[top]
+        out_rows[:n] = candidate_rows[top]
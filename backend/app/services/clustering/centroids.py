@@ -0,0 +1,91 @@
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer
+
+# Stateless vectorizer so centroids stay comparable across runs without refitting a vocabulary.
+_vectorizer = HashingVectorizer(
+    stop_words="english",
+    n_features=2**18,
+    alternate_sign=False,
+    norm="l2",
+)
+
+
+def vectorize(texts: list[str]) -> sparse.csr_matrix:
+    return _vectorizer.transform(texts).tocsr()
+
+
+def centroid_terms(matrix: sparse.csr_matrix, max_terms: int) -> dict[str, float]:
+    """Mean row of `matrix`, truncated to its `max_terms` heaviest features."""
+    if matrix.shape[0] == 0:
+        return {}
+    mean = np.asarray(matrix.sum(axis=0)).ravel() / matrix.shape[0]
+    return _top_terms(mean, max_terms)
+
+
+def merge_centroid(
+    terms: dict[str, float],
+    pain_count: int,
+    matrix: sparse.csr_matrix,
+    max_terms: int,
+) -> dict[str, float]:
+    """Fold new member rows into an existing running-mean centroid."""
+    total = pain_count + matrix.shape[0]
+    if total == 0:
+        return {}
+
+    merged = np.asarray(matrix.sum(axis=0)).ravel()
+    for key, weight in terms.items():
+        merged[int(key)] += weight * pain_count
+    return _top_terms(merged / total, max_terms)
+
+
+def centroid_matrix(centroids: list[dict[str, float]]) -> sparse.csr_matrix:
+    """Stack centroids into an L2-normalised sparse matrix, one row per centroid."""
+    rows: list[int] = []
+    cols: list[int] = []
+    values: list[float] = []
+    for row_idx, terms in enumerate(centroids):
+        norm = float(np.sqrt(sum(weight * weight for weight in terms.values()))) or 1.0
+        for key, weight in terms.items():
+            rows.append(row_idx)
+            cols.append(int(key))
+            values.append(weight / norm)
+
+    return sparse.csr_matrix(
+        (values, (rows, cols)),
+        shape=(len(centroids), _vectorizer.n_features),
+        dtype=np.float64,
+    )
+
+
+def nearest_centroids(
+    matrix: sparse.csr_matrix,
+    centroids: sparse.csr_matrix,
+    min_similarity: float,
+) -> list[int | None]:
+    """Index of the most similar centroid for each row, or None when nothing clears `min_similarity`."""
+    if matrix.shape[0] == 0:
+        return []
+    if centroids.shape[0] == 0:
+        return [None] * matrix.shape[0]
+
+    similarities = (matrix @ centroids.T).tocsr()
+    best: list[int | None] = []
+    for row_idx in range(similarities.shape[0]):
+        start, end = similarities.indptr[row_idx], similarities.indptr[row_idx + 1]
+        if start == end:
+            best.append(None)
+            continue
+        data = similarities.data[start:end]
+        top = int(np.argmax(data))
+        best.append(int(similarities.indices[start + top]) if data[top] >= min_similarity else None)
+    return best
+
+
+def _top_terms(vector: np.ndarray, max_terms: int) -> dict[str, float]:
+    nonzero = np.flatnonzero(vector)
+    if nonzero.size > max_terms:
+        keep = np.argpartition(vector[nonzero], -max_terms)[-max_terms:]
+        nonzero = nonzero[keep]
+    return {str(int(idx)): round(float(vector[idx]), 6) for idx in nonzero}
@@ -1,30 +1,107 @@
+import logging
+import uuid
 from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
 
-from sklearn.cluster import AgglomerativeClustering
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sqlalchemy import func, select
+import numpy as np
+from sqlalchemy import Date, cast, delete, exists, func, insert, literal_column, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.sql.elements import ColumnElement
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.models.cluster import ProblemCluster
+from app.models.cluster_centroid import ClusterCentroid
+from app.models.cluster_daily_count import ClusterDailyCount
+from app.models.cluster_neighbor import ClusterNeighbor
 from app.models.pain import ExtractedPain
+from app.services.clustering.pain_vectors import embed_pains, pain_index
+from app.services.clustering.workers import (
+    assign_texts,
+    build_centroids,
+    label_texts,
+    label_texts_knn_graph,
+    label_vectors_knn_graph,
+    merge_texts,
+    nearest_clusters,
+    run_clustering_task,
+)
+
+logger = logging.getLogger(__name__)
 
 
 class ClusterEngine:
     """Groups similar pains into reusable problem clusters."""
 
+    def __init__(self) -> None:
+        self._neighbors_stale = False
+
     async def cluster_unassigned_pains(self, db: AsyncSession) -> list[ProblemCluster]:
+        """
+        Cluster every pain without a cluster. Streaming ingestion calls this once per watermark, so the
+        neighbour graph is not rebuilt here; call `refresh_neighbors` once the stage is done.
+        """
         result = await db.execute(select(ExtractedPain).where(ExtractedPain.cluster_id.is_(None)))
         pains = list(result.scalars().all())
         if not pains:
             return []
 
-        groups = self._build_groups(pains)
-        created_clusters: list[ProblemCluster] = []
+        created_clusters = await self._cluster_pains(db, pains)
+        self._neighbors_stale = True
+        return created_clusters
 
-        for group in groups:
-            if not group:
-                continue
+    async def refresh_neighbors(self, db: AsyncSession) -> None:
+        """
+        Rebuild the `cluster_neighbors` top-k graph from the current term centroids, if this engine
+        clustered any pains since the last rebuild.
+        """
+        if not self._neighbors_stale:
+            return
+        centroids = await self._load_centroids(db)
+        neighbors = await run_clustering_task(
+            nearest_clusters,
+            [centroid.terms for centroid in centroids],
+            settings.related_clusters_k,
+            settings.related_clusters_min_similarity,
+        )
+        rows = [
+            {
+                "cluster_id": centroids[idx].cluster_id,
+                "neighbor_id": centroids[neighbor_idx].cluster_id,
+                "similarity": similarity,
+                "rank": rank,
+            }
+            for idx, ranked in enumerate(neighbors)
+            for rank, (neighbor_idx, similarity) in enumerate(ranked, start=1)
+        ]
+
+        await db.execute(delete(ClusterNeighbor))
+        for start in range(0, len(rows), _BUCKET_CHUNK_SIZE):
+            await db.execute(insert(ClusterNeighbor), rows[start : start + _BUCKET_CHUNK_SIZE])
+        self._neighbors_stale = False
+
+    async def _cluster_pains(self, db: AsyncSession, pains: list[ExtractedPain]) -> list[ProblemCluster]:
+        assigned_ids = [pain.id for pain in pains]
+        vectors = await self._embed(db, pains)
+        if settings.clustering_incremental:
+            if vectors is not None:
+                pains = await self._assign_by_neighbors(db, pains, vectors)
+            else:
+                pains = await self._assign_to_existing_clusters(db, pains)
+            if not pains:
+                await self.record_daily_counts(db, assigned_ids)
+                return []
 
+        groups = await self._build_groups(pains, vectors)
+        groups = [group for group in groups if group]
+        group_centroids = await run_clustering_task(
+            build_centroids,
+            [[pain.pain_point for pain in group] for group in groups],
+            settings.clustering_centroid_terms,
+        )
+        created_clusters: list[ProblemCluster] = []
+
+        for group, terms in zip(groups, group_centroids):
             avg_urgency = sum(pain.urgency_score for pain in group) / len(group)
             cluster_name, cluster_summary = self._summarize_group(group)
 
@@ -40,29 +117,179 @@ class ClusterEngine:
             for pain in group:
                 pain.cluster_id = cluster.id
 
+            db.add(ClusterCentroid(cluster_id=cluster.id, terms=terms, pain_count=len(group)))
             created_clusters.append(cluster)
 
         await db.flush()
+        await self.record_daily_counts(db, assigned_ids)
         return created_clusters
 
-    def _build_groups(self, pains: list[ExtractedPain]) -> list[list[ExtractedPain]]:
+    async def _assign_to_existing_clusters(self, db: AsyncSession, pains: list[ExtractedPain]) -> list[ExtractedPain]:
+        """
+        Attach pains to the nearest existing cluster centroid above the similarity threshold.
+        Returns the pains that matched nothing so they can be grouped among themselves.
+        """
+        centroids = await self._load_centroids(db)
+        if not centroids:
+            return pains
+
+        nearest, merged = await run_clustering_task(
+            assign_texts,
+            [pain.pain_point for pain in pains],
+            [centroid.terms for centroid in centroids],
+            [centroid.pain_count for centroid in centroids],
+            settings.clustering_assign_similarity,
+            settings.clustering_centroid_terms,
+        )
+
+        leftovers: list[ExtractedPain] = []
+        attached: Counter[int] = Counter()
+        for pain, centroid_idx in zip(pains, nearest):
+            if centroid_idx is None:
+                leftovers.append(pain)
+                continue
+            pain.cluster_id = centroids[centroid_idx].cluster_id
+            attached[centroid_idx] += 1
+
+        for centroid_idx, terms in merged.items():
+            centroids[centroid_idx].terms = terms
+            centroids[centroid_idx].pain_count += attached[centroid_idx]
+
+        await db.flush()
+        return leftovers
+
+    async def _embed(self, db: AsyncSession, pains: list[ExtractedPain]) -> dict[uuid.UUID, np.ndarray] | None:
+        """Stored embeddings for the embedding backend; None for the TF-IDF backends or when embedding fails."""
+        if settings.clustering_backend != "embedding":
+            return None
+        vectors = await embed_pains(db, pains)
+        if vectors is None:
+            logger.warning("Embedding provider unavailable; clustering this run with TF-IDF instead.")
+        return vectors
+
+    async def _assign_by_neighbors(
+        self,
+        db: AsyncSession,
+        pains: list[ExtractedPain],
+        vectors: dict[uuid.UUID, np.ndarray],
+    ) -> list[ExtractedPain]:
+        """
+        Attach each pain to the cluster its nearest already-clustered pains vote for, each neighbour
+        weighted by similarity, using the persistent ANN index. Returns the pains with no clustered
+        neighbour at or above `embedding_min_similarity`.
+        """
+        index = await pain_index.refresh(db)
+        if index is None:
+            return pains
+
+        # The batch is already indexed but unclustered; leave it out so batch-mates cannot crowd out clusters.
+        scores, rows = index.search(
+            np.stack([vectors[pain.id] for pain in pains]),
+            settings.clustering_knn_neighbors,
+            exclude={pain.id for pain in pains},
+        )
+        neighbor_ids = list({index.ids[row] for row in rows.ravel() if row >= 0})
+        cluster_by_pain: dict[uuid.UUID, uuid.UUID] = {}
+        for start in range(0, len(neighbor_ids), _BUCKET_CHUNK_SIZE):
+            result = await db.execute(
+                select(ExtractedPain.id, ExtractedPain.cluster_id).where(
+                    ExtractedPain.id.in_(neighbor_ids[start : start + _BUCKET_CHUNK_SIZE]),
+                    ExtractedPain.cluster_id.is_not(None),
+                )
+            )
+            cluster_by_pain.update(result.all())
+
+        leftovers: list[ExtractedPain] = []
+        attached: dict[uuid.UUID, list[str]] = defaultdict(list)
+        for pain, pain_scores, pain_rows in zip(pains, scores, rows):
+            votes: Counter[uuid.UUID] = Counter()
+            for score, row in zip(pain_scores, pain_rows):
+                cluster_id = cluster_by_pain.get(index.ids[row]) if row >= 0 else None
+                if cluster_id is not None and score >= settings.embedding_min_similarity:
+                    votes[cluster_id] += float(score)
+            if not votes:
+                leftovers.append(pain)
+                continue
+            pain.cluster_id = votes.most_common(1)[0][0]
+            attached[pain.cluster_id].append(pain.pain_point)
+
+        if attached:
+            # Keep the term centroids current; related clusters and the TF-IDF backends still read them.
+            centroids = {centroid.cluster_id: centroid for centroid in await self._load_centroids(db)}
+            touched = [centroids[cluster_id] for cluster_id in attached if cluster_id in centroids]
+            merged = await run_clustering_task(
+                merge_texts,
+                [centroid.terms for centroid in touched],
+                [centroid.pain_count for centroid in touched],
+                [attached[centroid.cluster_id] for centroid in touched],
+                settings.clustering_centroid_terms,
+            )
+            for centroid, terms in zip(touched, merged):
+                centroid.terms = terms
+                centroid.pain_count += len(attached[centroid.cluster_id])
+
+        await db.flush()
+        return leftovers
+
+    async def _load_centroids(self, db: AsyncSession) -> list[ClusterCentroid]:
+        missing_result = await db.execute(
+            select(ProblemCluster.id)
+            .outerjoin(ClusterCentroid, ClusterCentroid.cluster_id == ProblemCluster.id)
+            .where(ClusterCentroid.cluster_id.is_(None))
+        )
+        missing_ids = list(missing_result.scalars().all())
+        if missing_ids:
+            await self._backfill_centroids(db, missing_ids)
+
+        result = await db.execute(select(ClusterCentroid))
+        return list(result.scalars().all())
+
+    async def _backfill_centroids(self, db: AsyncSession, cluster_ids: list[uuid.UUID]) -> None:
+        """One-off centroid build for clusters created before centroids were tracked."""
+        result = await db.execute(
+            select(ExtractedPain.cluster_id, ExtractedPain.pain_point).where(ExtractedPain.cluster_id.in_(cluster_ids))
+        )
+        texts_by_cluster: dict[uuid.UUID, list[str]] = defaultdict(list)
+        for cluster_id, pain_point in result.all():
+            texts_by_cluster[cluster_id].append(pain_point)
+
+        backfilled = await run_clustering_task(
+            build_centroids,
+            list(texts_by_cluster.values()),
+            settings.clustering_centroid_terms,
+        )
+        for (cluster_id, texts), terms in zip(texts_by_cluster.items(), backfilled):
+            db.add(ClusterCentroid(cluster_id=cluster_id, terms=terms, pain_count=len(texts)))
+        await db.flush()
+
+    async def _build_groups(
+        self,
+        pains: list[ExtractedPain],
+        vectors: dict[uuid.UUID, np.ndarray] | None = None,
+    ) -> list[list[ExtractedPain]]:
         if len(pains) == 1:
             return [pains]
 
         texts = [pain.pain_point for pain in pains]
-        vectorizer = TfidfVectorizer(stop_words="english", max_features=600)
-        matrix = vectorizer.fit_transform(texts)
-
-        try:
-            clusterer = AgglomerativeClustering(
-                n_clusters=None,
-                metric="cosine",
-                linkage="average",
-                distance_threshold=0.65,
+        if vectors is not None:
+            labels = await run_clustering_task(
+                label_vectors_knn_graph,
+                np.stack([vectors[pain.id] for pain in pains]),
+                settings.embedding_min_similarity,
+                settings.clustering_knn_neighbors,
+                settings.ann_nprobe,
+                settings.ann_min_train_size,
+            )
+        elif settings.clustering_backend == "knn_graph":
+            labels = await run_clustering_task(
+                label_texts_knn_graph,
+                texts,
+                settings.clustering_distance_threshold,
+                settings.clustering_knn_neighbors,
+                settings.clustering_working_memory_mb,
             )
-            labels = clusterer.fit_predict(matrix.toarray())
-        except Exception:
-            labels = list(range(len(pains)))
+        else:
+            labels = await run_clustering_task(label_texts, texts, settings.clustering_distance_threshold)
 
         grouped: dict[int, list[ExtractedPain]] = defaultdict(list)
         for idx, label in enumerate(labels):
@@ -88,16 +315,117 @@ class ClusterEngine:
         )
         return cluster_name, summary
 
+    async def record_daily_counts(self, db: AsyncSession, pain_ids: list[uuid.UUID]) -> None:
+        """Add freshly assigned pains to their cluster's daily buckets. Pains must already be flushed with a cluster_id."""
+        if await self._ensure_daily_counts(db):
+            # The backfill already counted these pains.
+            return
+        for start in range(0, len(pain_ids), _BUCKET_CHUNK_SIZE):
+            chunk = pain_ids[start : start + _BUCKET_CHUNK_SIZE]
+            await db.execute(_bucket_upsert(ExtractedPain.id.in_(chunk)))
+
+    async def rebuild_daily_counts(self, db: AsyncSession) -> None:
+        """Rebuild every bucket from extracted_pains; used to backfill or repair the table."""
+        await db.execute(delete(ClusterDailyCount))
+        await db.execute(_bucket_upsert(ExtractedPain.cluster_id.is_not(None)))
+
     async def refresh_cluster_rollups(self, db: AsyncSession) -> None:
-        result = await db.execute(select(ProblemCluster))
-        clusters = list(result.scalars().all())
+        """
+        Recompute post_count, avg_urgency and 7d/30d trends for every cluster in two set-based UPDATEs
+        over the daily buckets. Rows whose values are unchanged are not rewritten.
+        """
+        await self._ensure_daily_counts(db)
+
+        today = datetime.now(timezone.utc).date()
+        total_pains = func.sum(ClusterDailyCount.pains)
+        stats = (
+            select(
+                ClusterDailyCount.cluster_id.label("cluster_id"),
+                total_pains.label("pain_count"),
+                func.round(func.sum(ClusterDailyCount.sum_urgency) / func.nullif(total_pains, 0), 2).label("avg_urgency"),
+                func.coalesce(
+                    func.sum(ClusterDailyCount.pains).filter(ClusterDailyCount.day > today - timedelta(days=7)), 0
+                ).label("trend_7d"),
+                func.coalesce(
+                    func.sum(ClusterDailyCount.pains).filter(ClusterDailyCount.day > today - timedelta(days=30)), 0
+                ).label("trend_30d"),
+            )
+            .group_by(ClusterDailyCount.cluster_id)
+            .subquery()
+        )
+
+        await db.execute(
+            update(ProblemCluster)
+            .where(ProblemCluster.id == stats.c.cluster_id)
+            .where(
+                or_(
+                    ProblemCluster.post_count != stats.c.pain_count,
+                    ProblemCluster.avg_urgency != stats.c.avg_urgency,
+                    ProblemCluster.trend_7d != stats.c.trend_7d,
+                    ProblemCluster.trend_30d != stats.c.trend_30d,
+                )
+            )
+            .values(
+                post_count=stats.c.pain_count,
+                avg_urgency=stats.c.avg_urgency,
+                trend_7d=stats.c.trend_7d,
+                trend_30d=stats.c.trend_30d,
+            )
+            .execution_options(synchronize_session=False)
+        )
 
-        for cluster in clusters:
-            pain_stats = await db.execute(
-                select(func.count(ExtractedPain.id), func.avg(ExtractedPain.urgency_score)).where(
-                    ExtractedPain.cluster_id == cluster.id
+        # Clusters without any buckets drop out of the GROUP BY above; reset them explicitly.
+        await db.execute(
+            update(ProblemCluster)
+            .where(~exists().where(ClusterDailyCount.cluster_id == ProblemCluster.id))
+            .where(
+                or_(
+                    ProblemCluster.post_count != 0,
+                    ProblemCluster.avg_urgency != 0.0,
+                    ProblemCluster.trend_7d != 0,
+                    ProblemCluster.trend_30d != 0,
                 )
             )
-            count, avg_urgency = pain_stats.one()
-            cluster.post_count = int(count or 0)
-            cluster.avg_urgency = float(round(avg_urgency or 0.0, 2))
+            .values(post_count=0, avg_urgency=0.0, trend_7d=0, trend_30d=0)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def _ensure_daily_counts(self, db: AsyncSession) -> bool:
+        """
+        Backfill buckets once for databases that have clustered pains from before buckets existed.
+        Must run before any incremental bucket write, which would otherwise mask the empty table.
+        Returns True when it rebuilt the table.
+        """
+        has_buckets = await db.scalar(select(exists().select_from(ClusterDailyCount)))
+        if has_buckets:
+            return False
+        has_clustered_pains = await db.scalar(select(exists().where(ExtractedPain.cluster_id.is_not(None))))
+        if not has_clustered_pains:
+            return False
+        await self.rebuild_daily_counts(db)
+        return True
+
+
+_BUCKET_CHUNK_SIZE = 5000
+
+
+def _bucket_upsert(condition: ColumnElement[bool]):
+    day = cast(func.timezone(literal_column("'UTC'"), ExtractedPain.created_at), Date)
+    source = (
+        select(
+            ExtractedPain.cluster_id,
+            day,
+            func.count(ExtractedPain.id),
+            func.sum(ExtractedPain.urgency_score),
+        )
+        .where(condition, ExtractedPain.cluster_id.is_not(None))
+        .group_by(ExtractedPain.cluster_id, day)
+    )
+    stmt = pg_insert(ClusterDailyCount).from_select(["cluster_id", "day", "pains", "sum_urgency"], source)
+    return stmt.on_conflict_do_update(
+        index_elements=[ClusterDailyCount.cluster_id, ClusterDailyCount.day],
+        set_={
+            "pains": ClusterDailyCount.pains + stmt.excluded.pains,
+            "sum_urgency": ClusterDailyCount.sum_urgency + stmt.excluded.sum_urgency,
+        },
+    )
@@ -0,0 +1,149 @@
+"""
+Stored pain embeddings and the in-process ANN index built over them.
+
+`embed_pains` computes each pain's vector once and persists it in `pain_embeddings`; identical
+pain points reuse an existing vector by text hash. `pain_index` keeps an `IVFIndex` of every stored
+vector for the active provider and only reads rows added since its last refresh.
+"""
+
+import asyncio
+import hashlib
+import uuid
+from datetime import datetime, timedelta
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.pain import ExtractedPain
+from app.models.pain_embedding import PainEmbedding
+from app.services.ai.embeddings import decode_vector, encode_vector, get_embedding_provider
+from app.services.clustering.ann import IVFIndex
+
+# Keys per IN (...) lookup and rows per INSERT, keeping bind parameters well under asyncpg's limit.
+_CHUNK_SIZE = 5000
+_REFRESH_PAGE_SIZE = 10000
+# Re-read rows this far behind the watermark so rows written up to this long before their transaction
+# committed are not missed. `created_at` is stamped with clock_timestamp() at write time.
+_REFRESH_OVERLAP = timedelta(minutes=5)
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.strip().lower().encode("utf-8")).hexdigest()
+
+
+async def embed_pains(db: AsyncSession, pains: list[ExtractedPain]) -> dict[uuid.UUID, np.ndarray] | None:
+    """
+    Vectors for `pains` keyed by pain id, embedding and storing the ones not yet stored for the
+    active provider. Returns None when the provider is unavailable so callers can fall back.
+    """
+    provider = get_embedding_provider()
+    vectors: dict[uuid.UUID, np.ndarray] = {}
+    pain_ids = [pain.id for pain in pains]
+    for start in range(0, len(pain_ids), _CHUNK_SIZE):
+        result = await db.execute(
+            select(PainEmbedding.pain_id, PainEmbedding.vector).where(
+                PainEmbedding.pain_id.in_(pain_ids[start : start + _CHUNK_SIZE]),
+                PainEmbedding.model == provider.name,
+            )
+        )
+        vectors.update((pain_id, decode_vector(blob)) for pain_id, blob in result.all())
+
+    missing = [pain for pain in pains if pain.id not in vectors]
+    if not missing:
+        return vectors
+
+    hash_by_pain = {pain.id: text_hash(pain.pain_point) for pain in missing}
+    hashes = list(set(hash_by_pain.values()))
+    by_hash: dict[str, np.ndarray] = {}
+    for start in range(0, len(hashes), _CHUNK_SIZE):
+        result = await db.execute(
+            select(PainEmbedding.text_hash, PainEmbedding.vector).where(
+                PainEmbedding.text_hash.in_(hashes[start : start + _CHUNK_SIZE]),
+                PainEmbedding.model == provider.name,
+            )
+        )
+        for digest, blob in result.all():
+            by_hash.setdefault(digest, decode_vector(blob))
+
+    to_embed = {hash_by_pain[pain.id]: pain.pain_point for pain in missing if hash_by_pain[pain.id] not in by_hash}
+    if to_embed:
+        embedded = await provider.embed(list(to_embed.values()))
+        if embedded is None:
+            return None
+        by_hash.update(zip(to_embed.keys(), embedded))
+
+    rows = []
+    for pain in missing:
+        vector = by_hash[hash_by_pain[pain.id]]
+        vectors[pain.id] = vector
+        rows.append(
+            {
+                "pain_id": pain.id,
+                "model": provider.name,
+                "dim": int(vector.shape[0]),
+                "text_hash": hash_by_pain[pain.id],
+                "vector": encode_vector(vector),
+            }
+        )
+
+    for start in range(0, len(rows), _CHUNK_SIZE):
+        stmt = pg_insert(PainEmbedding).values(rows[start : start + _CHUNK_SIZE])
+        # A pain embedded under a previous provider is re-embedded in place.
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[PainEmbedding.pain_id],
+                set_={
+                    "model": stmt.excluded.model,
+                    "dim": stmt.excluded.dim,
+                    "text_hash": stmt.excluded.text_hash,
+                    "vector": stmt.excluded.vector,
+                    "created_at": func.clock_timestamp(),
+                },
+            )
+        )
+    return vectors
+
+
+class PainVectorIndex:
+    """Process-wide ANN index over stored pain embeddings, refreshed incrementally."""
+
+    def __init__(self) -> None:
+        self._index: IVFIndex | None = None
+        self._model: str | None = None
+        self._indexed: set[uuid.UUID] = set()
+        self._watermark: datetime | None = None
+        self._lock = asyncio.Lock()
+
+    async def refresh(self, db: AsyncSession) -> IVFIndex | None:
+        """Add embeddings stored since the last refresh; returns None while nothing is stored."""
+        model = get_embedding_provider().name
+        async with self._lock:
+            if model != self._model:
+                self._index, self._model, self._indexed, self._watermark = None, model, set(), None
+
+            stmt = select(PainEmbedding.pain_id, PainEmbedding.vector, PainEmbedding.created_at).where(
+                PainEmbedding.model == model
+            )
+            if self._watermark is not None:
+                stmt = stmt.where(PainEmbedding.created_at >= self._watermark - _REFRESH_OVERLAP)
+
+            result = await db.stream(stmt.order_by(PainEmbedding.created_at).execution_options(yield_per=_REFRESH_PAGE_SIZE))
+            async for partition in result.partitions():
+                fresh = [(pain_id, blob) for pain_id, blob, _ in partition if pain_id not in self._indexed]
+                if partition:
+                    self._watermark = max(self._watermark or partition[-1][2], partition[-1][2])
+                if not fresh:
+                    continue
+
+                matrix = np.stack([decode_vector(blob) for _, blob in fresh])
+                if self._index is None:
+                    self._index = IVFIndex(matrix.shape[1], settings.ann_nprobe, settings.ann_min_train_size)
+                self._index.add([pain_id for pain_id, _ in fresh], matrix)
+                self._indexed.update(pain_id for pain_id, _ in fresh)
+            return self._index
+
+
+pain_index = PainVectorIndex()
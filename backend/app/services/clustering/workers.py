@@ -0,0 +1,229 @@
+"""
+CPU-bound clustering work that runs outside the event loop.
+
+Functions in this module receive and return plain Python data (texts, indices, term dicts)
+so they can be shipped to a `ProcessPoolExecutor` without pickling ORM objects.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+from collections import defaultdict
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, TypeVar
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+from sklearn import config_context
+from sklearn.cluster import AgglomerativeClustering
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.neighbors import NearestNeighbors
+
+from app.core.config import settings
+from app.services.clustering.ann import IVFIndex
+from app.services.clustering.centroids import (
+    centroid_matrix,
+    centroid_terms,
+    merge_centroid,
+    nearest_centroids,
+    vectorize,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_executor: ProcessPoolExecutor | None = None
+
+
+def get_cluster_executor() -> ProcessPoolExecutor | None:
+    """Process pool for clustering, or None to fall back to the default thread pool."""
+    global _executor
+    if settings.clustering_process_workers <= 0:
+        return None
+    if _executor is None:
+        # Spawn rather than fork: the parent runs an event loop and DB pool threads.
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.clustering_process_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+def shutdown_cluster_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def run_clustering_task(fn: Callable[..., T], *args: Any) -> T:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_cluster_executor(), partial(fn, *args))
+
+
+def label_texts(texts: list[str], distance_threshold: float) -> list[int]:
+    if len(texts) <= 1:
+        return [0] * len(texts)
+
+    try:
+        matrix = _tfidf(texts)
+        clusterer = AgglomerativeClustering(
+            n_clusters=None,
+            metric="cosine",
+            linkage="average",
+            distance_threshold=distance_threshold,
+        )
+        return [int(label) for label in clusterer.fit_predict(matrix.toarray())]
+    except Exception:  # noqa: BLE001
+        logger.exception("Agglomerative clustering failed; keeping every pain in its own group.")
+        return list(range(len(texts)))
+
+
+def label_texts_knn_graph(
+    texts: list[str],
+    distance_threshold: float,
+    n_neighbors: int,
+    working_memory_mb: int,
+) -> list[int]:
+    """
+    Sparse alternative to `label_texts` with memory bounded by O(n * n_neighbors).
+    Links each text to its mutual cosine nearest neighbours within `distance_threshold`
+    and labels the connected components of that graph.
+    """
+    if len(texts) <= 1:
+        return [0] * len(texts)
+
+    try:
+        matrix = _tfidf(texts)
+        neighbors = NearestNeighbors(
+            n_neighbors=min(n_neighbors + 1, len(texts)),
+            metric="cosine",
+            algorithm="brute",
+        )
+        neighbors.fit(matrix)
+        # Brute-force search on sparse input is computed in chunks capped by working_memory.
+        with config_context(working_memory=working_memory_mb):
+            distances, indices = neighbors.kneighbors(matrix)
+
+        rows = np.repeat(np.arange(len(texts)), indices.shape[1])
+        keep = distances.ravel() <= distance_threshold
+        graph = sparse.csr_matrix(
+            (np.ones(int(keep.sum()), dtype=np.int8), (rows[keep], indices.ravel()[keep])),
+            shape=(len(texts), len(texts)),
+        )
+        mutual = graph.minimum(graph.T)
+        _, labels = connected_components(mutual, directed=False)
+        return [int(label) for label in labels]
+    except Exception:  # noqa: BLE001
+        logger.exception("kNN graph clustering failed; keeping every pain in its own group.")
+        return list(range(len(texts)))
+
+
+def label_vectors_knn_graph(
+    vectors: np.ndarray,
+    min_similarity: float,
+    n_neighbors: int,
+    nprobe: int,
+    min_train_size: int,
+) -> list[int]:
+    """
+    Embedding counterpart of `label_texts_knn_graph`: mutual nearest neighbours found through an
+    `IVFIndex` and linked when their cosine similarity reaches `min_similarity`.
+    """
+    count = vectors.shape[0]
+    if count <= 1:
+        return [0] * count
+
+    index = IVFIndex(vectors.shape[1], nprobe, min_train_size)
+    index.add(list(range(count)), vectors)
+    scores, indices = index.search(vectors, min(n_neighbors + 1, count))
+
+    rows = np.repeat(np.arange(count), indices.shape[1])
+    keep = (indices.ravel() >= 0) & (scores.ravel() >= min_similarity)
+    graph = sparse.csr_matrix(
+        (np.ones(int(keep.sum()), dtype=np.int8), (rows[keep], indices.ravel()[keep])),
+        shape=(count, count),
+    )
+    mutual = graph.minimum(graph.T)
+    _, labels = connected_components(mutual, directed=False)
+    return [int(label) for label in labels]
+
+
+def merge_texts(
+    centroids: list[dict[str, float]],
+    pain_counts: list[int],
+    groups: list[list[str]],
+    max_terms: int,
+) -> list[dict[str, float]]:
+    """Fold each group of texts into the centroid at the same position."""
+    return [
+        merge_centroid(terms, pain_count, vectorize(texts), max_terms)
+        for terms, pain_count, texts in zip(centroids, pain_counts, groups)
+    ]
+
+
+def assign_texts(
+    texts: list[str],
+    centroids: list[dict[str, float]],
+    pain_counts: list[int],
+    min_similarity: float,
+    max_terms: int,
+) -> tuple[list[int | None], dict[int, dict[str, float]]]:
+    """
+    Match texts to their nearest centroid and fold the matches into those centroids.
+    Returns the centroid index per text (None for leftovers) and the updated terms of touched centroids.
+    """
+    matrix = vectorize(texts)
+    nearest = nearest_centroids(matrix, centroid_matrix(centroids), min_similarity)
+
+    rows_by_centroid: dict[int, list[int]] = defaultdict(list)
+    for row_idx, centroid_idx in enumerate(nearest):
+        if centroid_idx is not None:
+            rows_by_centroid[centroid_idx].append(row_idx)
+
+    merged = {
+        centroid_idx: merge_centroid(centroids[centroid_idx], pain_counts[centroid_idx], matrix[rows], max_terms)
+        for centroid_idx, rows in rows_by_centroid.items()
+    }
+    return nearest, merged
+
+
+def nearest_clusters(
+    centroids: list[dict[str, float]],
+    k: int,
+    min_similarity: float,
+    block_size: int = 512,
+) -> list[list[tuple[int, float]]]:
+    """
+    Top-`k` most similar other centroids for each centroid, best first, skipping pairs below
+    `min_similarity`. Similarities are computed a block of rows at a time to bound memory.
+    """
+    matrix = centroid_matrix(centroids)
+    transposed = matrix.T.tocsc()
+    neighbors: list[list[tuple[int, float]]] = []
+    for start in range(0, matrix.shape[0], block_size):
+        similarities = (matrix[start : start + block_size] @ transposed).tocsr()
+        for offset in range(similarities.shape[0]):
+            row_start, row_end = similarities.indptr[offset], similarities.indptr[offset + 1]
+            columns = similarities.indices[row_start:row_end]
+            data = similarities.data[row_start:row_end]
+            keep = (columns != start + offset) & (data >= min_similarity)
+            columns, data = columns[keep], data[keep]
+            if data.size > k:
+                top = np.argpartition(-data, k - 1)[:k]
+                columns, data = columns[top], data[top]
+            order = np.argsort(-data, kind="stable")
+            neighbors.append([(int(columns[idx]), round(float(data[idx]), 6)) for idx in order])
+    return neighbors
+
+
+def build_centroids(groups: list[list[str]], max_terms: int) -> list[dict[str, float]]:
+    return [centroid_terms(vectorize(texts), max_terms) for texts in groups]
+
+
+def _tfidf(texts: list[str]) -> sparse.csr_matrix:
+    return TfidfVectorizer(stop_words="english", max_features=600).fit_transform(texts)
@@ -0,0 +1,43 @@
+"""
+Per-source, per-keyword high-water marks so collectors only fetch content newer than the last run.
+
+Collectors receive the cursor dict for their platform and advance it in place. The orchestrator saves
+the cursors in the same transaction as the persisted posts, so a failed run re-fetches instead of skipping.
+"""
+
+from collections import defaultdict
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.collector_cursor import CollectorCursor
+
+CursorMap = dict[str, dict[str, str]]
+
+
+async def load_cursors(db: AsyncSession) -> CursorMap:
+    """Return `{platform: {keyword: cursor}}` for every stored cursor."""
+    result = await db.execute(select(CollectorCursor.platform, CollectorCursor.keyword, CollectorCursor.cursor))
+    cursors: CursorMap = defaultdict(dict)
+    for platform, keyword, cursor in result.all():
+        cursors[platform][keyword] = cursor
+    return cursors
+
+
+async def save_cursors(db: AsyncSession, cursors: CursorMap) -> None:
+    rows = [
+        {"platform": platform, "keyword": keyword[:255], "cursor": cursor}
+        for platform, by_keyword in cursors.items()
+        for keyword, cursor in by_keyword.items()
+    ]
+    if not rows:
+        return
+
+    stmt = pg_insert(CollectorCursor).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[CollectorCursor.platform, CollectorCursor.keyword],
+        set_={"cursor": stmt.excluded.cursor, "updated_at": func.now()},
+        where=CollectorCursor.cursor != stmt.excluded.cursor,
+    )
+    await db.execute(stmt)
@@ -0,0 +1,123 @@
+"""
+Process-wide HTTP client shared by the collectors.
+
+One pooled `httpx.AsyncClient` (HTTP/2 when `h2` is installed) keeps connections and TLS sessions
+alive across runs. Requests are capped per host, and 429/5xx responses and transport errors are
+retried with backoff that honours `Retry-After` and `x-rate-limit-reset`.
+"""
+
+import asyncio
+import importlib.util
+import logging
+import random
+import time
+from typing import Any
+
+import httpx
+
+from app.core.config import settings
+from app.services.ai.rate_limiter import parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class CollectorHTTP:
+    def __init__(self) -> None:
+        self._client: httpx.AsyncClient | None = None
+        self._host_slots: dict[str, asyncio.Semaphore] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            http2 = settings.collector_http2 and importlib.util.find_spec("h2") is not None
+            if settings.collector_http2 and not http2:
+                logger.warning("HTTP/2 requested for collectors but `h2` is not installed; using HTTP/1.1.")
+            self._client = httpx.AsyncClient(
+                http2=http2,
+                timeout=settings.collector_timeout_seconds,
+                limits=httpx.Limits(
+                    max_connections=settings.collector_max_connections,
+                    max_keepalive_connections=settings.collector_max_connections,
+                ),
+            )
+        return self._client
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a request, retrying throttled, 5xx and transport failures up to `collector_max_retries` times."""
+        slots = self._slots(httpx.URL(url).host)
+        max_retries = max(0, settings.collector_max_retries)
+
+        for attempt in range(max_retries + 1):
+            try:
+                async with slots:
+                    response = await self.client.request(method, url, **kwargs)
+            except httpx.TransportError as exc:
+                if attempt >= max_retries:
+                    raise
+                delay = retry_delay(attempt, None)
+                logger.warning("%s %s failed (%s); retrying in %.1fs.", method, url, exc, delay)
+                await asyncio.sleep(delay)
+                continue
+
+            if response.status_code not in _RETRY_STATUSES or attempt >= max_retries:
+                return response
+
+            delay = retry_delay(attempt, response)
+            logger.warning("%s %s returned %s; retrying in %.1fs.", method, url, response.status_code, delay)
+            await asyncio.sleep(delay)
+
+        raise AssertionError("unreachable")
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self._host_slots.clear()
+
+    def _slots(self, host: str) -> asyncio.Semaphore:
+        slots = self._host_slots.get(host)
+        if slots is None:
+            slots = asyncio.Semaphore(max(1, settings.collector_max_connections_per_host))
+            self._host_slots[host] = slots
+        return slots
+
+
+def retry_delay(attempt: int, response: httpx.Response | None) -> float:
+    """Seconds before retry `attempt` (0-based): rate-limit headers when present, else jittered exponential backoff."""
+    if response is not None:
+        wait = parse_retry_after(response.headers)
+        if wait is None:
+            wait = parse_rate_limit_reset(response.headers)
+        if wait is not None:
+            return min(wait, settings.collector_backoff_max_seconds) + random.uniform(0, 0.5)
+
+    ceiling = min(settings.collector_backoff_max_seconds, settings.collector_backoff_base_seconds * 2**attempt)
+    return random.uniform(ceiling / 2, ceiling)
+
+
+def parse_rate_limit_reset(headers: httpx.Headers) -> float | None:
+    """
+    Seconds until `x-rate-limit-reset` / `x-ratelimit-reset`. Twitter sends an epoch timestamp,
+    Product Hunt a number of seconds, so small values are taken as relative.
+    """
+    reset = headers.get("x-rate-limit-reset") or headers.get("x-ratelimit-reset")
+    if not reset:
+        return None
+    try:
+        value = float(reset)
+    except ValueError:
+        return None
+    if value < 1_000_000_000:
+        return max(0.0, value)
+    return max(0.0, value - time.time())
+
+
+collector_http = CollectorHTTP()
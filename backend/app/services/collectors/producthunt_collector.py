@@ -1,74 +1,170 @@
-from datetime import datetime, timezone
-
-import httpx
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta, timezone
+from typing import Any
 
 from app.core.config import settings
 from app.services.collectors.base import RawPost
+from app.services.collectors.http import collector_http
+from app.services.keyword_matcher import compile_keywords
+
+logger = logging.getLogger(__name__)
+
+FEED_QUERY = """
+query FeedPosts($first: Int!, $after: String, $postedAfter: DateTime, $topic: String) {
+  posts(first: $first, after: $after, order: NEWEST, postedAfter: $postedAfter, topic: $topic) {
+    pageInfo {
+      endCursor
+      hasNextPage
+    }
+    edges {
+      node {
+        name
+        tagline
+        description
+        votesCount
+        commentsCount
+        url
+        createdAt
+      }
+    }
+  }
+}
+"""
 
 
 class ProductHuntCollector:
     endpoint = "https://api.producthunt.com/v2/api/graphql"
 
-    async def fetch(self, keywords: list[str], limit: int = 20) -> list[RawPost]:
-        if not settings.producthunt_access_token:
-            return []
-
-        query = """
-        query FeedPosts($first: Int!) {
-          posts(first: $first, order: VOTES) {
-            edges {
-              node {
-                name
-                tagline
-                description
-                votesCount
-                commentsCount
-                url
-                createdAt
-              }
-            }
-          }
-        }
+    async def fetch(self, keywords: list[str], limit: int = 20, cursors: dict[str, str] | None = None) -> list[RawPost]:
+        """
+        Collect every page from `iter_pages`. Product Hunt is read as one feed, so its cursor is stored
+        under the empty keyword: the newest `createdAt` seen, used as the next run's `postedAfter`. The
+        cursor only advances when every topic was read through to it; see `iter_pages`.
+        """
+        results: list[RawPost] = []
+        async for page in self.iter_pages(keywords, limit, cursors):
+            results.extend(page)
+        return results
+
+    async def iter_pages(
+        self,
+        keywords: list[str],
+        limit: int = 20,
+        cursors: dict[str, str] | None = None,
+    ) -> AsyncIterator[list[RawPost]]:
         """
+        Yield keyword-matching posts page by page, newest first, for each configured topic.
+        Topic and `postedAfter` filtering happen server-side; keywords are still matched locally because
+        the posts connection has no text search. Each topic reads at most `limit` posts. If a topic
+        fails or stops at `limit` or `producthunt_max_pages` before its last page, the cursor is left
+        where it was, since the feed is newest first and advancing it would skip the posts not read.
+        """
+        if not settings.producthunt_access_token:
+            return
 
         headers = {
             "Authorization": f"Bearer {settings.producthunt_access_token}",
             "Content-Type": "application/json",
         }
+        window_start = datetime.now(timezone.utc) - timedelta(days=settings.producthunt_window_days)
+        last_seen = _parse_created_at((cursors or {}).get(""))
+        posted_after = max(window_start, last_seen) if last_seen is not None else window_start
+        matcher = compile_keywords(tuple(keywords))
+        topics: list[str | None] = list(settings.producthunt_topics) or [None]
 
-        async with httpx.AsyncClient(timeout=20) as client:
-            resp = await client.post(self.endpoint, json={"query": query, "variables": {"first": limit}}, headers=headers)
-            resp.raise_for_status()
-            payload = resp.json()
+        # Topics are paged concurrently and their pages interleaved through one queue.
+        pages: asyncio.Queue[list[dict[str, Any]] | None] = asyncio.Queue(maxsize=len(topics))
+        incomplete: list[str | None] = []
 
-        edges = payload.get("data", {}).get("posts", {}).get("edges", [])
+        async def _page_topic(topic: str | None) -> None:
+            try:
+                after: str | None = None
+                read = 0
+                exhausted = False
+                for _ in range(max(1, settings.producthunt_max_pages)):
+                    variables = {
+                        "first": max(1, min(settings.producthunt_page_size, limit - read)),
+                        "after": after,
+                        "postedAfter": posted_after.isoformat(),
+                        "topic": topic,
+                    }
+                    resp = await collector_http.post(
+                        self.endpoint,
+                        json={"query": FEED_QUERY, "variables": variables},
+                        headers=headers,
+                    )
+                    resp.raise_for_status()
+                    connection = (resp.json().get("data") or {}).get("posts") or {}
+                    nodes = [edge.get("node", {}) for edge in connection.get("edges", [])]
+                    read += len(nodes)
+                    await pages.put(nodes)
 
-        results: list[RawPost] = []
-        lowered_keywords = [k.lower() for k in keywords]
-
-        for edge in edges:
-            node = edge.get("node", {})
-            title = node.get("name", "")
-            tagline = node.get("tagline", "")
-            description = node.get("description", "")
-            combined = " ".join([title, tagline, description]).lower()
-
-            if lowered_keywords and not any(k in combined for k in lowered_keywords):
-                continue
-
-            created_at = node.get("createdAt")
-            parsed_dt = datetime.fromisoformat(created_at.replace("Z", "+00:00")) if created_at else datetime.now(timezone.utc)
-
-            results.append(
-                RawPost(
-                    platform="producthunt",
-                    title=title,
-                    content=f"{tagline}\n\n{description}".strip(),
-                    upvotes=int(node.get("votesCount", 0)),
-                    comments=int(node.get("commentsCount", 0)),
-                    url=node.get("url", ""),
-                    created_at=parsed_dt,
-                )
-            )
+                    page_info = connection.get("pageInfo") or {}
+                    after = page_info.get("endCursor")
+                    exhausted = not page_info.get("hasNextPage") or not after
+                    if exhausted or read >= limit:
+                        break
+                if not exhausted:
+                    logger.warning("Product Hunt topic %r has more posts than one run reads.", topic)
+                    incomplete.append(topic)
+            except Exception:  # noqa: BLE001
+                logger.exception("Product Hunt paging failed for topic %r.", topic)
+                incomplete.append(topic)
+            finally:
+                await pages.put(None)
 
-        return results
+        tasks = [asyncio.create_task(_page_topic(topic)) for topic in topics]
+        seen_urls: set[str] = set()
+        newest = last_seen
+        remaining = len(tasks)
+        try:
+            while remaining:
+                nodes = await pages.get()
+                if nodes is None:
+                    remaining -= 1
+                    continue
+
+                page: list[RawPost] = []
+                for node in nodes:
+                    parsed_dt = _parse_created_at(node.get("createdAt")) or datetime.now(timezone.utc)
+                    if last_seen is not None and parsed_dt <= last_seen:
+                        continue
+                    newest = max(newest, parsed_dt) if newest is not None else parsed_dt
+
+                    url = node.get("url", "")
+                    title = node.get("name", "")
+                    tagline = node.get("tagline", "")
+                    description = node.get("description", "")
+                    if url in seen_urls:
+                        continue
+                    seen_urls.add(url)
+                    if matcher and not matcher.search(f"{title}\n{tagline}\n{description}"):
+                        continue
+
+                    page.append(
+                        RawPost(
+                            platform="producthunt",
+                            title=title,
+                            content=f"{tagline}\n\n{description}".strip(),
+                            upvotes=int(node.get("votesCount", 0)),
+                            comments=int(node.get("commentsCount", 0)),
+                            url=url,
+                            created_at=parsed_dt,
+                        )
+                    )
+                if page:
+                    yield page
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        if cursors is not None and newest is not None and not incomplete:
+            cursors[""] = newest.isoformat()
+
+
+def _parse_created_at(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
@@ -1,51 +1,124 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 
 import praw
 
 from app.core.config import settings
+from app.services.ai.rate_limiter import TokenBucket
 from app.services.collectors.base import RawPost
 
+logger = logging.getLogger(__name__)
+
+# PRAW is blocking and not thread-safe, so keyword searches run on a bounded pool with one client per thread.
+_executor: ThreadPoolExecutor | None = None
+_thread_state = threading.local()
+_requests = TokenBucket(settings.reddit_requests_per_minute)
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=max(1, settings.reddit_keyword_concurrency),
+            thread_name_prefix="reddit",
+        )
+    return _executor
+
+
+def shutdown_reddit_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def _thread_client() -> praw.Reddit:
+    client = getattr(_thread_state, "client", None)
+    if client is None:
+        client = praw.Reddit(
+            client_id=settings.reddit_client_id,
+            client_secret=settings.reddit_client_secret,
+            user_agent=settings.reddit_user_agent,
+        )
+        _thread_state.client = client
+    return client
+
 
 class RedditCollector:
-    """Collects discussions from target subreddits via PRAW."""
+    """Collects discussions from target subreddits via PRAW, searching keywords concurrently."""
 
     def __init__(self) -> None:
         self.is_enabled = bool(settings.reddit_client_id and settings.reddit_client_secret)
-        self.client = None
-        if self.is_enabled:
-            self.client = praw.Reddit(
-                client_id=settings.reddit_client_id,
-                client_secret=settings.reddit_client_secret,
-                user_agent=settings.reddit_user_agent,
-            )
 
-    def fetch(self, keywords: list[str], limit_per_keyword: int = 25) -> list[RawPost]:
-        if not self.client:
+    async def fetch(
+        self,
+        keywords: list[str],
+        limit_per_keyword: int = 25,
+        cursors: dict[str, str] | None = None,
+    ) -> list[RawPost]:
+        """
+        Search each keyword newest-first. With `cursors`, iteration stops at the first submission
+        no newer than the keyword's stored `created_utc`. The cursor advances to the newest one seen only
+        when the search got back to the stored one (or ran out of results) within `limit_per_keyword`;
+        otherwise it is kept so the submissions not read yet are fetched on a later run.
+        """
+        if not self.is_enabled:
             return []
 
-        subreddits = "+".join(settings.reddit_subreddits)
-        subreddit = self.client.subreddit(subreddits)
+        loop = asyncio.get_running_loop()
 
+        async def _search(keyword: str) -> list[RawPost]:
+            after = float((cursors or {}).get(keyword) or 0.0)
+            await _requests.consume(1)
+            posts, complete = await loop.run_in_executor(
+                _get_executor(), self._search, keyword, limit_per_keyword, after
+            )
+            if cursors is not None and posts and complete:
+                cursors[keyword] = str(max(after, *(post.created_at.timestamp() for post in posts)))
+            elif cursors is not None and posts:
+                logger.info("Reddit search for %r stopped at %s posts; keeping its cursor.", keyword, len(posts))
+            return posts
+
+        batches = await asyncio.gather(*(_search(keyword) for keyword in keywords), return_exceptions=True)
+
+        # Merge in keyword order so de-duplication keeps the same post as a sequential run would.
         seen_urls: set[str] = set()
         results: list[RawPost] = []
-
-        for keyword in keywords:
-            for submission in subreddit.search(keyword, sort="new", limit=limit_per_keyword):
-                if submission.url in seen_urls:
+        for keyword, batch in zip(keywords, batches):
+            if isinstance(batch, Exception):
+                logger.warning("Reddit search for %r failed: %s", keyword, batch)
+                continue
+            for post in batch:
+                if post.url in seen_urls:
                     continue
-
-                seen_urls.add(submission.url)
-                body = submission.selftext or submission.title
-                results.append(
-                    RawPost(
-                        platform="reddit",
-                        title=submission.title,
-                        content=body,
-                        upvotes=max(submission.score, 0),
-                        comments=max(submission.num_comments, 0),
-                        url=submission.url,
-                        created_at=datetime.fromtimestamp(submission.created_utc, tz=timezone.utc),
-                    )
-                )
+                seen_urls.add(post.url)
+                results.append(post)
 
         return results
+
+    @staticmethod
+    def _search(keyword: str, limit: int, after: float) -> tuple[list[RawPost], bool]:
+        """Submissions newer than `after`, and whether the search reached `after` or its last result."""
+        subreddit = _thread_client().subreddit("+".join(settings.reddit_subreddits))
+        results: list[RawPost] = []
+        seen = 0
+        for submission in subreddit.search(keyword, sort="new", limit=limit):
+            seen += 1
+            if submission.created_utc <= after:
+                return results, True
+            body = submission.selftext or submission.title
+            results.append(
+                RawPost(
+                    platform="reddit",
+                    title=submission.title,
+                    content=body,
+                    upvotes=max(submission.score, 0),
+                    comments=max(submission.num_comments, 0),
+                    url=submission.url,
+                    created_at=datetime.fromtimestamp(submission.created_utc, tz=timezone.utc),
+                )
+            )
+        return results, seen < limit
@@ -1,59 +1,121 @@
+import asyncio
+import logging
 from datetime import datetime, timezone
+from typing import Any
 
 import httpx
 
 from app.core.config import settings
+from app.services.ai.rate_limiter import TokenBucket
 from app.services.collectors.base import RawPost
+from app.services.collectors.http import collector_http
+
+logger = logging.getLogger(__name__)
+
+_requests = TokenBucket(settings.twitter_requests_per_minute)
 
 
 class TwitterCollector:
     endpoint = "https://api.twitter.com/2/tweets/search/recent"
 
-    async def fetch(self, keywords: list[str], limit_per_keyword: int = 10) -> list[RawPost]:
+    async def fetch(
+        self,
+        keywords: list[str],
+        limit_per_keyword: int = 10,
+        cursors: dict[str, str] | None = None,
+    ) -> list[RawPost]:
+        """
+        Search each keyword concurrently. With `cursors`, only tweets newer than the stored `since_id`
+        are requested and pages are followed up to `limit_per_keyword`. The cursor advances to the newest
+        id only when paging reached the stored one; a keyword cut short keeps its cursor so the tweets
+        between it and the last page read are fetched on a later run.
+        """
         if not settings.twitter_bearer_token:
             return []
 
         headers = {"Authorization": f"Bearer {settings.twitter_bearer_token}"}
+        slots = asyncio.Semaphore(max(1, settings.twitter_keyword_concurrency))
+
+        async def _search_page(params: dict[str, Any]) -> httpx.Response:
+            async with slots:
+                await _requests.consume(1)
+                return await collector_http.get(self.endpoint, headers=headers, params=params)
+
+        async def _search(keyword: str) -> list[dict[str, Any]]:
+            params: dict[str, Any] = {
+                "query": f'"{keyword}" lang:en -is:retweet',
+                "max_results": max(10, min(limit_per_keyword, 100)),
+                "tweet.fields": "created_at,public_metrics",
+            }
+            since_id = (cursors or {}).get(keyword)
+            if since_id:
+                params["since_id"] = since_id
+
+            data: list[dict[str, Any]] = []
+            newest_id: str | None = None
+            complete = False
+            while len(data) < limit_per_keyword:
+                resp = await _search_page(params)
+                if resp.status_code == 400 and "since_id" in params:
+                    # A since_id older than the 7-day search window is rejected; search without it.
+                    logger.info("Twitter rejected since_id for %r; searching without it.", keyword)
+                    params.pop("since_id")
+                    continue
+                if resp.status_code != 200:
+                    logger.warning("Twitter search for %r failed with %s: %s", keyword, resp.status_code, resp.text[:200])
+                    break
+
+                payload = resp.json()
+                data.extend(payload.get("data", []))
+                meta = payload.get("meta", {})
+                newest_id = newest_id or meta.get("newest_id")
+                next_token = meta.get("next_token")
+                complete = not next_token
+                if complete or cursors is None:
+                    break
+                params["pagination_token"] = next_token
+
+            if cursors is not None and newest_id and complete:
+                cursors[keyword] = newest_id
+            elif cursors is not None and newest_id:
+                logger.info("Twitter search for %r stopped at %s tweets; keeping its cursor.", keyword, len(data))
+            # Return every tweet read: an advanced cursor also covers the part of the last page past the limit.
+            return data
+
+        batches = await asyncio.gather(*(_search(keyword) for keyword in keywords), return_exceptions=True)
+
+        # Merge in keyword order so de-duplication keeps the same tweet as a sequential run would.
         results: list[RawPost] = []
         seen_ids: set[str] = set()
+        for keyword, data in zip(keywords, batches):
+            if isinstance(data, Exception):
+                logger.warning("Twitter search for %r failed: %s", keyword, data)
+                continue
 
-        async with httpx.AsyncClient(timeout=20) as client:
-            for keyword in keywords:
-                query = f'"{keyword}" lang:en -is:retweet'
-                params = {
-                    "query": query,
-                    "max_results": min(limit_per_keyword, 100),
-                    "tweet.fields": "created_at,public_metrics",
-                }
-                resp = await client.get(self.endpoint, headers=headers, params=params)
-                if resp.status_code != 200:
+            for item in data:
+                tweet_id = item.get("id")
+                if not tweet_id or tweet_id in seen_ids:
                     continue
+                seen_ids.add(tweet_id)
 
-                data = resp.json().get("data", [])
-                for item in data:
-                    tweet_id = item.get("id")
-                    if not tweet_id or tweet_id in seen_ids:
-                        continue
-                    seen_ids.add(tweet_id)
-
-                    metrics = item.get("public_metrics", {})
-                    created_at = item.get("created_at")
-                    parsed_dt = (
-                        datetime.fromisoformat(created_at.replace("Z", "+00:00"))
-                        if created_at
-                        else datetime.now(timezone.utc)
-                    )
+                metrics = item.get("public_metrics", {})
+                created_at = item.get("created_at")
+                parsed_dt = (
+                    datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+                    if created_at
+                    else datetime.now(timezone.utc)
+                )
 
-                    results.append(
-                        RawPost(
-                            platform="twitter",
-                            title=item.get("text", "")[:120],
-                            content=item.get("text", ""),
-                            upvotes=int(metrics.get("like_count", 0)),
-                            comments=int(metrics.get("reply_count", 0)),
-                            url=f"https://x.com/i/web/status/{tweet_id}",
-                            created_at=parsed_dt,
-                        )
+                results.append(
+                    RawPost(
+                        platform="twitter",
+                        title=item.get("text", "")[:120],
+                        content=item.get("text", ""),
+                        upvotes=int(metrics.get("like_count", 0)),
+                        comments=int(metrics.get("reply_count", 0)),
+                        url=f"https://x.com/i/web/status/{tweet_id}",
+                        created_at=parsed_dt,
                     )
+                )
 
         return results
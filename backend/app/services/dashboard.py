@@ -0,0 +1,225 @@
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import orjson
+from sqlalchemy import Row, Select, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal, gather_with_sessions
+from app.models.cluster import ProblemCluster
+from app.models.dashboard_snapshot import DashboardSnapshot
+from app.models.idea import Idea
+from app.models.pain import ExtractedPain
+from app.models.post import Post
+from app.schemas.dashboard import DashboardOverview, KpiTile, QuickLaunchPlan, RevenueModelSummary, TrendSignal
+
+logger = logging.getLogger(__name__)
+
+
+def _scalar(stmt: Select) -> Callable[[AsyncSession], Awaitable[Any]]:
+    async def _run(db: AsyncSession) -> Any:
+        return await db.scalar(stmt)
+
+    return _run
+
+
+def _scalars(stmt: Select) -> Callable[[AsyncSession], Awaitable[list[Any]]]:
+    async def _run(db: AsyncSession) -> list[Any]:
+        return list((await db.scalars(stmt)).all())
+
+    return _run
+
+
+def _rows(stmt: Select) -> Callable[[AsyncSession], Awaitable[list[Row]]]:
+    async def _run(db: AsyncSession) -> list[Row]:
+        return list((await db.execute(stmt)).all())
+
+    return _run
+
+
+async def build_dashboard_overview() -> DashboardOverview:
+    # Independent count and aggregate queries, each on its own pooled session so they truly overlap.
+    (
+        total_posts_value,
+        total_pains_value,
+        total_clusters_value,
+        avg_validation_value,
+        top_clusters,
+        trending_clusters,
+        top_ideas,
+        revenue_rows,
+    ) = await gather_with_sessions(
+        _scalar(select(func.count(Post.id))),
+        _scalar(select(func.count(ExtractedPain.id))),
+        _scalar(select(func.count(ProblemCluster.id))),
+        _scalar(select(func.avg(Idea.final_score))),
+        _scalars(select(ProblemCluster).order_by(ProblemCluster.post_count.desc()).limit(6)),
+        _scalars(select(ProblemCluster).order_by(ProblemCluster.trend_7d.desc()).limit(6)),
+        _scalars(select(Idea).order_by(Idea.final_score.desc()).limit(8)),
+        _rows(
+            select(Idea.revenue_model, func.count(Idea.id))
+            .group_by(Idea.revenue_model)
+            .order_by(func.count(Idea.id).desc())
+            .limit(6)
+        ),
+    )
+
+    total_posts = int(total_posts_value or 0)
+    total_pains = int(total_pains_value or 0)
+    total_clusters = int(total_clusters_value or 0)
+    avg_validation = float(avg_validation_value or 0.0)
+
+    revenue_summary = [RevenueModelSummary(revenue_model=row[0], idea_count=int(row[1])) for row in revenue_rows]
+
+    if top_ideas:
+        best_idea = top_ideas[0]
+        quick_launch = QuickLaunchPlan(
+            title=f"Quick Launch Plan: {best_idea.idea_name}",
+            bullet_points=[
+                "Interview 8 ICP users from matched pain cluster.",
+                "Build MVP core workflow + billing in week 2.",
+                "Pilot with 3 design partners and measure activation.",
+                "Ship paid beta with a usage-based expansion path.",
+            ],
+        )
+    else:
+        quick_launch = QuickLaunchPlan(
+            title="No ideas generated yet",
+            bullet_points=[
+                "Run the scrape pipeline to collect new market signals.",
+                "Check filters and include at least one industry tag.",
+            ],
+        )
+
+    kpis = [
+        KpiTile(label="Posts Collected", value=str(total_posts), delta="Live"),
+        KpiTile(label="Pain Signals", value=str(total_pains), delta="Analyzed"),
+        KpiTile(label="Problem Clusters", value=str(total_clusters), delta="Grouped"),
+        KpiTile(label="Avg Validation", value=f"{avg_validation:.1f}", delta="/100"),
+    ]
+
+    signals = [
+        TrendSignal(
+            cluster_id=str(cluster.id),
+            cluster_name=cluster.name,
+            trend_7d=cluster.trend_7d,
+            trend_30d=cluster.trend_30d,
+        )
+        for cluster in trending_clusters
+    ]
+
+    return DashboardOverview(
+        kpis=kpis,
+        top_clusters=top_clusters,
+        trending_signals=signals,
+        top_ideas=top_ideas,
+        revenue_summary=revenue_summary,
+        quick_launch_plan=quick_launch,
+    )
+
+
+class DashboardCache:
+    """
+    Serves the dashboard overview as pre-serialized JSON bytes.
+    The payload only changes when the pipeline commits, so it is rebuilt lazily after `invalidate()`
+    or once the local copy is older than the TTL (which picks up commits made by other processes).
+    With the postgres backend, replicas share one snapshot row instead of each rebuilding. The row is
+    also used whenever the pipeline runs in a separate worker, since that is where `invalidate()` is
+    called; API processes then rebuild from a cleared row rather than keep a stale copy past the TTL.
+    """
+
+    def __init__(self) -> None:
+        self._payload: bytes | None = None
+        self._loaded_at = 0.0
+        # Local counterpart of the shared row's generation, so a build that raced an invalidation is not kept.
+        self._generation = 0
+        self._lock = asyncio.Lock()
+
+    async def get(self) -> bytes:
+        payload = self._fresh_local()
+        if payload is not None:
+            return payload
+
+        async with self._lock:
+            payload = self._fresh_local()
+            if payload is not None:
+                return payload
+
+            local_generation = self._generation
+            async with AsyncSessionLocal() as db:
+                payload, shared_generation = await self._load_shared(db)
+                current = True
+                if payload is None:
+                    overview = await build_dashboard_overview()
+                    payload = orjson.dumps(overview.model_dump())
+                    current = await self._store_shared(db, payload, shared_generation)
+
+            if current and local_generation == self._generation:
+                self._payload = payload
+                self._loaded_at = time.monotonic()
+            return payload
+
+    async def invalidate(self) -> None:
+        self._payload = None
+        self._generation += 1
+        if not _shared():
+            return
+        try:
+            async with AsyncSessionLocal() as db:
+                stmt = pg_insert(DashboardSnapshot).values(id=1, payload=None, generation=1)
+                await db.execute(
+                    stmt.on_conflict_do_update(
+                        index_elements=[DashboardSnapshot.id],
+                        set_={"payload": None, "generation": DashboardSnapshot.generation + 1},
+                    )
+                )
+                await db.commit()
+        except Exception:  # noqa: BLE001
+            logger.exception("Failed to clear the shared dashboard snapshot.")
+
+    def _fresh_local(self) -> bytes | None:
+        if self._payload is None:
+            return None
+        if time.monotonic() - self._loaded_at > settings.dashboard_cache_ttl_seconds:
+            return None
+        return self._payload
+
+    async def _load_shared(self, db: AsyncSession) -> tuple[bytes | None, int]:
+        """The shared payload (None when cleared or not shared) and the generation it belongs to."""
+        if not _shared():
+            return None, 0
+        row = (
+            await db.execute(
+                select(DashboardSnapshot.payload, DashboardSnapshot.generation).where(DashboardSnapshot.id == 1)
+            )
+        ).first()
+        return (row.payload, row.generation) if row is not None else (None, 0)
+
+    async def _store_shared(self, db: AsyncSession, payload: bytes, generation: int) -> bool:
+        """
+        Store a payload built from `generation`. Returns False, storing nothing, when an invalidation
+        has bumped the generation since, because the payload may predate the pipeline's commit.
+        """
+        if not _shared():
+            return True
+        stmt = pg_insert(DashboardSnapshot).values(id=1, payload=payload, generation=generation)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DashboardSnapshot.id],
+            set_={"payload": stmt.excluded.payload, "built_at": func.now()},
+            where=DashboardSnapshot.generation == generation,
+        )
+        result = await db.execute(stmt)
+        await db.commit()
+        return result.rowcount > 0
+
+
+def _shared() -> bool:
+    return settings.dashboard_cache_backend == "postgres" or not settings.worker_embedded
+
+
+dashboard_cache = DashboardCache()
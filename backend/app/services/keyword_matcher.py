@@ -0,0 +1,59 @@
+"""
+Compiled keyword matching for admin filters and collector keyword checks.
+
+Keywords are folded into a single case-insensitive regex whose alternation is factored as a
+character trie, so a search is one pass over the text regardless of how many keywords are
+configured. Matches respect word boundaries: "ai" matches "AI tools" but not "email".
+"""
+
+import re
+from collections.abc import Iterable
+from functools import lru_cache
+
+
+class KeywordMatcher:
+    def __init__(self, keywords: Iterable[str]) -> None:
+        terms = sorted({keyword.strip().lower() for keyword in keywords if keyword.strip()})
+        self.pattern: re.Pattern[str] | None = None
+        if terms:
+            self.pattern = re.compile(rf"(?<!\w)(?:{_trie_pattern(terms)})(?!\w)", re.IGNORECASE)
+
+    def __bool__(self) -> bool:
+        return self.pattern is not None
+
+    def search(self, text: str) -> bool:
+        return self.pattern is not None and self.pattern.search(text) is not None
+
+    def count(self, text: str) -> int:
+        """Number of non-overlapping keyword occurrences in `text`."""
+        if self.pattern is None:
+            return 0
+        return sum(1 for _ in self.pattern.finditer(text))
+
+
+@lru_cache(maxsize=256)
+def compile_keywords(keywords: tuple[str, ...]) -> KeywordMatcher:
+    """Matcher for `keywords`, cached so each distinct filter version is compiled once."""
+    return KeywordMatcher(keywords)
+
+
+def _trie_pattern(terms: list[str]) -> str:
+    trie: dict[str, dict] = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    return _node_pattern(trie)
+
+
+def _node_pattern(node: dict[str, dict]) -> str:
+    branches = [re.escape(char) + _node_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ""
+
+    terminal = "" in node
+    if len(branches) == 1 and not terminal:
+        return branches[0]
+    group = f"(?:{'|'.join(branches)})"
+    return f"{group}?" if terminal else group
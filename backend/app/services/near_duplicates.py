@@ -0,0 +1,133 @@
+"""
+Near-duplicate post detection with MinHash and banded LSH lookup.
+
+Each post is reduced to word 3-shingles of its title and content, and a `NUM_PERM`-value MinHash
+signature is stored on the post. Canonical posts index their signature in `post_minhash_bands`, one
+hash per band of `ROWS_PER_BAND` values, so finding candidates is an indexed equality probe rather than
+a scan of the corpus. Candidates are confirmed by their estimated Jaccard similarity.
+"""
+
+import hashlib
+import re
+import uuid
+from collections import defaultdict
+
+import numpy as np
+from sqlalchemy import select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.core.config import settings
+from app.models.post import Post
+from app.models.post_minhash_band import PostMinhashBand
+
+NUM_PERM = 64
+ROWS_PER_BAND = 4
+NUM_BANDS = NUM_PERM // ROWS_PER_BAND
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_rng = np.random.RandomState(1)
+# Fixed permutations: signatures must stay comparable across processes and releases.
+_PERM_A = _rng.randint(1, int(_MERSENNE_PRIME), size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.randint(0, int(_MERSENNE_PRIME), size=NUM_PERM, dtype=np.uint64)
+_TOKEN_RE = re.compile(r"\w+")
+# (band, value) pairs per candidate lookup, keeping bind parameters well under asyncpg's limit.
+_PROBE_CHUNK = 5000
+
+
+def shingles(text: str, size: int = 3) -> set[str]:
+    tokens = _TOKEN_RE.findall(text.lower())
+    if len(tokens) <= size:
+        return {" ".join(tokens)}
+    return {" ".join(tokens[i : i + size]) for i in range(len(tokens) - size + 1)}
+
+
+def minhash(text: str) -> np.ndarray:
+    """`NUM_PERM` 32-bit MinHash values of the text's word 3-shingles."""
+    hashes = np.array(
+        [int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little") for s in shingles(text)],
+        dtype=np.uint64,
+    )
+    with np.errstate(over="ignore"):
+        permuted = (np.outer(hashes, _PERM_A) + _PERM_B) % _MERSENNE_PRIME & _MAX_HASH
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def band_keys(signature: np.ndarray) -> list[tuple[int, int]]:
+    """One signed 64-bit hash per band, matching the BIGINT `value` column."""
+    keys: list[tuple[int, int]] = []
+    for band in range(NUM_BANDS):
+        chunk = signature[band * ROWS_PER_BAND : (band + 1) * ROWS_PER_BAND].tobytes()
+        keys.append((band, int.from_bytes(hashlib.blake2b(chunk, digest_size=8).digest(), "little", signed=True)))
+    return keys
+
+
+def similarity(left: np.ndarray, right: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the underlying shingle sets."""
+    return float(np.mean(left == right))
+
+
+def post_text(post: Post) -> str:
+    return f"{post.title}\n{post.content}"
+
+
+async def link_near_duplicates(db: AsyncSession, posts: list[Post]) -> int:
+    """
+    Sign `posts`, point each near-duplicate at the canonical post it copies (already stored posts and
+    earlier items of the same batch), and index the rest as new canonical posts.
+    Returns how many posts were linked as duplicates.
+    """
+    if not posts:
+        return 0
+
+    signatures = {post.id: minhash(post_text(post)) for post in posts}
+    keys_by_post = {post_id: band_keys(signature) for post_id, signature in signatures.items()}
+    probe_keys = list({key for keys in keys_by_post.values() for key in keys})
+
+    # Canonical posts already indexed that share at least one band with this batch.
+    candidates_by_band: dict[tuple[int, int], list[tuple[uuid.UUID, np.ndarray]]] = defaultdict(list)
+    for start in range(0, len(probe_keys), _PROBE_CHUNK):
+        result = await db.execute(
+            select(PostMinhashBand.band, PostMinhashBand.value, Post.id, Post.minhash)
+            .join(Post, Post.id == PostMinhashBand.post_id)
+            .where(tuple_(PostMinhashBand.band, PostMinhashBand.value).in_(probe_keys[start : start + _PROBE_CHUNK]))
+        )
+        for band, value, post_id, stored in result.all():
+            if stored is not None:
+                candidates_by_band[(band, value)].append((post_id, np.frombuffer(stored, dtype=np.uint32)))
+
+    updates: list[dict] = []
+    band_rows: list[dict] = []
+    duplicates = 0
+    for post in posts:
+        signature = signatures[post.id]
+        keys = keys_by_post[post.id]
+        canonical_id = next(
+            (
+                candidate_id
+                for key in keys
+                for candidate_id, candidate_signature in candidates_by_band.get(key, ())
+                if similarity(signature, candidate_signature) >= settings.near_duplicate_min_similarity
+            ),
+            None,
+        )
+
+        stored = signature.tobytes()
+        updates.append({"id": post.id, "minhash": stored, "canonical_post_id": canonical_id})
+        # Mirror the bulk UPDATE below on the loaded objects without marking them dirty.
+        set_committed_value(post, "minhash", stored)
+        set_committed_value(post, "canonical_post_id", canonical_id)
+        if canonical_id is not None:
+            duplicates += 1
+            continue
+
+        for key in keys:
+            candidates_by_band[key].append((post.id, signature))
+            band_rows.append({"band": key[0], "value": key[1], "post_id": post.id})
+
+    await db.execute(update(Post), updates)
+    if band_rows:
+        await db.execute(pg_insert(PostMinhashBand).values(band_rows).on_conflict_do_nothing())
+    return duplicates
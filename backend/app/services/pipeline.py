@@ -1,23 +1,40 @@
 import asyncio
-from datetime import datetime, timedelta, timezone
-
-from sqlalchemy import and_, func, select
+import logging
+import uuid
+from collections import Counter
+from collections.abc import AsyncIterator, Awaitable
+from functools import partial
+
+from sqlalchemy import exists, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
 
 from app.core.config import settings
+from app.db.session import gather_with_sessions
 from app.models.admin_filter import AdminFilter
 from app.models.cluster import ProblemCluster
 from app.models.idea import Idea
 from app.models.pain import ExtractedPain
 from app.models.post import Post
 from app.services.ai.idea_generator import IdeaGenerator
-from app.services.ai.pain_extractor import PainExtractor
+from app.services.ai.pain_extractor import PainExtractionPayload, PainExtractor
 from app.services.ai.validation import ValidationScorer
 from app.services.clustering.cluster_engine import ClusterEngine
 from app.services.collectors.base import RawPost
+from app.services.collectors.cursors import CursorMap, load_cursors, save_cursors
 from app.services.collectors.producthunt_collector import ProductHuntCollector
 from app.services.collectors.reddit_collector import RedditCollector
 from app.services.collectors.twitter_collector import TwitterCollector
+from app.services.dashboard import dashboard_cache
+from app.services.keyword_matcher import compile_keywords
+from app.services.near_duplicates import link_near_duplicates
+
+logger = logging.getLogger(__name__)
+
+INDIA_GEO_TOKENS = ("india", "indian", "mumbai", "delhi", "bengaluru", "bangalore", "hyderabad")
+
+CollectorSource = Awaitable[list[RawPost]] | AsyncIterator[list[RawPost]]
 
 
 class PipelineOrchestrator:
@@ -31,54 +48,83 @@ class PipelineOrchestrator:
         self.idea_generator = IdeaGenerator()
         self.validation = ValidationScorer()
 
-    async def run_full_pipeline(self) -> dict[str, int]:
+    async def run_stage(self, stage: str) -> dict[str, int]:
+        """
+        Run one pipeline stage as a queued job. Each stage reads its input from committed
+        database state (posts without pains, clusters without ideas), so stages can run
+        in separate worker processes and be retried independently.
+        """
+        handlers = {
+            "collect": self.run_collect_stage,
+            "extract": self.run_extract_stage,
+            "cluster": self.run_cluster_stage,
+            "ideate": self.run_ideate_stage,
+            "trends": self.run_trends_stage,
+        }
+        if stage not in handlers:
+            raise ValueError(f"Unknown pipeline stage: {stage}")
+        return await handlers[stage]()
+
+    async def run_collect_stage(self) -> dict[str, int]:
         admin_filter = await self._get_or_create_filter()
-        raw_posts = await self._collect_posts(admin_filter)
+        if settings.pipeline_mode == "streaming":
+            # Streaming collection also extracts and clusters as posts arrive; the chained
+            # extract and cluster stages then only pick up leftovers.
+            counts, clusters = await self._stream_ingest(admin_filter)
+            await self.commit()
+            return {**counts, "new_clusters": len(clusters)}
+
+        cursors = await self._load_cursors()
+        raw_posts = await self._collect_posts(admin_filter, cursors)
         created_posts = await self._persist_posts(raw_posts)
-        extracted_count = await self._extract_pains(created_posts, admin_filter)
+        await self._save_cursors(cursors)
+        await self.commit()
+        return {"collected_posts": len(raw_posts), "stored_posts": len(created_posts)}
+
+    async def run_extract_stage(self) -> dict[str, int]:
+        admin_filter = await self._get_or_create_filter()
+        result = await self.db.execute(
+            select(Post)
+            .where(
+                Post.canonical_post_id.is_(None),
+                ~exists().where(ExtractedPain.post_id == Post.id),
+                *self._relevance_conditions(),
+            )
+            .order_by(Post.created_at)
+        )
+        posts = list(result.scalars().all())
+        extraction = await self._extract_pains(posts, admin_filter)
+        await self.commit()
+        return extraction
+
+    async def run_cluster_stage(self) -> dict[str, int]:
         clusters = await self.cluster_engine.cluster_unassigned_pains(self.db)
+        await self.cluster_engine.refresh_neighbors(self.db)
+        await self.commit()
+        return {"new_clusters": len(clusters)}
+
+    async def run_ideate_stage(self) -> dict[str, int]:
+        result = await self.db.execute(
+            select(ProblemCluster).where(~exists().where(Idea.cluster_id == ProblemCluster.id))
+        )
+        clusters = list(result.scalars().all())
+        await self.db.commit()
         await self._generate_ideas_for_clusters(clusters)
+        await dashboard_cache.invalidate()
+        return {"ideated_clusters": len(clusters)}
+
+    async def run_trends_stage(self) -> dict[str, int]:
         await self.recalculate_cluster_trends()
-        await self.db.commit()
+        await self.commit()
+        return {}
 
-        return {
-            "collected_posts": len(raw_posts),
-            "stored_posts": len(created_posts),
-            "extracted_pains": extracted_count,
-            "new_clusters": len(clusters),
-        }
+    async def commit(self) -> None:
+        """Commit pipeline writes and drop the cached dashboard payload built from the previous state."""
+        await self.db.commit()
+        await dashboard_cache.invalidate()
 
     async def recalculate_cluster_trends(self) -> None:
         await self.cluster_engine.refresh_cluster_rollups(self.db)
-        
-        now = datetime.now(timezone.utc)
-        seven_days_ago = now - timedelta(days=7)
-        thirty_days_ago = now - timedelta(days=30)
-
-        # Single query to get counts for all clusters for 7d and 30d
-        trend7_q = select(
-            ExtractedPain.cluster_id, 
-            func.count(ExtractedPain.id)
-        ).where(ExtractedPain.created_at >= seven_days_ago).group_by(ExtractedPain.cluster_id)
-        
-        trend30_q = select(
-            ExtractedPain.cluster_id, 
-            func.count(ExtractedPain.id)
-        ).where(ExtractedPain.created_at >= thirty_days_ago).group_by(ExtractedPain.cluster_id)
-
-        trend7_res, trend30_res = await asyncio.gather(
-            self.db.execute(trend7_q),
-            self.db.execute(trend30_q)
-        )
-        
-        counts7 = {row[0]: row[1] for row in trend7_res.all()}
-        counts30 = {row[0]: row[1] for row in trend30_res.all()}
-
-        clusters_result = await self.db.execute(select(ProblemCluster))
-        for cluster in clusters_result.scalars():
-            cluster.trend_7d = int(counts7.get(cluster.id, 0))
-            cluster.trend_30d = int(counts30.get(cluster.id, 0))
-
         await self.db.flush()
 
     async def _get_or_create_filter(self) -> AdminFilter:
@@ -97,22 +143,40 @@ class PipelineOrchestrator:
         await self.db.flush()
         return default_filter
 
-    async def _collect_posts(self, admin_filter: AdminFilter) -> list[RawPost]:
+    async def _load_cursors(self) -> CursorMap | None:
+        if not settings.collector_cursors_enabled:
+            return None
+        return await load_cursors(self.db)
+
+    async def _save_cursors(self, cursors: CursorMap | None) -> None:
+        # Saved with the persisted posts, so an interrupted run fetches the same window again.
+        if cursors is not None:
+            await save_cursors(self.db, cursors)
+
+    def _collector_sources(
+        self,
+        admin_filter: AdminFilter,
+        cursors: CursorMap | None,
+        paged: bool = False,
+    ) -> list[CollectorSource]:
+        """One source per collector; with `paged`, collectors that can stream pages return an async iterator."""
         keywords = admin_filter.include_keywords or settings.default_keywords
-
-        reddit_task = asyncio.to_thread(self.reddit_collector.fetch, keywords, 30)
-        producthunt_task = self.producthunt_collector.fetch(keywords, 30)
-        twitter_task = self.twitter_collector.fetch(keywords, 15)
-
-        reddit_posts, producthunt_posts, twitter_posts = await asyncio.gather(
-            reddit_task,
-            producthunt_task,
-            twitter_task,
-            return_exceptions=True,
-        )
+        producthunt_cursors = None if cursors is None else cursors["producthunt"]
+        return [
+            self.reddit_collector.fetch(keywords, 30, None if cursors is None else cursors["reddit"]),
+            (
+                self.producthunt_collector.iter_pages(keywords, 30, producthunt_cursors)
+                if paged
+                else self.producthunt_collector.fetch(keywords, 30, producthunt_cursors)
+            ),
+            self.twitter_collector.fetch(keywords, 15, None if cursors is None else cursors["twitter"]),
+        ]
+
+    async def _collect_posts(self, admin_filter: AdminFilter, cursors: CursorMap | None) -> list[RawPost]:
+        batches = await asyncio.gather(*self._collector_sources(admin_filter, cursors), return_exceptions=True)
 
         combined: list[RawPost] = []
-        for batch in (reddit_posts, producthunt_posts, twitter_posts):
+        for batch in batches:
             if isinstance(batch, Exception):
                 continue
             combined.extend(batch)
@@ -126,117 +190,263 @@ class PipelineOrchestrator:
         return list(deduped_by_url.values())
 
     def _apply_manual_filters(self, posts: list[RawPost], admin_filter: AdminFilter) -> list[RawPost]:
-        exclude = [keyword.lower() for keyword in admin_filter.exclude_keywords]
-        industries = [industry.lower() for industry in admin_filter.industries]
+        exclude = compile_keywords(tuple(admin_filter.exclude_keywords))
+        geo = compile_keywords(INDIA_GEO_TOKENS if admin_filter.geo_scope == "INDIA" else ())
+        industries = compile_keywords(tuple(admin_filter.industries))
 
         filtered: list[RawPost] = []
         for post in posts:
-            haystack = f"{post.title} {post.content}".lower()
+            haystack = f"{post.title}\n{post.content}"
 
-            if exclude and any(keyword in haystack for keyword in exclude):
+            if exclude and exclude.search(haystack):
                 continue
 
-            if admin_filter.geo_scope == "INDIA":
-                geo_tokens = ["india", "indian", "mumbai", "delhi", "bengaluru", "bangalore", "hyderabad"]
-                if not any(token in haystack for token in geo_tokens):
-                    continue
+            if geo and not geo.search(haystack):
+                continue
 
-            if industries:
-                if not any(industry in haystack for industry in industries):
-                    continue
+            if industries and not industries.search(haystack):
+                continue
 
             filtered.append(post)
 
         return filtered
 
     async def _persist_posts(self, raw_posts: list[RawPost]) -> list[Post]:
-        created_posts: list[Post] = []
-        for raw in raw_posts:
-            exists_query = await self.db.execute(
-                select(Post.id).where(and_(Post.platform == raw.platform, Post.url == raw.url))
-            )
-            if exists_query.scalar_one_or_none() is not None:
-                continue
+        """
+        Insert collected posts in set-based chunks keyed on `uq_posts_platform_url`.
+        Rows that already exist are skipped by ON CONFLICT, so only newly created posts are returned.
+        New posts are signed and linked to their canonical post when they near-duplicate one.
+        """
+        if not raw_posts:
+            return []
+
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "platform": raw.platform,
+                "title": raw.title[:500],
+                "content": raw.content,
+                "upvotes": raw.upvotes,
+                "comments": raw.comments,
+                "url": raw.url,
+                "created_at": raw.created_at,
+                "relevance_score": self.pain_extractor.relevance(raw),
+            }
+            for raw in raw_posts
+        ]
 
-            post = Post(
-                platform=raw.platform,
-                title=raw.title[:500],
-                content=raw.content,
-                upvotes=raw.upvotes,
-                comments=raw.comments,
-                url=raw.url,
-                created_at=raw.created_at,
+        created_posts: list[Post] = []
+        batch_size = max(1, settings.persist_batch_size)
+        for start in range(0, len(rows), batch_size):
+            stmt = (
+                pg_insert(Post)
+                .values(rows[start : start + batch_size])
+                .on_conflict_do_nothing(constraint="uq_posts_platform_url")
+                .returning(Post)
             )
-            self.db.add(post)
-            created_posts.append(post)
+            result = await self.db.scalars(stmt)
+            created = list(result.all())
+            if settings.near_duplicate_detection:
+                await link_near_duplicates(self.db, created)
+            created_posts.extend(created)
 
-        await self.db.flush()
         return created_posts
 
-    async def _extract_pains(self, posts: list[Post], admin_filter: AdminFilter) -> int:
+    async def _extract_pains(self, posts: list[Post], admin_filter: AdminFilter) -> dict[str, int]:
+        posts, counts = self._extraction_candidates(posts)
         if not posts:
-            return 0
-            
-        sem = asyncio.Semaphore(5)  # Limit concurrent AI extraction
-
-        async def _process_post(post: Post) -> int:
-            async with sem:
-                payload = await self.pain_extractor.extract(post)
-                pain = ExtractedPain(
-                    post_id=post.id,
-                    pain_point=payload.pain_point,
-                    target_user=payload.target_user,
-                    urgency_score=payload.urgency_score,
-                    willingness_to_pay=payload.willingness_to_pay,
-                    existing_solutions=payload.existing_solutions,
-                    geo_scope=admin_filter.geo_scope,
-                    industry=(admin_filter.industries[0] if admin_filter.industries else "SaaS"),
-                )
-                self.db.add(pain)
-                return 1
+            return {"extracted_pains": 0, **counts}
 
-        results = await asyncio.gather(*(_process_post(post) for post in posts))
+        # Concurrency is governed by the shared adaptive OpenAI limiter rather than a fixed semaphore.
+        batches = self.pain_extractor.pack_batches(
+            posts,
+            max_posts=max(1, settings.extraction_batch_size),
+            token_budget=settings.extraction_batch_token_budget,
+        )
+
+        async def _process_batch(batch: list[Post]) -> int:
+            payloads = await self.pain_extractor.extract_batch(batch)
+            self._add_pains(batch, payloads, admin_filter)
+            return len(payloads)
+
+        results = await asyncio.gather(*(_process_batch(batch) for batch in batches))
         await self.db.flush()
-        return sum(results)
+        return {"extracted_pains": sum(results), **counts}
+
+    @staticmethod
+    def _relevance_conditions() -> list[ColumnElement[bool]]:
+        if not settings.relevance_gate_enabled:
+            return []
+        return [or_(Post.relevance_score.is_(None), Post.relevance_score >= settings.relevance_min_score)]
+
+    def _extraction_candidates(self, posts: list[Post]) -> tuple[list[Post], dict[str, int]]:
+        """
+        Drop posts that should not reach the LLM and order the rest by relevance, strongest first.
+        Near-duplicates share their canonical post's pain; posts under `relevance_min_score`
+        (job ads, memes, promotions) are not pain signals. Returns the candidates and skip counts.
+        """
+        counts = {"skipped_duplicates": 0, "skipped_irrelevant": 0}
+        candidates: list[Post] = []
+        for post in posts:
+            if post.canonical_post_id is not None:
+                counts["skipped_duplicates"] += 1
+            elif (
+                settings.relevance_gate_enabled
+                and post.relevance_score is not None
+                and post.relevance_score < settings.relevance_min_score
+            ):
+                counts["skipped_irrelevant"] += 1
+            else:
+                candidates.append(post)
+
+        candidates.sort(key=lambda post: post.relevance_score or 0.0, reverse=True)
+        return candidates, counts
+
+    def _add_pains(self, posts: list[Post], payloads: list[PainExtractionPayload], admin_filter: AdminFilter) -> None:
+        for post, payload in zip(posts, payloads):
+            pain = ExtractedPain(
+                post_id=post.id,
+                pain_point=payload.pain_point,
+                target_user=payload.target_user,
+                urgency_score=payload.urgency_score,
+                willingness_to_pay=payload.willingness_to_pay,
+                existing_solutions=payload.existing_solutions,
+                geo_scope=admin_filter.geo_scope,
+                industry=(admin_filter.industries[0] if admin_filter.industries else "SaaS"),
+            )
+            self.db.add(pain)
+
+    async def _stream_ingest(self, admin_filter: AdminFilter) -> tuple[dict[str, int], list[ProblemCluster]]:
+        """
+        Streaming collect -> persist -> extract -> cluster. Each collector's output is filtered and pushed
+        through bounded queues in chunks, so extraction starts as soon as the first collector returns and
+        only the chunks in flight are held in memory; a full queue blocks the stage that feeds it.
+        Clustering runs whenever `clustering_watermark` new pains have accumulated, and once at the end;
+        the related-cluster graph is rebuilt only after that final pass.
+        Every stage shares `self.db`, so database work is serialized behind one lock.
+        """
+        cursors = await self._load_cursors()
+        chunk_size = max(1, settings.pipeline_chunk_size)
+        queue_size = max(1, settings.pipeline_queue_size)
+        extractor_count = max(1, settings.openai_max_concurrency)
+        post_queue: asyncio.Queue[list[RawPost] | None] = asyncio.Queue(maxsize=queue_size)
+        batch_queue: asyncio.Queue[list[Post] | None] = asyncio.Queue(maxsize=queue_size)
+        db_lock = asyncio.Lock()
+        seen: set[str] = set()
+        counts: Counter[str] = Counter(
+            collected_posts=0,
+            stored_posts=0,
+            extracted_pains=0,
+            skipped_duplicates=0,
+            skipped_irrelevant=0,
+        )
+        clusters: list[ProblemCluster] = []
+        pending_pains = 0
+
+        async def _collect(source: CollectorSource) -> None:
+            try:
+                if isinstance(source, AsyncIterator):
+                    async for page in source:
+                        await _enqueue(page)
+                else:
+                    await _enqueue(await source)
+            except Exception:  # noqa: BLE001
+                logger.exception("Collector failed; continuing with the remaining sources.")
+
+        async def _enqueue(raw_posts: list[RawPost]) -> None:
+            fresh: list[RawPost] = []
+            for item in self._apply_manual_filters(raw_posts, admin_filter):
+                key = f"{item.platform}:{item.url}"
+                if key not in seen:
+                    seen.add(key)
+                    fresh.append(item)
+            counts["collected_posts"] += len(fresh)
+            for start in range(0, len(fresh), chunk_size):
+                await post_queue.put(fresh[start : start + chunk_size])
+
+        async def _produce() -> None:
+            sources = self._collector_sources(admin_filter, cursors, paged=True)
+            await asyncio.gather(*(_collect(source) for source in sources))
+            await post_queue.put(None)
+
+        async def _persist() -> None:
+            while (chunk := await post_queue.get()) is not None:
+                async with db_lock:
+                    created = await self._persist_posts(chunk)
+                counts["stored_posts"] += len(created)
+                candidates, skipped = self._extraction_candidates(created)
+                counts.update(skipped)
+                for batch in self.pain_extractor.pack_batches(
+                    candidates,
+                    max_posts=max(1, settings.extraction_batch_size),
+                    token_budget=settings.extraction_batch_token_budget,
+                ):
+                    await batch_queue.put(batch)
+            for _ in range(extractor_count):
+                await batch_queue.put(None)
+
+        async def _extract() -> None:
+            nonlocal pending_pains
+            while (batch := await batch_queue.get()) is not None:
+                payloads = await self.pain_extractor.extract_batch(batch)
+                async with db_lock:
+                    self._add_pains(batch, payloads, admin_filter)
+                    await self.db.flush()
+                    counts["extracted_pains"] += len(payloads)
+                    pending_pains += len(payloads)
+                    if pending_pains >= settings.clustering_watermark:
+                        pending_pains = 0
+                        clusters.extend(await self.cluster_engine.cluster_unassigned_pains(self.db))
+
+        async with asyncio.TaskGroup() as group:
+            group.create_task(_produce())
+            group.create_task(_persist())
+            for _ in range(extractor_count):
+                group.create_task(_extract())
+
+        await self._save_cursors(cursors)
+        clusters.extend(await self.cluster_engine.cluster_unassigned_pains(self.db))
+        await self.cluster_engine.refresh_neighbors(self.db)
+        return dict(counts), clusters
 
     async def _generate_ideas_for_clusters(self, new_clusters: list[ProblemCluster]) -> None:
+        """Generate and store ideas per cluster, each on its own session. The clusters must already be committed."""
         if not new_clusters:
             return
 
-        sem = asyncio.Semaphore(3)  # Idea generation is heavier, lower concurrency
-
-        async def _process_cluster(cluster: ProblemCluster):
-            async with sem:
-                pains_result = await self.db.execute(
-                    select(ExtractedPain).where(ExtractedPain.cluster_id == cluster.id).order_by(ExtractedPain.created_at.desc())
+        async def _process_cluster(db: AsyncSession, cluster: ProblemCluster) -> None:
+            pains_result = await db.execute(
+                select(ExtractedPain).where(ExtractedPain.cluster_id == cluster.id).order_by(ExtractedPain.created_at.desc())
+            )
+            pains = list(pains_result.scalars().all())
+            # End the read transaction so the connection returns to the pool while the LLM call runs.
+            await db.commit()
+
+            generated = await self.idea_generator.generate_for_cluster(cluster, pains)
+            for item in generated:
+                scoring = self.validation.score(cluster, item)
+                idea = Idea(
+                    cluster_id=cluster.id,
+                    idea_type=item["idea_type"],
+                    idea_name=item["idea_name"],
+                    description=item["description"],
+                    icp=item["icp"],
+                    revenue_model=item["revenue_model"],
+                    mvp_features=item["mvp_features"],
+                    pricing_estimate=item["pricing_estimate"],
+                    execution_roadmap=item["execution_roadmap"],
+                    tech_stack=item["tech_stack"],
+                    gtm_strategy=item["gtm_strategy"],
+                    launch_plan_30d=item["launch_plan_30d"],
+                    pain_intensity=int(scoring["pain_intensity"]),
+                    frequency=int(scoring["frequency"]),
+                    budget_size=int(scoring["budget_size"]),
+                    competition_level=int(scoring["competition_level"]),
+                    speed_to_mvp=int(scoring["speed_to_mvp"]),
+                    scalability=int(scoring["scalability"]),
+                    final_score=float(scoring["final_score"]),
                 )
-                pains = list(pains_result.scalars().all())
-
-                generated = await self.idea_generator.generate_for_cluster(cluster, pains)
-                for item in generated:
-                    scoring = self.validation.score(cluster, item)
-                    idea = Idea(
-                        cluster_id=cluster.id,
-                        idea_type=item["idea_type"],
-                        idea_name=item["idea_name"],
-                        description=item["description"],
-                        icp=item["icp"],
-                        revenue_model=item["revenue_model"],
-                        mvp_features=item["mvp_features"],
-                        pricing_estimate=item["pricing_estimate"],
-                        execution_roadmap=item["execution_roadmap"],
-                        tech_stack=item["tech_stack"],
-                        gtm_strategy=item["gtm_strategy"],
-                        launch_plan_30d=item["launch_plan_30d"],
-                        pain_intensity=int(scoring["pain_intensity"]),
-                        frequency=int(scoring["frequency"]),
-                        budget_size=int(scoring["budget_size"]),
-                        competition_level=int(scoring["competition_level"]),
-                        speed_to_mvp=int(scoring["speed_to_mvp"]),
-                        scalability=int(scoring["scalability"]),
-                        final_score=float(scoring["final_score"]),
-                    )
-                    self.db.add(idea)
-
-        await asyncio.gather(*(_process_cluster(cluster) for cluster in new_clusters))
-        await self.db.flush()
+                db.add(idea)
+            await db.commit()
+
+        await gather_with_sessions(*(partial(_process_cluster, cluster=cluster) for cluster in new_clusters))
@@ -0,0 +1,58 @@
+"""
+LLM cache and OpenAI limiter counters shared between the API and worker processes.
+
+The counters live in process memory, and with a separate worker the LLM calls happen there. Each
+worker publishes its snapshot to `process_stats`; the admin endpoint merges the snapshots published
+within `process_stats_max_age_seconds` with the API process's own.
+"""
+
+import os
+import socket
+from dataclasses import fields
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.process_stats import ProcessStats
+from app.services.ai.llm_cache import CacheStats, llm_cache
+from app.services.ai.rate_limiter import openai_limiter
+
+PROCESS_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+
+def local_stats() -> dict[str, Any]:
+    return {"llm_cache": llm_cache.snapshot(), "limiter": openai_limiter.snapshot()}
+
+
+async def publish_stats(db: AsyncSession, role: str) -> None:
+    stmt = pg_insert(ProcessStats).values(process_id=PROCESS_ID, role=role, stats=local_stats())
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[ProcessStats.process_id],
+            set_={"role": stmt.excluded.role, "stats": stmt.excluded.stats, "updated_at": datetime.now(timezone.utc)},
+        )
+    )
+    await db.commit()
+
+
+async def collect_stats(db: AsyncSession, role: str) -> dict[str, Any]:
+    """This process's live counters plus every other process's recent snapshot, with cache totals."""
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.process_stats_max_age_seconds)
+    result = await db.scalars(
+        select(ProcessStats)
+        .where(ProcessStats.updated_at >= cutoff, ProcessStats.process_id != PROCESS_ID)
+        .order_by(ProcessStats.process_id)
+    )
+    processes = [{"process_id": PROCESS_ID, "role": role, "updated_at": datetime.now(timezone.utc), **local_stats()}]
+    processes.extend(
+        {"process_id": row.process_id, "role": row.role, "updated_at": row.updated_at, **row.stats}
+        for row in result.all()
+    )
+
+    counters = [field.name for field in fields(CacheStats)]
+    totals = {name: sum(int(process["llm_cache"].get(name, 0)) for process in processes) for name in counters}
+    return {"backend": settings.llm_cache_backend, **totals, "processes": processes}
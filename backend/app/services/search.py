@@ -0,0 +1,189 @@
+"""
+Ranked full-text search across posts, pains, clusters and ideas.
+
+Each kind is matched through its stored `search_vector` column (GIN indexed, see `init_db`) with
+`websearch_to_tsquery`; cluster and idea names also match by trigram similarity so typos still hit.
+Every branch ranks at most `search_max_candidates` matches and keeps its own top `offset + limit`,
+so a page never ranks more than that per kind. The capped matches are whichever the index scan
+returns first, not the best ranked, so a page drawn from a capped kind is flagged `approximate`.
+Highlighting runs only on the rows of the page, over HTML-escaped bodies.
+"""
+
+from collections.abc import Collection
+
+from sqlalchemy import Select, String, cast, func, literal, literal_column, null, or_, select, union_all
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.config import settings
+from app.models.cluster import ProblemCluster
+from app.models.idea import Idea
+from app.models.pain import ExtractedPain
+from app.models.post import Post
+from app.schemas.search import SearchHitOut, SearchKind
+
+# Inlined rather than bound so Postgres sees a regconfig constant, matching the indexed expressions.
+SEARCH_CONFIG = literal_column("'english'::regconfig")
+_HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=30, MinWords=10"
+
+
+def _search_vector(table: str) -> ColumnElement:
+    return literal_column(f"{table}.search_vector", type_=TSVECTOR)
+
+
+def _html_escape(body: ColumnElement) -> ColumnElement:
+    """Escape stored text before `ts_headline` so only its own <mark> tags reach the client as markup."""
+    for char, entity in (("&", "&amp;"), ("<", "&lt;"), (">", "&gt;"), ('"', "&quot;"), ("'", "&#x27;")):
+        body = func.replace(body, literal(char), literal(entity))
+    return body
+
+
+def _branch(
+    kind: SearchKind,
+    table: str,
+    id_column: ColumnElement,
+    title: ColumnElement,
+    body: ColumnElement,
+    cluster_id: ColumnElement,
+    url: ColumnElement,
+    tsquery: ColumnElement,
+    depth: int,
+    fuzzy_name: ColumnElement | None = None,
+    query_text: str = "",
+) -> Select:
+    vector = _search_vector(table)
+    match = vector.op("@@")(tsquery)
+    rank = func.ts_rank_cd(vector, tsquery)
+    if fuzzy_name is not None:
+        match = or_(match, fuzzy_name.op("%")(query_text))
+        rank = func.greatest(rank, func.similarity(fuzzy_name, query_text))
+
+    # Bound how many matches are ranked for very common terms before taking this kind's top rows.
+    # The cap applies before ranking; `capped` marks kinds that hit it.
+    candidates = (
+        select(
+            literal_column(f"'{kind}'", String).label("kind"),
+            id_column.label("id"),
+            title.label("title"),
+            body.label("body"),
+            cluster_id.label("cluster_id"),
+            url.label("url"),
+            rank.label("rank"),
+        )
+        .where(match)
+        .limit(settings.search_max_candidates)
+        .subquery()
+    )
+    capped = (func.count().over() >= settings.search_max_candidates).label("capped")
+    return select(candidates, capped).order_by(candidates.c.rank.desc()).limit(depth)
+
+
+def build_search_query(text: str, kinds: Collection[SearchKind], limit: int, offset: int) -> Select:
+    tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, text)
+    depth = offset + limit
+    no_cluster = cast(null(), UUID(as_uuid=True))
+    no_url = cast(null(), String)
+
+    branches: list[Select] = []
+    if "post" in kinds:
+        branches.append(
+            _branch("post", "posts", Post.id, Post.title, Post.content, no_cluster, Post.url, tsquery, depth)
+        )
+    if "pain" in kinds:
+        branches.append(
+            _branch(
+                "pain",
+                "extracted_pains",
+                ExtractedPain.id,
+                ExtractedPain.target_user,
+                ExtractedPain.pain_point,
+                ExtractedPain.cluster_id,
+                no_url,
+                tsquery,
+                depth,
+            )
+        )
+    if "cluster" in kinds:
+        branches.append(
+            _branch(
+                "cluster",
+                "problem_clusters",
+                ProblemCluster.id,
+                ProblemCluster.name,
+                ProblemCluster.summary,
+                ProblemCluster.id,
+                no_url,
+                tsquery,
+                depth,
+                fuzzy_name=ProblemCluster.name,
+                query_text=text,
+            )
+        )
+    if "idea" in kinds:
+        branches.append(
+            _branch(
+                "idea",
+                "ideas",
+                Idea.id,
+                Idea.idea_name,
+                Idea.description,
+                Idea.cluster_id,
+                no_url,
+                tsquery,
+                depth,
+                fuzzy_name=Idea.idea_name,
+                query_text=text,
+            )
+        )
+
+    hits = union_all(*branches).subquery()
+    # One extra row tells the caller whether another page exists.
+    page = (
+        select(hits, func.bool_or(hits.c.capped).over().label("approximate"))
+        .order_by(hits.c.rank.desc(), hits.c.kind, hits.c.id)
+        .limit(limit + 1)
+        .offset(offset)
+        .subquery()
+    )
+    return select(
+        page.c.kind,
+        page.c.id,
+        page.c.title,
+        func.ts_headline(SEARCH_CONFIG, _html_escape(page.c.body), tsquery, _HEADLINE_OPTIONS).label("snippet"),
+        page.c.rank,
+        page.c.cluster_id,
+        page.c.url,
+        page.c.approximate,
+    ).order_by(page.c.rank.desc(), page.c.kind, page.c.id)
+
+
+async def search(
+    db: AsyncSession,
+    text: str,
+    kinds: Collection[SearchKind],
+    limit: int,
+    offset: int = 0,
+) -> tuple[list[SearchHitOut], bool, bool]:
+    """
+    The requested page of hits, best first, whether more hits follow it, and whether the ranking is
+    approximate because a kind had more than `search_max_candidates` matches.
+    """
+    if not kinds:
+        return [], False, False
+
+    result = await db.execute(build_search_query(text, kinds, limit, offset))
+    rows = result.all()
+    hits = [
+        SearchHitOut(
+            kind=row.kind,
+            id=row.id,
+            title=row.title,
+            snippet=row.snippet,
+            rank=round(float(row.rank), 6),
+            cluster_id=row.cluster_id,
+            url=row.url,
+        )
+        for row in rows[:limit]
+    ]
+    return hits, len(rows) > limit, any(row.approximate for row in rows)
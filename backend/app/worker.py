@@ -0,0 +1,127 @@
+"""
+Pipeline worker: `python -m app.worker`.
+
+Claims jobs from `pipeline_jobs` one at a time and runs the matching pipeline stage. The schedule
+that enqueues the periodic scrape and trend refresh also lives here rather than in the API processes.
+"""
+
+import asyncio
+import logging
+import os
+import signal
+import socket
+import time
+import uuid
+
+from app.core.config import settings
+from app.db.init_db import init_db
+from app.db.session import AsyncSessionLocal
+from app.jobs.queue import claim_job, complete_job, fail_job, heartbeat_job
+from app.jobs.scheduler import scheduler_manager
+from app.services.clustering.workers import shutdown_cluster_executor
+from app.services.collectors.http import collector_http
+from app.services.collectors.reddit_collector import shutdown_reddit_executor
+from app.services.pipeline import PipelineOrchestrator
+from app.services.process_stats import publish_stats
+
+logger = logging.getLogger(__name__)
+
+
+class PipelineWorker:
+    def __init__(self) -> None:
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._stopping = asyncio.Event()
+        self._stats_published_at = 0.0
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    async def run(self) -> None:
+        logger.info("Pipeline worker %s started.", self.worker_id)
+        while not self._stopping.is_set():
+            try:
+                ran = await self.run_once()
+            except Exception:  # noqa: BLE001
+                logger.exception("Pipeline worker poll failed.")
+                ran = False
+            await self._publish_stats(force=ran)
+
+            if not ran:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=settings.worker_poll_interval_seconds)
+                except asyncio.TimeoutError:
+                    pass
+        logger.info("Pipeline worker %s stopped.", self.worker_id)
+
+    async def run_once(self) -> bool:
+        """Claim and run one job. Returns False when the queue had nothing runnable."""
+        async with AsyncSessionLocal() as db:
+            job = await claim_job(db, self.worker_id)
+        if job is None:
+            return False
+
+        logger.info("Running %s job %s (attempt %s).", job.job_type, job.id, job.attempts)
+        heartbeat = asyncio.create_task(self._heartbeat(job.id))
+        try:
+            async with AsyncSessionLocal() as db:
+                result = await PipelineOrchestrator(db).run_stage(job.job_type)
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("%s job %s failed.", job.job_type, job.id)
+            async with AsyncSessionLocal() as db:
+                await fail_job(db, job.id, self.worker_id, repr(exc))
+        else:
+            async with AsyncSessionLocal() as db:
+                await complete_job(db, job.id, self.worker_id, result)
+        finally:
+            heartbeat.cancel()
+        return True
+
+    async def _publish_stats(self, force: bool = False) -> None:
+        """Share this process's LLM cache and limiter counters with the API (see app.services.process_stats)."""
+        if not force and time.monotonic() - self._stats_published_at < settings.worker_heartbeat_seconds:
+            return
+        try:
+            async with AsyncSessionLocal() as db:
+                await publish_stats(db, "worker")
+            self._stats_published_at = time.monotonic()
+        except Exception:  # noqa: BLE001
+            logger.exception("Publishing worker stats failed.")
+
+    async def _heartbeat(self, job_id: uuid.UUID) -> None:
+        while True:
+            await asyncio.sleep(settings.worker_heartbeat_seconds)
+            await self._publish_stats()
+            try:
+                async with AsyncSessionLocal() as db:
+                    if not await heartbeat_job(db, job_id, self.worker_id):
+                        logger.warning("Lost the lease on job %s; another worker may rerun it.", job_id)
+                        return
+            except Exception:  # noqa: BLE001
+                logger.exception("Heartbeat for job %s failed.", job_id)
+
+
+async def main() -> None:
+    try:
+        await init_db()
+    except Exception:  # noqa: BLE001
+        logger.exception("Database bootstrap failed during worker startup; continuing.")
+
+    worker = PipelineWorker()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        # Finish the current job, then exit.
+        loop.add_signal_handler(sig, worker.stop)
+
+    scheduler_manager.start()
+    try:
+        await worker.run()
+    finally:
+        scheduler_manager.shutdown()
+        shutdown_cluster_executor()
+        shutdown_reddit_executor()
+        await collector_http.aclose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -0,0 +1,48 @@
+import numpy as np
+
+from app.services.clustering.ann import IVFIndex
+
+
+def _clustered_vectors(count: int, dim: int = 32, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(50, dim))
+    vectors = centers[rng.integers(0, 50, count)] + 0.5 * rng.normal(size=(count, dim))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def test_ivf_index_matches_exact_search_after_incremental_adds() -> None:
+    vectors = _clustered_vectors(6000)
+    index = IVFIndex(32, nprobe=8, min_train_size=1000)
+    for start in range(0, 6000, 1500):
+        index.add(list(range(start, start + 1500)), vectors[start : start + 1500])
+
+    queries = vectors[:100]
+    scores, rows = index.search(queries, 10)
+    exact = np.argsort(-(queries @ vectors.T), axis=1)[:, :10]
+
+    recall = np.mean([len(set(found) & set(expected)) / 10 for found, expected in zip(rows, exact)])
+    assert recall > 0.9
+    assert np.all(np.diff(scores, axis=1) <= 0)
+    assert [index.ids[row] for row in rows[:, 0]] == list(range(100))
+
+
+def test_small_index_is_exact_and_pads_missing_neighbours() -> None:
+    vectors = _clustered_vectors(3)
+    index = IVFIndex(32, min_train_size=1000)
+    index.add(["a", "b", "c"], vectors)
+
+    scores, rows = index.search(vectors[:1], 5)
+
+    assert index.ids[rows[0, 0]] == "a"
+    assert list(rows[0, 3:]) == [-1, -1]
+    assert np.isneginf(scores[0, 3:]).all()
+
+
+def test_ivf_index_search_skips_excluded_ids() -> None:
+    vectors = _clustered_vectors(3000)
+    for min_train_size in (1000, 10000):
+        index = IVFIndex(32, nprobe=8, min_train_size=min_train_size)
+        index.add(list(range(3000)), vectors)
+
+        _, rows = index.search(vectors[:5], 3, exclude=set(range(5)))
+        assert rows.min() >= 5
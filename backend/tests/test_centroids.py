@@ -0,0 +1,30 @@
+from app.services.clustering.centroids import (
+    centroid_matrix,
+    centroid_terms,
+    merge_centroid,
+    nearest_centroids,
+    vectorize,
+)
+
+
+def test_new_pain_attaches_to_matching_centroid() -> None:
+    billing = centroid_terms(vectorize(["invoice billing reconciliation is manual", "billing invoices take hours"]), 64)
+    hiring = centroid_terms(vectorize(["hiring engineers is slow", "recruiting pipeline stalls"]), 64)
+    centroids = centroid_matrix([billing, hiring])
+
+    nearest = nearest_centroids(
+        vectorize(["manual invoice billing every month", "weather is nice today"]),
+        centroids,
+        min_similarity=0.35,
+    )
+    assert nearest == [0, None]
+
+
+def test_merge_centroid_tracks_running_mean() -> None:
+    first = vectorize(["churn analytics"])
+    second = vectorize(["churn dashboards"])
+    merged = merge_centroid(centroid_terms(first, 64), 1, second, 64)
+    expected = centroid_terms(vectorize(["churn analytics", "churn dashboards"]), 64)
+    assert merged.keys() == expected.keys()
+    for key, weight in expected.items():
+        assert abs(merged[key] - weight) < 1e-5
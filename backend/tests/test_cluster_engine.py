@@ -0,0 +1,84 @@
+import asyncio
+import uuid
+
+import numpy as np
+
+from app.core.config import settings
+from app.models.cluster_centroid import ClusterCentroid
+from app.models.pain import ExtractedPain
+from app.services.ai.embeddings import HashingEmbeddingProvider
+from app.services.clustering import cluster_engine
+from app.services.clustering.ann import IVFIndex
+from app.services.clustering.centroids import centroid_terms, vectorize
+
+
+class _Rows:
+    def __init__(self, rows: list) -> None:
+        self._rows = rows
+
+    def all(self) -> list:
+        return self._rows
+
+
+class _FakeSession:
+    def __init__(self, rows: list, scalars: list | None = None) -> None:
+        self._rows = rows
+        self._scalars = list(scalars or [])
+        self.executed: list = []
+
+    async def execute(self, stmt) -> _Rows:
+        self.executed.append(stmt)
+        return _Rows(self._rows)
+
+    async def scalar(self, stmt):
+        return self._scalars.pop(0)
+
+    async def flush(self) -> None:
+        return None
+
+
+def test_assign_by_neighbors_attaches_pain_and_merges_centroid(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "clustering_process_workers", 0)
+    monkeypatch.setattr(settings, "clustering_knn_neighbors", 1)
+    texts = ["manual billing every month", "invoicing is manual every month"]
+    vectors = asyncio.run(HashingEmbeddingProvider(384).embed(texts))
+
+    cluster_id, clustered_id = uuid.uuid4(), uuid.uuid4()
+    pain = ExtractedPain(id=uuid.uuid4(), pain_point=texts[1])
+    # The batch is indexed as soon as it is embedded; its own vector must not take the only neighbour slot.
+    index = IVFIndex(384)
+    index.add([clustered_id, pain.id], vectors)
+
+    async def refresh(db) -> IVFIndex:
+        return index
+
+    terms = centroid_terms(vectorize(texts[:1]), settings.clustering_centroid_terms)
+    centroid = ClusterCentroid(cluster_id=cluster_id, terms=terms, pain_count=1)
+
+    async def load_centroids(db) -> list[ClusterCentroid]:
+        return [centroid]
+
+    engine = cluster_engine.ClusterEngine()
+    monkeypatch.setattr(cluster_engine.pain_index, "refresh", refresh)
+    monkeypatch.setattr(engine, "_load_centroids", load_centroids)
+
+    leftovers = asyncio.run(
+        engine._assign_by_neighbors(_FakeSession([(clustered_id, cluster_id)]), [pain], {pain.id: vectors[1]})
+    )
+
+    assert leftovers == []
+    assert pain.cluster_id == cluster_id
+    assert centroid.pain_count == 2
+    assert centroid.terms == centroid_terms(vectorize(texts), settings.clustering_centroid_terms)
+
+
+def test_first_bucket_write_backfills_existing_clusters_instead_of_adding() -> None:
+    # No buckets yet, but pains were clustered before buckets existed.
+    db = _FakeSession([], scalars=[False, True])
+    asyncio.run(cluster_engine.ClusterEngine().record_daily_counts(db, [uuid.uuid4()]))
+
+    statements = [str(stmt) for stmt in db.executed]
+    assert len(statements) == 2
+    assert statements[0].startswith("DELETE FROM cluster_daily_counts")
+    assert "extracted_pains.cluster_id IS NOT NULL" in statements[1]
+    assert "extracted_pains.id IN" not in statements[1]
@@ -0,0 +1,62 @@
+import asyncio
+
+from app.services.ai.embeddings import HashingEmbeddingProvider
+from app.services.clustering.workers import (
+    build_centroids,
+    label_texts,
+    label_texts_knn_graph,
+    label_vectors_knn_graph,
+    nearest_clusters,
+)
+
+
+def test_knn_graph_backend_groups_like_agglomerative() -> None:
+    texts = [
+        "billing is manual and painful",
+        "manual billing hurts every month",
+        "hiring engineers is slow",
+        "hiring is slow for startups",
+        "weather",
+    ]
+
+    def partition(labels: list[int]) -> set[frozenset[int]]:
+        groups: dict[int, set[int]] = {}
+        for idx, label in enumerate(labels):
+            groups.setdefault(label, set()).add(idx)
+        return {frozenset(group) for group in groups.values()}
+
+    sparse_labels = label_texts_knn_graph(texts, 0.65, n_neighbors=3, working_memory_mb=16)
+    assert partition(sparse_labels) == partition(label_texts(texts, 0.65))
+    assert partition(sparse_labels) == {frozenset({0, 1}), frozenset({2, 3}), frozenset({4})}
+
+
+def test_embedding_backend_groups_hashed_vectors() -> None:
+    texts = [
+        "billing is manual and painful",
+        "manual billing hurts every month",
+        "hiring engineers is slow",
+        "hiring is slow for startups",
+        "weather",
+    ]
+    vectors = asyncio.run(HashingEmbeddingProvider(384).embed(texts))
+
+    labels = label_vectors_knn_graph(vectors, 0.45, n_neighbors=3, nprobe=8, min_train_size=2048)
+
+    assert labels[0] == labels[1] != labels[2] == labels[3] != labels[4]
+
+
+def test_nearest_clusters_ranks_other_centroids_across_blocks() -> None:
+    groups = [
+        ["invoice billing is manual", "billing invoices take hours"],
+        ["manual invoice billing every month"],
+        ["hiring engineers is slow"],
+        ["weather is nice today"],
+    ]
+    centroids = build_centroids(groups, 64)
+
+    neighbors = nearest_clusters(centroids, k=2, min_similarity=0.1, block_size=3)
+
+    assert [idx for idx, _ in neighbors[0]] == [1]
+    assert [idx for idx, _ in neighbors[1]] == [0]
+    assert neighbors[3] == []
+    assert all(0.1 <= similarity <= 1.0 for ranked in neighbors for _, similarity in ranked)
@@ -0,0 +1,181 @@
+import asyncio
+import time
+
+import httpx
+
+from app.core.config import settings
+from app.services.collectors.http import CollectorHTTP, parse_rate_limit_reset
+
+
+def test_rate_limit_reset_accepts_epoch_and_relative_seconds() -> None:
+    assert parse_rate_limit_reset(httpx.Headers({"x-rate-limit-reset": "12"})) == 12.0
+    epoch = parse_rate_limit_reset(httpx.Headers({"x-rate-limit-reset": str(int(time.time()) + 30)}))
+    assert epoch is not None and 28.0 <= epoch <= 30.0
+    assert parse_rate_limit_reset(httpx.Headers({})) is None
+
+
+def test_request_retries_throttled_responses(monkeypatch) -> None:
+    calls: list[int] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(1)
+        if len(calls) < 3:
+            return httpx.Response(429, headers={"retry-after": "0"})
+        return httpx.Response(200, json={"ok": True})
+
+    async def scenario() -> httpx.Response:
+        http = CollectorHTTP()
+        http._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await http.get("https://example.test/search")
+        finally:
+            await http.aclose()
+
+    monkeypatch.setattr(settings, "collector_backoff_max_seconds", 0.0)
+    response = asyncio.run(scenario())
+    assert response.status_code == 200
+    assert len(calls) == 3
+
+
+def test_twitter_fan_out_keeps_first_keyword_for_duplicates(monkeypatch) -> None:
+    from app.services.collectors import twitter_collector
+    from app.services.collectors.twitter_collector import TwitterCollector
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        keyword = request.url.params["query"].split('"')[1]
+        tweets = {"churn": ["1", "2"], "costly": ["2", "3"]}[keyword]
+        return httpx.Response(200, json={"data": [{"id": tweet_id, "text": keyword} for tweet_id in tweets]})
+
+    async def scenario() -> list:
+        http = CollectorHTTP()
+        http._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(twitter_collector, "collector_http", http)
+        try:
+            return await TwitterCollector().fetch(["churn", "costly"])
+        finally:
+            await http.aclose()
+
+    monkeypatch.setattr(settings, "twitter_bearer_token", "token")
+    posts = asyncio.run(scenario())
+    assert [(post.url.rsplit("/", 1)[-1], post.content) for post in posts] == [
+        ("1", "churn"),
+        ("2", "churn"),
+        ("3", "costly"),
+    ]
+
+
+def test_twitter_cursor_sends_since_id_and_advances(monkeypatch) -> None:
+    from app.services.collectors import twitter_collector
+    from app.services.collectors.twitter_collector import TwitterCollector
+
+    seen_params: list[dict] = []
+    payload = {"data": [{"id": "42", "text": "new"}], "meta": {"newest_id": "42"}}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_params.append(dict(request.url.params))
+        return httpx.Response(200, json=payload)
+
+    async def scenario(cursors: dict[str, str]) -> list:
+        http = CollectorHTTP()
+        http._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(twitter_collector, "collector_http", http)
+        try:
+            return await TwitterCollector().fetch(["churn"], cursors=cursors)
+        finally:
+            await http.aclose()
+
+    monkeypatch.setattr(settings, "twitter_bearer_token", "token")
+    cursors = {"churn": "40"}
+    posts = asyncio.run(scenario(cursors))
+    assert len(posts) == 1
+    assert seen_params[0]["since_id"] == "40"
+    assert cursors == {"churn": "42"}
+
+    # A full page with more to follow stops at the limit and keeps the cursor.
+    payload = {
+        "data": [{"id": str(tweet_id), "text": "new"} for tweet_id in range(60, 50, -1)],
+        "meta": {"newest_id": "60", "next_token": "t2"},
+    }
+    cursors = {"churn": "40"}
+    posts = asyncio.run(scenario(cursors))
+    assert len(posts) == 10
+    assert cursors == {"churn": "40"}
+
+
+def test_producthunt_follows_end_cursor_and_records_newest_post(monkeypatch) -> None:
+    from app.services.collectors import producthunt_collector
+    from app.services.collectors.producthunt_collector import ProductHuntCollector
+
+    def node(name: str, created_at: str) -> dict:
+        return {"node": {"name": name, "tagline": "churn", "url": f"https://ph.test/{name}", "createdAt": created_at}}
+
+    pages = {
+        None: {"edges": [node("b", "2026-01-02T00:00:00Z")], "pageInfo": {"endCursor": "c1", "hasNextPage": True}},
+        "c1": {"edges": [node("a", "2026-01-01T00:00:00Z")], "pageInfo": {"endCursor": "c2", "hasNextPage": False}},
+    }
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        variables = httpx.Response(200, content=request.content).json()["variables"]
+        return httpx.Response(200, json={"data": {"posts": pages[variables["after"]]}})
+
+    async def scenario(cursors: dict[str, str]) -> list:
+        http = CollectorHTTP()
+        http._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(producthunt_collector, "collector_http", http)
+        try:
+            return await ProductHuntCollector().fetch(["churn"], limit=10, cursors=cursors)
+        finally:
+            await http.aclose()
+
+    monkeypatch.setattr(settings, "producthunt_access_token", "token")
+    monkeypatch.setattr(settings, "producthunt_topics", [])
+    cursors: dict[str, str] = {}
+    posts = asyncio.run(scenario(cursors))
+    assert [post.title for post in posts] == ["b", "a"]
+    assert cursors == {"": "2026-01-02T00:00:00+00:00"}
+
+    # Stopping at max pages before the last page keeps the old cursor so the unread posts are fetched later.
+    monkeypatch.setattr(settings, "producthunt_max_pages", 1)
+    cursors = {"": "2025-12-31T00:00:00+00:00"}
+    posts = asyncio.run(scenario(cursors))
+    assert [post.title for post in posts] == ["b"]
+    assert cursors == {"": "2025-12-31T00:00:00+00:00"}
+
+
+def test_reddit_cursor_advances_only_when_search_reaches_it(monkeypatch) -> None:
+    from types import SimpleNamespace
+
+    from app.services.collectors import reddit_collector
+    from app.services.collectors.reddit_collector import RedditCollector
+
+    def submission(created_utc: float) -> SimpleNamespace:
+        return SimpleNamespace(
+            title=f"post {created_utc:.0f}",
+            selftext="manual billing",
+            score=1,
+            num_comments=0,
+            url=f"https://reddit.test/{created_utc:.0f}",
+            created_utc=created_utc,
+        )
+
+    newest_first = [submission(created_utc) for created_utc in (105.0, 104.0, 103.0, 102.0, 101.0, 100.0)]
+
+    class _Subreddit:
+        def search(self, keyword: str, sort: str, limit: int):
+            return iter(newest_first[:limit])
+
+    monkeypatch.setattr(reddit_collector, "_thread_client", lambda: SimpleNamespace(subreddit=lambda name: _Subreddit()))
+    monkeypatch.setattr(settings, "reddit_client_id", "id")
+    monkeypatch.setattr(settings, "reddit_client_secret", "secret")
+
+    cursors = {"billing": "102.0"}
+    posts = asyncio.run(RedditCollector().fetch(["billing"], limit_per_keyword=10, cursors=cursors))
+    assert [post.url for post in posts] == ["https://reddit.test/105", "https://reddit.test/104", "https://reddit.test/103"]
+    assert cursors == {"billing": "105.0"}
+
+    # Stopping at the limit before reaching the stored cursor keeps it, so 103-100 are not skipped for good.
+    cursors = {"billing": "99.0"}
+    posts = asyncio.run(RedditCollector().fetch(["billing"], limit_per_keyword=2, cursors=cursors))
+    assert len(posts) == 2
+    assert cursors == {"billing": "99.0"}
+    reddit_collector.shutdown_reddit_executor()
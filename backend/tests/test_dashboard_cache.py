@@ -0,0 +1,35 @@
+import asyncio
+
+from app.core.config import settings
+from app.services import dashboard
+from app.services.dashboard import DashboardCache
+
+
+def test_build_racing_an_invalidation_is_not_cached(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "dashboard_cache_backend", "memory")
+    monkeypatch.setattr(settings, "worker_embedded", True)
+    cache = DashboardCache()
+    builds: list[int] = []
+
+    class _Overview:
+        def __init__(self, build: int) -> None:
+            self.build = build
+
+        def model_dump(self) -> dict:
+            return {"build": self.build}
+
+    async def build_overview() -> _Overview:
+        builds.append(len(builds) + 1)
+        if len(builds) == 1:
+            # The pipeline commits while the first build is still reading.
+            await cache.invalidate()
+        return _Overview(builds[-1])
+
+    monkeypatch.setattr(dashboard, "build_dashboard_overview", build_overview)
+
+    async def scenario() -> tuple[bytes, bytes, bytes]:
+        return await cache.get(), await cache.get(), await cache.get()
+
+    first, second, third = asyncio.run(scenario())
+    assert first == b'{"build":1}'
+    assert second == third == b'{"build":2}'
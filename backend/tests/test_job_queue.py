@@ -0,0 +1,37 @@
+import asyncio
+
+from sqlalchemy.dialects import postgresql
+
+from app.core.config import settings
+from app.jobs.queue import claim_job
+
+
+class _FakeSession:
+    def __init__(self) -> None:
+        self.executed: list = []
+        self.committed = False
+
+    async def execute(self, stmt) -> None:
+        self.executed.append(stmt)
+
+    async def scalar(self, stmt) -> None:
+        self.executed.append(stmt)
+        return None
+
+    async def commit(self) -> None:
+        self.committed = True
+
+
+def test_claim_fails_abandoned_jobs_out_of_attempts_before_reclaiming(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "job_max_attempts", 3)
+    db = _FakeSession()
+    assert asyncio.run(claim_job(db, "worker-1")) is None
+
+    expire, claim = (
+        str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})) for stmt in db.executed
+    )
+    assert expire.startswith("UPDATE pipeline_jobs SET status='failed'")
+    assert "pipeline_jobs.attempts >= 3" in expire
+    assert claim.startswith("SELECT")
+    # The expiry is committed even when nothing was claimed.
+    assert db.committed
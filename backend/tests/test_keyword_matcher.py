@@ -0,0 +1,17 @@
+from app.services.keyword_matcher import KeywordMatcher, compile_keywords
+
+
+def test_matches_whole_words_case_insensitively() -> None:
+    matcher = KeywordMatcher(["AI", "manual process", "manual", "c++"])
+
+    assert matcher.search("New AI tools for ops")
+    assert not matcher.search("Check your email")
+    assert matcher.search("Our MANUAL processing is slow")
+    assert matcher.search("Rewriting it in C++ today")
+    assert not matcher.search("nothing relevant")
+
+
+def test_empty_keywords_never_match_and_matchers_are_cached() -> None:
+    assert not KeywordMatcher(["", "  "])
+    assert not KeywordMatcher([]).search("anything")
+    assert compile_keywords(("churn",)) is compile_keywords(("churn",))
@@ -0,0 +1,54 @@
+import asyncio
+from datetime import datetime, timezone
+
+from app.models.process_stats import ProcessStats
+from app.services import process_stats
+from app.services.ai.llm_cache import DiskLLMCache, LLMResponseCache, make_cache_key
+
+
+def test_cache_key_covers_every_prompt_input() -> None:
+    base = make_cache_key("gpt-4o-mini", "system", "user", 0.2)
+    assert base == make_cache_key("gpt-4o-mini", "system", "user", 0.2)
+    assert base != make_cache_key("gpt-4o", "system", "user", 0.2)
+    assert base != make_cache_key("gpt-4o-mini", "system", "user", 0.7)
+    assert base != make_cache_key("gpt-4o-mini", "system", "other user", 0.2)
+
+
+def test_disk_cache_round_trip_counts_hits_and_expires(tmp_path) -> None:
+    cache = LLMResponseCache(DiskLLMCache(str(tmp_path), ttl_seconds=60, max_entries=10))
+
+    async def scenario() -> None:
+        assert await cache.get("ab" * 32) is None
+        await cache.set("ab" * 32, "gpt-4o-mini", {"pain_point": "manual billing"})
+        assert await cache.get("ab" * 32) == {"pain_point": "manual billing"}
+
+        expired = LLMResponseCache(DiskLLMCache(str(tmp_path), ttl_seconds=-1, max_entries=10))
+        await expired.set("cd" * 32, "gpt-4o-mini", {"pain_point": "stale"})
+        assert await expired.get("cd" * 32) is None
+
+    asyncio.run(scenario())
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.writes) == (1, 1, 1)
+
+
+def test_collect_stats_sums_cache_counters_across_processes(monkeypatch) -> None:
+    worker = ProcessStats(
+        process_id="worker-host:42",
+        role="worker",
+        stats={"llm_cache": {"hits": 5, "misses": 2, "writes": 2, "evictions": 1}, "limiter": {"in_flight": 0}},
+        updated_at=datetime.now(timezone.utc),
+    )
+
+    class _Result:
+        def all(self) -> list[ProcessStats]:
+            return [worker]
+
+    class _Session:
+        async def scalars(self, stmt) -> _Result:
+            return _Result()
+
+    monkeypatch.setattr(process_stats.llm_cache.stats, "hits", 1)
+    monkeypatch.setattr(process_stats.llm_cache.stats, "misses", 0)
+    stats = asyncio.run(process_stats.collect_stats(_Session(), "api"))
+
+    assert (stats["hits"], stats["misses"], stats["writes"], stats["evictions"]) == (6, 2, 2, 1)
+    assert [process["role"] for process in stats["processes"]] == ["api", "worker"]
@@ -0,0 +1,22 @@
+from app.services.near_duplicates import band_keys, minhash, similarity
+
+RANT = (
+    "Our team spends every Monday reconciling invoices by hand across three spreadsheets and the bank "
+    "portal. It takes hours, we still miss duplicates, and finance keeps asking for a better process."
+)
+
+
+def test_cross_posted_copies_share_a_band_and_pass_the_threshold() -> None:
+    original = minhash(RANT)
+    cross_post = minhash("Cross-posting from r/smallbusiness: " + RANT + " Any tool recommendations?")
+    unrelated = minhash("Launching our new mobile game today with twelve levels and a leaderboard for friends.")
+
+    assert similarity(original, cross_post) >= 0.6
+    assert set(band_keys(original)) & set(band_keys(cross_post))
+    assert similarity(original, unrelated) < 0.2
+    assert not set(band_keys(original)) & set(band_keys(unrelated))
+
+
+def test_signatures_are_deterministic() -> None:
+    assert minhash(RANT).tobytes() == minhash(RANT.upper()).tobytes()
+    assert all(-(2**63) <= value < 2**63 for _, value in band_keys(minhash(RANT)))
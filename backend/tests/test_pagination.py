@@ -0,0 +1,55 @@
+import base64
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+
+from app.api.pagination import Keyset, parse_fields
+from app.api.routes.clusters import _cluster_detail_query
+from app.models.post import Post
+from app.schemas.idea import IDEA_HEAVY_FIELDS, IdeaOut
+
+
+def test_keyset_cursor_round_trips_into_a_row_value_comparison() -> None:
+    keyset = Keyset(Post.created_at, Post.id)
+    row = SimpleNamespace(created_at=datetime(2026, 3, 1, 12, 30, tzinfo=timezone.utc), id=uuid.uuid4())
+
+    condition = keyset.after(keyset.encode(row))
+    compiled = condition.compile(dialect=postgresql.dialect())
+
+    assert str(compiled).startswith("(posts.created_at, posts.id) < (")
+    assert list(compiled.params.values()) == [row.created_at, row.id]
+    with pytest.raises(HTTPException):
+        keyset.after("not-a-cursor")
+
+
+def test_parse_fields_leaves_heavy_columns_out_unless_requested() -> None:
+    default = parse_fields(None, IdeaOut, IDEA_HEAVY_FIELDS)
+    assert "idea_name" in default
+    assert not IDEA_HEAVY_FIELDS.intersection(default)
+
+    assert parse_fields("final_score, gtm_strategy", IdeaOut, IDEA_HEAVY_FIELDS) == ["id", "final_score", "gtm_strategy"]
+    with pytest.raises(HTTPException):
+        parse_fields("idea_name,password", IdeaOut)
+
+
+def test_cluster_detail_is_one_statement_without_heavy_columns() -> None:
+    sql = str(_cluster_detail_query(uuid.uuid4(), 50).compile(dialect=postgresql.dialect()))
+
+    assert sql.count("json_agg(") == 3
+    assert "posts.content" not in sql
+    assert not any(f"ideas.{name}" in sql for name in IDEA_HEAVY_FIELDS)
+
+
+def test_cursor_built_by_postgres_is_accepted() -> None:
+    # Postgres renders json_build_array with spaces and wraps base64 output at 76 characters.
+    keyset = Keyset(Post.created_at, Post.id)
+    payload = f'["2026-03-01T12:30:00.123456+00:00", "{uuid.uuid4()}"]'.encode()
+    encoded = base64.encodebytes(payload).decode("ascii")
+    cursor = encoded.translate(str.maketrans("+/", "-_", "\n")).rstrip("=")
+
+    assert "\n" in encoded
+    keyset.after(cursor)
@@ -0,0 +1,67 @@
+import asyncio
+from datetime import datetime, timezone
+
+from app.core.config import settings
+from app.models.post import Post
+from app.services.ai import pain_extractor as module
+from app.services.ai.pain_extractor import PainExtractor
+
+
+def _post(title: str, content: str = "We need a fix, this is urgent") -> Post:
+    return Post(
+        platform="reddit",
+        title=title,
+        content=content,
+        upvotes=3,
+        comments=1,
+        url=f"https://example.com/{title}",
+        created_at=datetime.now(timezone.utc),
+    )
+
+
+def test_pack_batches_respects_post_count_and_token_budget() -> None:
+    extractor = PainExtractor()
+    posts = [_post(f"p{idx}") for idx in range(5)] + [_post("huge", "x" * 40_000)]
+
+    batches = extractor.pack_batches(posts, max_posts=2, token_budget=2000)
+
+    assert [len(batch) for batch in batches] == [2, 2, 1, 1]
+    assert batches[-1][0].title == "huge"
+
+
+def test_extract_batch_falls_back_only_for_failed_items(monkeypatch) -> None:
+    async def fake_completion(system_prompt: str, user_prompt: str) -> dict:
+        return {
+            "items": [
+                {"key": "1", "pain_point": "Invoices are reconciled by hand", "urgency_score": 9},
+                {"key": "0", "pain_point": ""},
+            ]
+        }
+
+    monkeypatch.setattr(module, "run_json_completion", fake_completion)
+    posts = [_post("first"), _post("second")]
+
+    payloads = asyncio.run(PainExtractor().extract_batch(posts))
+
+    assert payloads[0].pain_point == "first"
+    assert payloads[0].existing_solutions == ["Manual process", "Hiring contractors", "Fragmented tools"]
+    assert payloads[1].pain_point == "Invoices are reconciled by hand"
+    assert payloads[1].urgency_score == 9
+
+
+def test_relevance_scores_pain_rants_above_job_ads() -> None:
+    extractor = PainExtractor()
+    rant = _post(
+        "Reconciling invoices by hand",
+        "So frustrated, it takes hours every week and our clients won't pay late fees. Is there a tool for this?",
+    )
+    job_ad = _post("We're hiring!", "We are hiring a growth marketer, apply now. Check out my profile.")
+    hiring_pain = _post("Contractors", "Hiring contractors is a nightmare")
+    launch = _post("Launching Ledgerly", "Ledgerly syncs your books with your bank")
+
+    assert extractor.relevance(rant) > 0.5
+    assert extractor.relevance(job_ad) < 0.0
+    assert extractor.relevance(hiring_pain) >= 0.0
+    # Neutral posts, such as launches without pain wording, score 0 and pass the default gate.
+    assert extractor.relevance(launch) == 0.0
+    assert extractor.relevance(job_ad) < settings.relevance_min_score <= extractor.relevance(launch)
@@ -0,0 +1,54 @@
+import asyncio
+
+import httpx
+
+from app.services.ai.rate_limiter import AdaptiveLimiter, parse_retry_after, retry_delay
+
+
+def test_aimd_window_grows_on_fast_success_and_halves_on_throttle() -> None:
+    limiter = AdaptiveLimiter(initial=4, minimum=1, maximum=8, target_latency_seconds=5.0, tokens_per_minute=1000)
+
+    for _ in range(8):
+        limiter.record_success(latency_seconds=1.0)
+    assert 5.0 <= limiter.limit <= 8.0
+
+    grown = limiter.limit
+    limiter.record_throttle()
+    assert limiter.limit == grown / 2
+
+    for _ in range(10):
+        limiter.record_throttle()
+    assert limiter.limit == 1.0
+
+
+def test_retry_after_header_takes_precedence_over_backoff() -> None:
+    assert parse_retry_after(httpx.Headers({"retry-after-ms": "1500"})) == 1.5
+    assert parse_retry_after(httpx.Headers({"retry-after": "7"})) == 7.0
+    assert parse_retry_after(httpx.Headers({})) is None
+
+    response = httpx.Response(429, headers={"retry-after": "3"})
+    assert 3.0 <= retry_delay(0, response) <= 3.5
+
+
+def test_burst_of_throttles_cuts_the_window_once() -> None:
+    limiter = AdaptiveLimiter(initial=8, minimum=1, maximum=8, target_latency_seconds=5.0, tokens_per_minute=1000)
+
+    async def burst() -> list[int]:
+        tickets = []
+        for _ in range(4):
+            async with limiter.slot(1) as ticket:
+                tickets.append(ticket)
+        return tickets
+
+    tickets = asyncio.run(burst())
+    for ticket in tickets:
+        limiter.record_throttle(ticket)
+    assert limiter.limit == 4.0
+
+    # A request sent after the cut that is still throttled cuts again.
+    async def retry() -> int:
+        async with limiter.slot(1) as ticket:
+            return ticket
+
+    limiter.record_throttle(asyncio.run(retry()))
+    assert limiter.limit == 2.0
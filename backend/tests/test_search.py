@@ -0,0 +1,37 @@
+from sqlalchemy.dialects import postgresql
+
+from app.services.search import build_search_query
+
+
+def _sql(kinds: list[str], limit: int = 20, offset: int = 0) -> str:
+    stmt = build_search_query("invoice billing", kinds, limit, offset)
+    return str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def test_search_query_only_touches_requested_kinds() -> None:
+    sql = _sql(["post", "idea"])
+
+    assert "posts.search_vector @@ websearch_to_tsquery('english'::regconfig, 'invoice billing')" in sql
+    assert "similarity(ideas.idea_name, 'invoice billing')" in sql
+    assert "extracted_pains" not in sql
+    assert "problem_clusters" not in sql
+
+
+def test_search_highlights_only_the_requested_page() -> None:
+    sql = _sql(["post", "cluster"], limit=20, offset=40)
+
+    # Each kind keeps its top offset + limit rows; the page fetches one extra row to detect more.
+    assert sql.count("LIMIT 60") == 2
+    assert "LIMIT 21 OFFSET 40" in sql
+    assert sql.index("ts_headline") < sql.index("LIMIT 21 OFFSET 40")
+    assert sql.count("ts_headline") == 1
+
+
+def test_search_escapes_bodies_and_flags_capped_kinds() -> None:
+    sql = _sql(["pain"])
+
+    headline = sql[sql.index("ts_headline") : sql.index("AS snippet")]
+    assert headline.index("'&', '&amp;'") < headline.index("'<', '&lt;'")
+    assert "'''', '&#x27;'" in headline
+    assert "count(*) OVER () >= 5000" in sql
+    assert "bool_or(" in sql
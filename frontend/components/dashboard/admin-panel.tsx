@@ -73,7 +73,7 @@ export function AdminPanel({
     try {
       if (mode === "scrape") {
         await triggerScrape(accessToken);
-        setMessage({ text: "Scraping pipeline triggered", type: "success" });
+        setMessage({ text: "Scraping pipeline queued", type: "success" });
       } else {
         await triggerTrendRecalc(accessToken);
         setMessage({ text: "Trend recalculation started", type: "success" });
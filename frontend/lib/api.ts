@@ -1,4 +1,4 @@
-import type { AdminFilters, ClusterDetail, DashboardOverview, Idea, ProblemCluster } from "@/lib/types";
+import type { AdminFilters, ClusterDetail, DashboardOverview, Idea, ProblemCluster, RelatedCluster, SearchResults } from "@/lib/types";
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_BASE_URL ?? "http://localhost:8000/api/v1";
 
@@ -35,6 +35,15 @@ export function getClusterById(clusterId: string, accessToken?: string) {
   return apiRequest<ClusterDetail>(`/clusters/${clusterId}`, accessToken);
 }
 
+export function getRelatedClusters(clusterId: string, accessToken?: string) {
+  return apiRequest<RelatedCluster[]>(`/clusters/${clusterId}/related`, accessToken);
+}
+
+export function search(query: string, offset = 0, accessToken?: string) {
+  const params = new URLSearchParams({ q: query, offset: String(offset) });
+  return apiRequest<SearchResults>(`/search?${params}`, accessToken);
+}
+
 export function getIdeas(accessToken?: string) {
   return apiRequest<Idea[]>("/ideas", accessToken);
 }
@@ -55,7 +64,7 @@ export function updateAdminFilters(payload: Omit<AdminFilters, "id" | "updated_a
 }
 
 export function triggerScrape(accessToken?: string) {
-  return apiRequest<{ status: string; result: Record<string, number> }>("/admin/run-scrape", accessToken, {
+  return apiRequest<{ status: string; job_id: string }>("/admin/run-scrape", accessToken, {
     method: "POST",
   });
 }
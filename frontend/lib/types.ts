@@ -16,11 +16,32 @@ export type ProblemCluster = {
   updated_at: string;
 };
 
+export type RelatedCluster = ProblemCluster & {
+  similarity: number;
+};
+
+export type SearchHit = {
+  kind: "post" | "pain" | "cluster" | "idea";
+  id: string;
+  title: string;
+  snippet: string;
+  rank: number;
+  cluster_id: string | null;
+  url: string | null;
+};
+
+export type SearchResults = {
+  query: string;
+  hits: SearchHit[];
+  next_offset: number | null;
+  approximate: boolean;
+};
+
 export type PostRecord = {
   id: string;
   platform: string;
   title: string;
-  content: string;
+  content?: string;
   upvotes: number;
   comments: number;
   url: string;
@@ -93,6 +114,9 @@ export type ClusterDetail = {
   pains: PainSignal[];
   ideas: Idea[];
   posts: PostRecord[];
+  pains_next_cursor: string | null;
+  ideas_next_cursor: string | null;
+  posts_next_cursor: string | null;
 };
 
 export type AdminFilters = {